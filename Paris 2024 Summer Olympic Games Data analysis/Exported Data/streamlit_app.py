@@ -5,7 +5,20 @@ import plotly.graph_objects as go
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
+import sys
+from pathlib import Path
 
+# Shared data-access modules live at the project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from data_store import load_table
+from demographics import build_demographic_frame
+from historical import ROLLING_GAMES, build_historical_frame, load_history_rollups as build_history_rollups
+from cube import load_cube
+from event_timing import EventTiming
+from figure_cache import cached_figure
+from geo import enrich, load_noc_geo, top_labels
+from geometry import level_for_viewport, shapes_for
+from instrumentation import instrumented, plotly_chart, profile_rerun, span
 
 # Set page config
 st.set_page_config(
@@ -27,6 +40,12 @@ MEDAL_COLORS = {
     'Bronze Medal': '#CD7F32'
 }
 
+# Width of the world maps in px. The choropleth always opens on the whole world (Streamlit
+# doesn't report Plotly zoom back to the script), so its detail level is fixed: the coarsest
+# bundled shapes whose error stays under a pixel of a 360 degree wide view, i.e. 'low'
+MAP_WIDTH = 1000
+MAP_DETAIL = level_for_viewport(MAP_WIDTH, lon_span=360)
+
 # Custom CSS
 st.markdown("""
     <style>
@@ -49,47 +68,46 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+# Loaders feeding cached figures are resources: the same frame on every rerun, so
+# cached_figure fingerprints it once. Callers must not modify what they return.
+@instrumented('load')
+@st.cache_resource
 def load_geographic_data():
-    country_disciplines_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\Paris 2024 Summer Olympic Games Data analysis\Exported Data\Country's Best Disciplines.csv")
-    nocs_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\nocs.csv")
+    country_disciplines_df = load_table("Country's Best Disciplines")
+    nocs_df = load_table('nocs')
     return pd.merge(country_disciplines_df, nocs_df[['country', 'code']], on='country', how='left')
 
-@st.cache_data
+@instrumented('load')
+@st.cache_resource
 def load_demographic_data():
-    athletes_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\athletes.csv")
-    medallists_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\medallists.csv")
-    
-    athletes_df['birth_date'] = pd.to_datetime(athletes_df['birth_date'], errors='coerce')
-    athletes_df['age'] = 2024 - athletes_df['birth_date'].dt.year
-    athletes_df['gender'] = athletes_df['gender'].fillna('Unknown')
-    
-    athlete_medals_df = pd.merge(
-        medallists_df,
-        athletes_df,
-        on='name',
-        how='inner',
-        suffixes=('_medallist', '_athlete')
-    )
-    
-    athlete_medals_df['age_group'] = pd.cut(
-        athlete_medals_df['age'],
-        bins=[10, 20, 30, 40, 50, 60],
-        labels=['10-20', '20-30', '30-40', '40-50', '50-60'],
-        include_lowest=True
-    )
-    
-    return athlete_medals_df
+    return build_demographic_frame()
 
-def create_choropleth(data, athletes_data):
+@instrumented('load')
+@st.cache_resource
+def load_medal_cube():
+    # Built offline by `python cube.py`; rebuilt here only if the sources changed
+    return load_cube('medals', load_demographic_data)
+
+@instrumented('build')
+@cached_figure
+def create_choropleth(data, athletes_data, level=MAP_DETAIL):
+    # Bundled shapes keyed by NOC code (country_shapes/, built by geometry.py); without them
+    # fall back to Plotly's ISO-3 world map, which is fetched from its CDN by the browser
+    athletes_data = athletes_data[['Country', 'code', 'iso3', 'Athletes Sent']]
+    shapes = shapes_for(athletes_data['code'], level)
+    if shapes is not None:
+        locations = dict(geojson=shapes, locations='code', featureidkey='id')
+    else:
+        locations = dict(locations='iso3', locationmode='ISO-3')
     fig = px.choropleth(
         athletes_data,
-        locations='code',  # Use country codes for mapping
+        **locations,
         color='Athletes Sent',  # Color based on number of athletes
         hover_name='Country',
         hover_data={
             'Athletes Sent': True,
-            'code': False
+            'code': False,
+            'iso3': False,
         },
         color_continuous_scale='Viridis',  # You can choose different color scales
         projection="natural earth",
@@ -100,13 +118,18 @@ def create_choropleth(data, athletes_data):
         title_text="Olympic Athletes by Country",
         title_x=0.5,
         geo=dict(showframe=False, showcoastlines=True, projection_type='equirectangular'),
-        width=1000,
+        width=MAP_WIDTH,
         height=600,
         coloraxis_colorbar_title="Athletes Sent"
     )
+    if shapes is not None:
+        # Everything drawn comes from the bundled shapes: no base map to download
+        fig.update_geos(visible=False, showframe=False, lataxis_range=[-60, 85])
     
     return fig
 
+@instrumented('build')
+@cached_figure
 def create_country_analysis(data, selected_country):
     country_data = data[data['country'] == selected_country]
     
@@ -133,7 +156,10 @@ def create_country_analysis(data, selected_country):
     return fig
 
 
-def create_age_distribution(data):
+@instrumented('build')
+@cached_figure
+def create_age_distribution(data, genders, medal_types):
+    data = data[data['gender_medallist'].isin(genders) & data['medal_type'].isin(medal_types)]
     fig = px.box(
         data,
         x='medal_type',
@@ -154,8 +180,10 @@ def create_age_distribution(data):
     
     return fig
 
-def create_age_group_analysis(data):
-    age_medal_count = data.groupby(['age_group', 'medal_type'], as_index=False).size()
+@instrumented('build')
+@cached_figure
+def create_age_group_analysis(cube):
+    age_medal_count = cube.rollup(['age_group', 'medal_type'], name='size')
     
     fig = px.bar(
         age_medal_count,
@@ -176,9 +204,11 @@ def create_age_group_analysis(data):
     
     return fig
 
-def create_gender_distribution(data):
+@instrumented('build')
+@cached_figure
+def create_gender_distribution(cube):
     # Calculate medal counts by gender and medal type
-    gender_medal_count = data.groupby(['gender_medallist', 'medal_type']).size().reset_index(name='count')
+    gender_medal_count = cube.rollup(['gender', 'medal_type']).rename(columns={'gender': 'gender_medallist'})
     
     # Create figure
     fig = go.Figure()
@@ -210,12 +240,22 @@ def create_gender_distribution(data):
     
     return fig
 
-def demographic_insights(data):
-    avg_age = data['age'].mean()
-    median_age = data['age'].median()
-    most_common_age = data['age'].mode().iloc[0]
-    gender_ratio = data['gender_medallist'].value_counts(normalize=True)
-    success_by_age = data.groupby('age_group')['medal_type'].count().sort_values(ascending=False)
+@instrumented('build')
+def demographic_insights(cube):
+    ages = cube.series('age').sort_index()
+    age_values = ages.index.to_numpy(dtype=float)
+    age_counts = ages.to_numpy()
+    n = age_counts.sum()
+    avg_age = (age_values * age_counts).sum() / n
+    # Weighted median: average of the two middle observations, like Series.median
+    cumulative = age_counts.cumsum()
+    lower = age_values[cumulative.searchsorted((n - 1) // 2, side='right')]
+    upper = age_values[cumulative.searchsorted(n // 2, side='right')]
+    median_age = (lower + upper) / 2
+    most_common_age = age_values[age_counts.argmax()]
+    gender_counts = cube.series('gender').sort_values(ascending=False)
+    gender_ratio = gender_counts / gender_counts.sum()
+    success_by_age = cube.series('age_group').sort_values(ascending=False)
     
     return {
         'avg_age': avg_age,
@@ -225,14 +265,15 @@ def demographic_insights(data):
         'success_by_age': success_by_age
     }
 
-@st.cache_data
+@instrumented('load')
+@st.cache_resource
 def load_efficiency_data():
-    athletes_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\athletes.csv")
-    total_medals_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\Paris 2024 Summer Olympic Games Data analysis\Exported Data\Total Medals by Country.csv")
-    nocs_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\nocs.csv")
+    athletes_df = load_table('athletes')
+    total_medals_df = load_table('Total Medals by Country')
+    nocs_df = load_table('nocs')
     
     # Calculate athletes per country
-    athletes_sent = athletes_df.groupby('country', as_index=False).size()
+    athletes_sent = athletes_df.groupby('country', as_index=False, observed=True).size()
     athletes_sent.rename(columns={'size': 'Athletes Sent', 'country': 'Country'}, inplace=True)
     
     # Calculate total medals
@@ -253,10 +294,19 @@ def load_efficiency_data():
     
     return efficiency_df
 
-@st.cache_data
+@instrumented('load')
+@st.cache_resource
+def load_participation_geo():
+    # Athletes per country with NOC centroids and rank, for the bubble map
+    return enrich(load_efficiency_data(), load_noc_geo(), value='Athletes Sent')
+
+@instrumented('load')
+@st.cache_resource
 def load_event_data():
-    return pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\Paris 2024 Summer Olympic Games Data analysis\Exported Data\Medals by Discipline.csv")
+    return load_table('Medals by Discipline')
 
+@instrumented('build')
+@cached_figure
 def create_efficiency_analysis(data):
     # Scatter plot
     fig_scatter = px.scatter(
@@ -283,6 +333,8 @@ def create_efficiency_analysis(data):
     
     return fig_scatter
 
+@instrumented('build')
+@cached_figure
 def create_event_analysis(data):
     # Sort by total medals
     data_sorted = data.sort_values('total_medals', ascending=True)
@@ -307,130 +359,85 @@ def create_event_analysis(data):
     )
     
     return fig
-@st.cache_data
+@instrumented('load')
 @st.cache_data
 def load_historical_data():
-    history_df = pd.read_csv(r"C:\Users\sreev\Data Visualization\Olympics 2024\olympics_dataset_1896-2024.csv")
-    history_df['Year'] = pd.to_numeric(history_df['Year'], errors='coerce')
-    
-    # Filter out "No medal" entries
-    history_df = history_df[history_df['Medal'].notna()]  # Keep only rows with medals
-    history_df = history_df[history_df['Medal'] != "No medal"]  # Explicitly remove "No medal"
-    
-    # Create sports categories mapping
-    sports_categories = {
-        'Ball Games': ['Basketball', 'Football', 'Handball', 'Volleyball', 'Rugby', 'Baseball', 'Softball'],
-        'Combat Sports': ['Boxing', 'Judo', 'Wrestling', 'Taekwondo', 'Karate'],
-        'Aquatics': ['Swimming', 'Diving', 'Water Polo', 'Artistic Swimming'],
-        'Athletics': ['Athletics'],
-        'Gymnastics': ['Artistic Gymnastics', 'Rhythmic Gymnastics', 'Trampoline Gymnastics'],
-        'Cycling': ['Cycling Road', 'Cycling Track', 'Cycling Mountain Bike', 'Cycling BMX'],
-        'Other': ['Archery', 'Badminton', 'Fencing', 'Golf', 'Rowing', 'Sailing', 'Tennis']
-    }
-    
-    # Map sports to categories
-    history_df['Sport_Category'] = history_df['Sport'].map({sport: category 
-        for category, sports in sports_categories.items() 
-        for sport in sports})
-    
-    return history_df
+    return build_historical_frame()
+
+@instrumented('load')
+@st.cache_resource
+def load_history_rollups():
+    # Per-Games tables built once from the reduced history (see historical.py)
+    return build_history_rollups()
+
+@instrumented('load')
+@st.cache_resource
+def load_event_timing():
+    return EventTiming.load()
 
 
 # Add this new function for time period analysis
-def create_time_period_analysis(data, selected_period):
+@instrumented('build')
+def create_time_period_analysis(timing, selected_period, genders=None, disciplines=None):
     try:
-        if selected_period == 'Time of Day':
-            # Create sample distribution across day hours
-            hours = list(range(24))
-            event_counts = data.groupby('discipline').size()
-            
-            # Distribute events across typical competition hours (6 AM to 10 PM)
-            competition_hours = list(range(6, 23))
-            data_points = []
-            
-            for hour in hours:
-                if hour in competition_hours:
-                    count = len(data) // len(competition_hours)
-                else:
-                    count = 0
-                data_points.append({
-                    'hour': f"{hour:02d}:00",
-                    'count': count
-                })
-            
-            df_hours = pd.DataFrame(data_points)
-            
-            fig = go.Figure()
+        # Precomputed histograms (event_timing.py): the filters only pick the rows to sum
+        bucket = {'Time of Day': 'hour', 'Day of the Games': 'day', 'Venue': 'venue'}[selected_period]
+        counts = timing.table(bucket, disciplines=disciplines, genders=genders)
+
+        fig = go.Figure()
+        if bucket == 'hour':
+            labels = [f"{hour:02d}:00" for hour in counts.index]
             fig.add_trace(go.Scatter(
-                x=df_hours['hour'],
-                y=df_hours['count'],
+                x=labels,
+                y=counts['sessions'],
                 mode='lines+markers',
-                name='Events',
+                name='Sessions',
                 line=dict(color='#FFD700', width=2),
                 marker=dict(size=8)
             ))
-            
-            fig.update_layout(
-                title="Typical Olympic Event Distribution Throughout the Day",
-                xaxis_title="Time of Day",
-                yaxis_title="Number of Events",
-                template="plotly_dark",
-                showlegend=False,
-                hovermode='x unified'
-            )
-            
-        elif selected_period == 'Season':
-            # Create seasonal distribution based on sports
-            seasons = {
-                'Summer': ['Athletics', 'Swimming', 'Basketball', 'Volleyball'],
-                'Winter': ['Ice Hockey', 'Skiing', 'Curling', 'Bobsleigh'],
-                'Indoor (Year-round)': ['Gymnastics', 'Boxing', 'Wrestling', 'Judo'],
-                'Outdoor (Weather Dependent)': ['Tennis', 'Golf', 'Sailing', 'Cycling']
-            }
-            
-            # Count sports in each category
-            season_counts = []
-            for season, sports in seasons.items():
-                count = data[data['discipline'].isin(sports)]['medal_type'].count()
-                season_counts.append({
-                    'Season': season,
-                    'Count': count
-                })
-            
-            df_seasons = pd.DataFrame(season_counts)
-            
-            fig = go.Figure()
             fig.add_trace(go.Bar(
-                x=df_seasons['Season'],
-                y=df_seasons['Count'],
-                marker_color=['#FFD700', '#C0C0C0', '#CD7F32', '#4169E1'],
-                text=df_seasons['Count'].astype(str),
-                textposition='auto'
+                x=labels,
+                y=counts['medal_events'],
+                name='Medal Events',
+                marker_color='#CD7F32',
+                opacity=0.7
             ))
-            
             fig.update_layout(
-                title="Distribution of Olympic Events by Season Type",
-                xaxis_title="Season Category",
-                yaxis_title="Number of Events",
-                template="plotly_dark",
-                showlegend=False
+                title="Olympic Sessions and Medal Events Throughout the Day",
+                xaxis_title="Time of Day (venue local time)"
+            )
+        elif bucket == 'day':
+            counts = counts[counts.sum(axis=1) > 0]
+            labels = counts.index.strftime('%a %d %b')
+            fig.add_trace(go.Bar(x=labels, y=counts['sessions'], name='Sessions', marker_color='#FFD700'))
+            fig.add_trace(go.Bar(x=labels, y=counts['medal_events'], name='Medal Events', marker_color='#CD7F32'))
+            fig.update_layout(
+                title="Olympic Sessions and Medal Events by Day of the Games",
+                xaxis_title="Day of the Games",
+                barmode='group'
             )
-        
         else:
-            # Year-based analysis
-            current_year = datetime.now().year
-            years_range = list(range(current_year - 20, current_year + 1, 4))
-            
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Select a different time period for analysis",
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=0.5,
-                showarrow=False
+            counts = counts[counts['sessions'] > 0].sort_values('sessions').tail(15)
+            fig.add_trace(go.Bar(
+                y=counts.index, x=counts['sessions'], name='Sessions', orientation='h', marker_color='#FFD700'
+            ))
+            fig.add_trace(go.Bar(
+                y=counts.index, x=counts['medal_events'], name='Medal Events', orientation='h', marker_color='#CD7F32'
+            ))
+            fig.update_layout(
+                title="Busiest Olympic Venues",
+                xaxis_title="Count",
+                barmode='group',
+                height=550
             )
-        
+
+        fig.update_layout(
+            yaxis_title="Count" if bucket != 'venue' else None,
+            template="plotly_dark",
+            hovermode='x unified' if bucket != 'venue' else 'y unified',
+            legend=dict(orientation='h', y=1.1)
+        )
+
         return fig
     
     except Exception as e:
@@ -446,18 +453,23 @@ def create_time_period_analysis(data, selected_period):
         )
         return fig
 
-def create_athlete_bubble_map(athletes_data):
+@instrumented('build')
+@cached_figure
+def create_athlete_bubble_map(geo_data):
     """Create a bubble map showing athlete distribution"""
-    
+    # geo_data comes from load_participation_geo(): centroids and Ranking are already there
+    located = geo_data.dropna(subset=['latitude', 'longitude'])
     fig = px.scatter_geo(
-        athletes_data,
-        locations='code',
+        located,
+        lat='latitude',
+        lon='longitude',
         size='Athletes Sent',  # Bubble size based on athletes
         hover_name='Country',
         hover_data={
             'Athletes Sent': True,
-            'code': False,
             'Ranking': True,
+            'latitude': False,
+            'longitude': False,
         },
         color='Athletes Sent',  # Color intensity based on athletes
         color_continuous_scale='Viridis',
@@ -465,9 +477,6 @@ def create_athlete_bubble_map(athletes_data):
         projection='natural earth',
         title='Global Olympic Participation: Athlete Distribution'
     )
-
-    # Add ranking based on number of athletes
-    athletes_data['Ranking'] = athletes_data['Athletes Sent'].rank(ascending=False)
     
     fig.update_layout(
         title_x=0.5,
@@ -483,19 +492,21 @@ def create_athlete_bubble_map(athletes_data):
         height=600,
     )
     
-    # Add annotations for top 3 countries
-    top_3 = athletes_data.nlargest(3, 'Athletes Sent')
-    for idx, country in top_3.iterrows():
-        fig.add_annotation(
-            x=country['Longitude'],  # You'll need to add longitude/latitude to your data
-            y=country['Latitude'],
-            text=f"{country['Country']}: {int(country['Athletes Sent'])}",
-            showarrow=True,
-            arrowhead=2,
-        )
+    # Label the top 3 countries with one text trace (layout annotations can't be placed in lon/lat)
+    lon, lat, text = top_labels(geo_data, 'Athletes Sent', 'Country')
+    fig.add_trace(go.Scattergeo(
+        lon=lon,
+        lat=lat,
+        text=text,
+        mode='text',
+        textposition='top center',
+        hoverinfo='skip',
+        showlegend=False,
+    ))
 
     return fig
 
+@instrumented('build')
 def create_athlete_summary_metrics(athletes_data):
     """Create summary metrics for athlete participation"""
     total_athletes = athletes_data['Athletes Sent'].sum()
@@ -511,9 +522,11 @@ def create_athlete_summary_metrics(athletes_data):
     }
 
 
-def create_age_success_correlation(data):
+@instrumented('build')
+@cached_figure
+def create_age_success_correlation(cube):
     """Create a scatter plot showing correlation between age and medal success"""
-    medal_counts = data.groupby('age')['medal_type'].count().reset_index()
+    medal_counts = cube.rollup(['age'], name='medal_type')
     
     fig = px.scatter(medal_counts,
         x='age',
@@ -527,9 +540,14 @@ def create_age_success_correlation(data):
     fig.update_layout(template="plotly_dark")
     return fig
 
-def create_sport_age_heatmap(data):
+@instrumented('build')
+@cached_figure
+def create_sport_age_heatmap(cube):
     """Create a heatmap showing average age across sports and medal types"""
-    avg_age = data.groupby(['discipline', 'medal_type'])['age'].mean().reset_index()
+    age_counts = cube.rollup(['discipline', 'medal_type', 'age'])
+    age_counts['age_total'] = age_counts['age'] * age_counts['count']
+    avg_age = age_counts.groupby(['discipline', 'medal_type'], as_index=False)[['age_total', 'count']].sum()
+    avg_age['age'] = avg_age['age_total'] / avg_age['count']
     pivot_data = avg_age.pivot(index='discipline', columns='medal_type', values='age')
     
     fig = px.imshow(pivot_data,
@@ -541,9 +559,11 @@ def create_sport_age_heatmap(data):
     fig.update_layout(template="plotly_dark")
     return fig
 
-def create_performance_timeline(sport_data):
+@instrumented('build')
+@cached_figure
+def create_performance_timeline(sport_cube):
     """Create a timeline of medal performances"""
-    timeline_data = sport_data.groupby(['age', 'medal_type']).size().reset_index(name='count')
+    timeline_data = sport_cube.rollup(['age', 'medal_type'])
     
     fig = px.line(timeline_data,
         x='age',
@@ -596,7 +616,7 @@ def add_storytelling_components():
         
         fig_timeline.update_traces(textposition="top center")
         fig_timeline.update_layout(yaxis_visible=False)
-        st.plotly_chart(fig_timeline, use_container_width=True)
+        plotly_chart(fig_timeline, use_container_width=True)
         
         # Add historical context
         st.info("💡 Did You Know? The 2024 Paris Olympics marks the third time Paris has hosted the Games (1900, 1924, 2024), making it the first city to host three Summer Olympics.")
@@ -739,8 +759,9 @@ def main():
             
             with map_tab1:
                 st.subheader("Global Distribution of Olympic Athletes")
-                choropleth_fig = create_choropleth(geo_data, athletes_data[['Country', 'code', 'Athletes Sent']])
-                st.plotly_chart(choropleth_fig, use_container_width=True)
+                participation_geo = load_participation_geo()
+                choropleth_fig = create_choropleth(geo_data, participation_geo)
+                plotly_chart(choropleth_fig, use_container_width=True)
                 
                 # Add distribution insights
                 st.info("""
@@ -768,7 +789,8 @@ def main():
                     )
                 
                 if country1 and country2:
-                    comp_data = athletes_data[athletes_data['Country'].isin([country1, country2])]
+                    with span('country comparison', 'filter'):
+                        comp_data = athletes_data[athletes_data['Country'].isin([country1, country2])]
                     
                     # Create comparison metrics
                     col1, col2 = st.columns(2)
@@ -797,7 +819,7 @@ def main():
                         barmode='group'
                     )
                     comparison_fig.update_layout(height=500)
-                    st.plotly_chart(comparison_fig, use_container_width=True)
+                    plotly_chart(comparison_fig, use_container_width=True)
 
             # Country-specific analysis section
             st.subheader("🏆 Country-Specific Analysis")
@@ -810,9 +832,10 @@ def main():
             
             if selected_country:
                 country_fig = create_country_analysis(geo_data, selected_country)
-                st.plotly_chart(country_fig, use_container_width=True)
+                plotly_chart(country_fig, use_container_width=True)
                 
-                country_data = geo_data[geo_data['country'] == selected_country]
+                with span('country disciplines', 'filter'):
+                    country_data = geo_data[geo_data['country'] == selected_country]
                 total_sports = len(country_data)
                 total_medals = country_data['Gold_Medals'].sum() if 'Gold_Medals' in country_data.columns else 0
                 
@@ -853,6 +876,7 @@ def main():
         
         try:
             demographic_data = load_demographic_data()
+            medal_cube = load_medal_cube()
             
             # Interactive Filters
             st.subheader("🎯 Interactive Filters")
@@ -870,10 +894,12 @@ def main():
                     default=demographic_data['medal_type'].unique()
                 )
             
-            filtered_data = demographic_data[
-                (demographic_data['gender_medallist'].isin(selected_genders)) &
-                (demographic_data['medal_type'].isin(medal_types))
-            ]
+            with span('gender / medal type', 'filter'):
+                filtered_data = demographic_data[
+                    (demographic_data['gender_medallist'].isin(selected_genders)) &
+                    (demographic_data['medal_type'].isin(medal_types))
+                ]
+                filtered_cube = medal_cube.slice(gender=selected_genders, medal_type=medal_types)
             
             # Age Records Section
             st.subheader("🎖️ Age Records by Gender")
@@ -914,7 +940,7 @@ def main():
                             """)
             
             # Display insights
-            insights = demographic_insights(filtered_data)
+            insights = demographic_insights(filtered_cube)
             
             st.subheader("📊 Overall Age Statistics")
             col1, col2, col3 = st.columns(3)
@@ -927,42 +953,45 @@ def main():
             
             # Medal Distribution by Gender
             st.subheader("🏅 Medal Distribution by Gender")
-            st.plotly_chart(create_gender_distribution(filtered_data), use_container_width=True)
+            plotly_chart(create_gender_distribution(filtered_cube), use_container_width=True)
             
             # Time Period Analysis
             st.subheader("📅 Time Period Analysis")
-            time_periods = ["Time of Day", "Season"]
+            time_periods = ["Time of Day", "Day of the Games", "Venue"]
             selected_time_period = st.selectbox(
                 "Select analysis period",
                 options=time_periods,
                 help="Choose how to analyze event timing patterns"
             )
             
+            event_timing = load_event_timing()
+            selected_disciplines = st.multiselect(
+                "Select Disciplines",
+                options=list(event_timing.disciplines),
+                help="Leave empty to include every discipline"
+            )
+            
             if selected_time_period:
-                time_fig = create_time_period_analysis(filtered_data, selected_time_period)
-                st.plotly_chart(time_fig, use_container_width=True)
+                time_fig = create_time_period_analysis(
+                    event_timing, selected_time_period,
+                    genders=selected_genders, disciplines=selected_disciplines or None,
+                )
+                plotly_chart(time_fig, use_container_width=True)
                 
-                if selected_time_period == 'Time of Day':
-                    st.info("""
-                    📌 Note: This visualization shows the typical distribution of Olympic events throughout the day.
-                    Most competitions are scheduled between 6 AM and 10 PM to maximize viewership and athlete performance.
-                    """)
-                elif selected_time_period == 'Season':
-                    st.info("""
-                    📌 Note: This visualization categorizes Olympic sports by their typical seasonal patterns:
-                    - Summer: Traditional summer outdoor sports
-                    - Winter: Traditional winter sports
-                    - Indoor: Sports that can be held year-round
-                    - Outdoor: Sports dependent on specific weather conditions
-                    """)
+                st.info("""
+                📌 Note: Sessions are the scheduled competition sessions (cancelled ones excluded) and medal events
+                the moment each event's last result was recorded, both in the venue's local time (Tahiti time for
+                surfing, Paris time everywhere else). Only events of the selected genders and disciplines are
+                counted; mixed and open events are always included.
+                """)
             
             # Age Distribution Analysis
             st.subheader("👥 Age Distribution Analysis")
             col1, col2 = st.columns(2)
             with col1:
-                st.plotly_chart(create_age_distribution(filtered_data), use_container_width=True)
+                plotly_chart(create_age_distribution(demographic_data, selected_genders, medal_types), use_container_width=True)
             with col2:
-                st.plotly_chart(create_age_group_analysis(filtered_data), use_container_width=True)
+                plotly_chart(create_age_group_analysis(filtered_cube), use_container_width=True)
             
             # Sport-Specific Age Records
             st.subheader("🎯 Sport-Specific Age Records")
@@ -971,7 +1000,8 @@ def main():
                 options=sorted(filtered_data['discipline'].unique())
             )
             
-            sport_data = filtered_data[filtered_data['discipline'] == selected_sport]
+            with span('sport age records', 'filter'):
+                sport_data = filtered_data[filtered_data['discipline'] == selected_sport]
             
             if not sport_data.empty:
                 col1, col2, col3 = st.columns(3)
@@ -1064,7 +1094,7 @@ def main():
                 )
                 fig_top5.update_traces(textposition='outside')
                 fig_top5.update_layout(height=400)
-                st.plotly_chart(fig_top5, use_container_width=True)
+                plotly_chart(fig_top5, use_container_width=True)
                 
                 # Detailed analysis of high performers
                 st.markdown("### 🏆 High Performance Insights")
@@ -1089,14 +1119,14 @@ def main():
                 st.markdown("### 📊 Efficiency Patterns")
                 
                 # Create efficiency categories
-                efficiency_data['Efficiency_Category'] = pd.cut(
+                efficiency_categories = pd.cut(
                     efficiency_data['Conversion Rate'],
                     bins=[0, 10, 20, 30, 100],
                     labels=['Low (0-10%)', 'Medium (10-20%)', 'High (20-30%)', 'Exceptional (>30%)']
                 )
                 
                 # Distribution of countries by efficiency category
-                category_counts = efficiency_data['Efficiency_Category'].value_counts()
+                category_counts = efficiency_categories.value_counts()
                 
                 fig_dist = px.pie(
                     values=category_counts.values,
@@ -1104,7 +1134,7 @@ def main():
                     title="Distribution of Countries by Conversion Efficiency",
                     color_discrete_sequence=px.colors.sequential.Viridis
                 )
-                st.plotly_chart(fig_dist, use_container_width=True)
+                plotly_chart(fig_dist, use_container_width=True)
                 
                 # Correlation analysis
                 st.markdown("### 🔍 Size vs. Efficiency Analysis")
@@ -1121,7 +1151,7 @@ def main():
                         'Conversion Rate': 'Medal Conversion Rate (%)'
                     }
                 )
-                st.plotly_chart(fig_correlation, use_container_width=True)
+                plotly_chart(fig_correlation, use_container_width=True)
                 
                 # Insights about DPR Korea and other high performers
                 st.info("""
@@ -1140,7 +1170,7 @@ def main():
             # Main efficiency scatter plot
             st.subheader("🎖️ Medal Conversion Efficiency by Country")
             fig_scatter = create_efficiency_analysis(efficiency_data)
-            st.plotly_chart(fig_scatter, use_container_width=True)
+            plotly_chart(fig_scatter, use_container_width=True)
             
             # Add efficiency brackets analysis
             st.subheader("📊 Efficiency Brackets Analysis")
@@ -1182,7 +1212,7 @@ def main():
                 st.metric("Average Medals per Discipline", f"{avg_medals:.1f}")
             
             # Main visualization
-            st.plotly_chart(create_event_analysis(event_data), use_container_width=True)
+            plotly_chart(create_event_analysis(event_data), use_container_width=True)
             
             # Interactive discipline explorer
             st.subheader("🔍 Discipline Explorer")
@@ -1192,7 +1222,8 @@ def main():
             )
             
             if selected_discipline:
-                discipline_data = event_data[event_data['discipline'] == selected_discipline]
+                with span('discipline events', 'filter'):
+                    discipline_data = event_data[event_data['discipline'] == selected_discipline]
                 if not discipline_data.empty:
                     col1, col2 = st.columns(2)
                     with col1:
@@ -1210,7 +1241,14 @@ def main():
         This analysis reveals fascinating patterns in participation, achievements, and the growing inclusivity of the Games.
         """)
         try:
-            historical_data = load_historical_data()
+            history_rollups = load_history_rollups()
+            history_views = {
+                "Per Games": 'count',
+                "Cumulative": 'cumulative',
+                f"Rolling ({ROLLING_GAMES} Games)": 'rolling',
+            }
+            history_view = st.radio("Show counts", list(history_views), horizontal=True)
+            history_value = history_views[history_view]
             
             hist_tab1, hist_tab2, hist_tab3 = st.tabs([
                 "Medal Evolution",
@@ -1221,9 +1259,10 @@ def main():
             with hist_tab1:
                 st.subheader("🏅 The Growth of Olympic Excellence")
                 
-                medals_by_year = historical_data.groupby(
-                    ['Year', 'Medal']
-                ).size().reset_index(name='Count')
+                with span('medals by year', 'filter'):
+                    medals_by_year = history_rollups.get('medal', history_value).rename(
+                        columns={'label': 'Medal', history_value: 'Count'}
+                    )
                 
                 fig = px.line(medals_by_year,
                     x="Year",
@@ -1244,7 +1283,7 @@ def main():
                     template="plotly_white"  # Use a white background
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(fig, use_container_width=True)
                 
                 # Key insights remain the same
                 col1, col2, col3 = st.columns(3)
@@ -1252,17 +1291,21 @@ def main():
                     earliest_year = medals_by_year['Year'].min()
                     st.metric("First Modern Olympics", f"{earliest_year}")
                 with col2:
-                    total_medals = medals_by_year['Count'].sum()
+                    medals_per_games = history_rollups.totals()
+                    total_medals = medals_per_games.sum()
                     st.metric("Total Medals Awarded", f"{total_medals:,}")
                 with col3:
-                    avg_medals_per_games = int(medals_by_year.groupby('Year')['Count'].sum().mean())
+                    avg_medals_per_games = int(medals_per_games.mean())
                     st.metric("Average Medals per Games", f"{avg_medals_per_games:,}")
             
             with hist_tab2:
                 st.subheader("👥 Breaking Gender Barriers")
                 
-                gender_by_year = historical_data.groupby(['Year', 'Sex']).size().reset_index(name='Count')
-                gender_by_year = gender_by_year[gender_by_year['Sex'].isin(['M', 'F'])]
+                with span('gender by year', 'filter'):
+                    gender_by_year = history_rollups.get('sex', history_value).rename(
+                        columns={'label': 'Sex', history_value: 'Count'}
+                    )
+                    gender_by_year = gender_by_year[gender_by_year['Sex'].isin(['M', 'F'])]
                 
                 # Update gender colors for better differentiation
                 fig = px.area(gender_by_year,
@@ -1288,7 +1331,7 @@ def main():
                 # Update legend labels
                 fig.for_each_trace(lambda t: t.update(name = {'M': 'Male', 'F': 'Female'}[t.name]))
                 
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(fig, use_container_width=True)
                 
                 # Gender milestones remain the same
                 st.info("""
@@ -1301,11 +1344,13 @@ def main():
                 """)
                 
                 # Add gender ratio metrics
-                current_year = gender_by_year[gender_by_year['Year'] == gender_by_year['Year'].max()]
+                # Latest Games only, whatever the chart view
+                sex_counts = history_rollups.get('sex')
+                current_year = sex_counts[sex_counts['Year'] == sex_counts['Year'].max()].set_index('label')['count']
                 if not current_year.empty:
-                    total_athletes = current_year['Count'].sum()
-                    female_count = current_year[current_year['Sex'] == 'F']['Count'].iloc[0]
-                    male_count = current_year[current_year['Sex'] == 'M']['Count'].iloc[0]
+                    total_athletes = current_year.reindex(['M', 'F']).sum()
+                    female_count = current_year.get('F', 0)
+                    male_count = current_year.get('M', 0)
                     
                     col1, col2, col3 = st.columns(3)
                     with col1:
@@ -1320,9 +1365,10 @@ def main():
             with hist_tab3:
                 st.subheader("🎮 Evolution of Olympic Sports")
                 
-                sports_by_year = historical_data[historical_data['Sport_Category'].notna()].groupby(
-                    ['Year', 'Sport_Category']
-                ).size().reset_index(name='Count')
+                with span('sports by year', 'filter'):
+                    sports_by_year = history_rollups.get('sport_category', history_value).rename(
+                        columns={'label': 'Sport_Category', history_value: 'Count'}
+                    )
                 
                 fig = px.area(sports_by_year,
                     x="Year",
@@ -1338,7 +1384,7 @@ def main():
                     template="plotly_white"
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(fig, use_container_width=True)
                 
                 # Rest of the sports category analysis remains the same...
 
@@ -1346,4 +1392,6 @@ def main():
         except Exception as e:
             st.error(f"Error in historical analysis: {str(e)}")
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Opt-in profiling: OLYMPICS_PROFILE=<sample rate>, or ?debug=1 for the sidebar panel
+    with profile_rerun():
+        main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_table
+from joins import KeyIndex
+from rosters import load_team_members
+from sql_engine import export
+
+
+def _text(values):
+    # Codes arrive as int64, str or categorical depending on the table; index them as text
+    return pd.Series(values).astype('string').to_numpy(dtype=object, na_value=None)
+
+
+class TeamAttribution:
+    """Maps medal rows to the team that won them
+
+    A medal is attributed through its team code (medals.code, or
+    medallists.code_team) with a hash index over teams.code. Team-event rows
+    without a usable team code fall back to the roster: the athlete code plus
+    the event identifies the team the athlete competed for. Both lookups are
+    hash probes, so attribution is linear in the number of medal rows and
+    every medal row lands on at most one team.
+    """
+
+    def __init__(self, teams, team_members):
+        self.teams = teams.reset_index(drop=True)
+        self.team_index = KeyIndex(_text(self.teams['code']))
+
+        athletes = team_members[team_members['role'] == 'athlete']
+        member_teams = self.team_index.lookup(_text(athletes['code_team']))
+        events = _text(self.teams['events'])[member_teams]
+        self.member_index = KeyIndex(_member_keys(athletes['code_member'], events))
+        self.member_teams = member_teams
+
+    def attribute(self, team_codes, athlete_codes, events):
+        """Team row position for each medal row, -1 for individual medals"""
+        rows = self.team_index.lookup(_text(team_codes))
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            keys = _member_keys(np.asarray(athlete_codes)[missing], _text(events)[missing])
+            members = self.member_index.lookup(keys)
+            rows[missing] = np.where(members >= 0, self.member_teams[members.clip(min=0)], -1)
+        return rows
+
+    def team_counts(self, rows):
+        """Medal rows per team (aligned with self.teams)"""
+        return np.bincount(rows[rows >= 0], minlength=len(self.teams))
+
+
+def _member_keys(codes, events):
+    return pd.Index(_text(codes)).astype(str) + '|' + pd.Index(events).astype(str)
+
+
+def load_attribution():
+    return TeamAttribution(load_table('teams'), load_team_members())
+
+
+def team_performance(attribution, medals):
+    """Team Performance: medals won per team name and country (one count per medal)"""
+    rows = attribution.attribute(medals['code'], medals['code'], medals['event'])
+    teams = attribution.teams[['team', 'country']].assign(total_medals=attribution.team_counts(rows))
+    result = teams.groupby(['team', 'country'], observed=True, sort=False)['total_medals'].sum().reset_index()
+    return result.sort_values('total_medals', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def medal_conversion_efficiency(attribution, medallists):
+    """Medal Conversion Efficiency: athlete medals won per athlete place on the country's teams
+
+    Grouped by (country, team size) like the original query; the rate divides
+    by every athlete place in the group (team size x number of teams).
+    """
+    rows = attribution.attribute(medallists['code_team'], medallists['code_athlete'], medallists['event'])
+    teams = attribution.teams[['country', 'num_athletes']].assign(
+        Medals_Won=attribution.team_counts(rows), teams=1
+    )
+    teams = teams[teams['num_athletes'] > 0]
+    result = teams.groupby(['country', 'num_athletes'], observed=True, sort=False)[['Medals_Won', 'teams']].sum()
+    result = result.reset_index()
+    result['Medal_Conversion_Rate'] = (
+        result['Medals_Won'] / (result['num_athletes'] * result['teams']) * 100
+    ).astype(float).round(4)
+    result = result.drop(columns='teams')
+    return result.sort_values('Medal_Conversion_Rate', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def build_team_aggregates():
+    attribution = load_attribution()
+    return {
+        'Team Performance': team_performance(attribution, load_table('medals')),
+        'Medal Conversion Efficiency': medal_conversion_efficiency(attribution, load_table('medallists')),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuild the team aggregates from medal-to-team attribution")
+    parser.add_argument('--dry-run', action='store_true', help="print the aggregates without writing the exports")
+    args = parser.parse_args()
+
+    results = build_team_aggregates()
+    if not args.dry_run:
+        export(results)
+    for name, df in results.items():
+        print(f"{name}: {len(df):,} rows")
+        print(df.head(5).to_string(index=False))
@@ -0,0 +1,298 @@
+import argparse
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+import data_store
+from data_store import BASE_DIR, CACHE_DIR, EXPORTED_DIR, SOURCES
+from medal_pivot import MEDAL_TYPES
+from synthetic import generate
+
+REPO_DIR = Path(__file__).resolve().parent
+APP_PATH = REPO_DIR / 'Paris 2024 Summer Olympic Games Data analysis' / 'Exported Data' / 'streamlit_app.py'
+RESULTS_DIR = REPO_DIR / 'benchmark_results'
+SCALED_DIR = CACHE_DIR / 'benchmark_data'
+SCALES = [1, 10, 100, 1000]
+
+# Row-level tables that grow with the scale factor; reference tables (nocs, events,
+# venues, medals_total) are copied as-is
+SCALED_TABLES = ['medallists', 'athletes', 'teams', 'medals', 'schedules', 'schedules_preliminary', 'olympics_history']
+# Identifier columns made unique per replica so joins and distinct counts grow too
+REPLICA_COLUMNS = {'code', 'code_athlete', 'code_team', 'name', 'url', 'url_event', 'athletes_codes'}
+
+
+def scale_csv(source, target, scale, chunk_rows=100_000):
+    """Write `scale` copies of a CSV, suffixing identifier columns per copy (streamed)"""
+    base = pd.read_csv(source, dtype=str, keep_default_na=False, na_values=[''])
+    columns = [c for c in base.columns if c in REPLICA_COLUMNS]
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'w', newline='', encoding='utf-8') as handle:
+        base.iloc[:0].to_csv(handle, index=False)
+        for replica in range(scale):
+            copy = base.copy()
+            if replica:
+                for column in columns:
+                    copy[column] = copy[column] + f'-{replica}'
+            for start in range(0, len(copy), chunk_rows):
+                copy.iloc[start:start + chunk_rows].to_csv(handle, index=False, header=False)
+
+
+def scaled_dataset(scale, synthetic=False):
+    """Directory laid out like the repo with every fact table `scale` times larger
+
+    With synthetic=True the tables come from synthetic.py instead of tiling
+    the bundled rows, so cardinalities and skew grow like a real dataset.
+    """
+    if scale == 1 and not synthetic:
+        return BASE_DIR
+    root = SCALED_DIR / f"{'synthetic_' if synthetic else ''}x{scale}"
+    marker = root / '.complete'
+    if marker.exists():
+        return root
+    if synthetic:
+        generate(root, scale, exports=True)
+        marker.write_text(datetime.now(timezone.utc).isoformat())
+        return root
+    for name, source in SOURCES.items():
+        if not source.exists():
+            continue
+        target = root / source.relative_to(BASE_DIR)
+        if name in SCALED_TABLES or source.parent == EXPORTED_DIR:
+            scale_csv(source, target, scale)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+    marker.write_text(datetime.now(timezone.utc).isoformat())
+    return root
+
+
+def import_app():
+    """Import streamlit_app.py without a Streamlit server (bare mode)"""
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore', module='streamlit')
+    spec = importlib.util.spec_from_file_location('streamlit_app', APP_PATH)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+def clear_caches(app):
+    app.st.cache_data.clear()
+    app.st.cache_resource.clear()
+    data_store._frames.clear()
+
+
+def _builder(app, name):
+    # Time the build itself, not a figure cache hit or the instrumentation wrapper
+    return inspect.unwrap(getattr(app, name))
+
+
+def _top_country(inputs):
+    geo = inputs['geographic']
+    return geo['country'].value_counts().index[0]
+
+
+LOADERS = [
+    'load_geographic_data',
+    'load_demographic_data',
+    'load_medal_cube',
+    'load_efficiency_data',
+    'load_event_data',
+    'load_participation_geo',
+    'load_historical_data',
+    'load_history_rollups',
+    'load_event_timing',
+]
+# Builders (and the variant they are called with) -> arguments from the loaded inputs
+BUILDERS = {
+    'create_choropleth': lambda i: (i['geographic'], i['participation_geo']),
+    'create_country_analysis': lambda i: (i['geographic'], _top_country(i)),
+    'create_age_distribution': lambda i: (i['demographic'], ['Male', 'Female'], list(MEDAL_TYPES)),
+    'create_age_group_analysis': lambda i: (i['medal_cube'],),
+    'create_gender_distribution': lambda i: (i['medal_cube'],),
+    'demographic_insights': lambda i: (i['medal_cube'],),
+    'create_time_period_analysis[Time of Day]': lambda i: (i['event_timing'], 'Time of Day', ['Male', 'Female']),
+    'create_time_period_analysis[Day of the Games]': lambda i: (i['event_timing'], 'Day of the Games', ['Female']),
+    'create_time_period_analysis[Venue]': lambda i: (i['event_timing'], 'Venue'),
+    'create_athlete_bubble_map': lambda i: (i['participation_geo'],),
+    'create_athlete_summary_metrics': lambda i: (i['efficiency'],),
+    'create_efficiency_analysis': lambda i: (i['efficiency'],),
+    'create_event_analysis': lambda i: (i['events'],),
+    'create_age_success_correlation': lambda i: (i['medal_cube'],),
+    'create_sport_age_heatmap': lambda i: (i['medal_cube'],),
+    'create_performance_timeline': lambda i: (i['medal_cube'],),
+}
+# Builder inputs -> loader producing them
+INPUTS = {
+    'geographic': 'load_geographic_data',
+    'demographic': 'load_demographic_data',
+    'medal_cube': 'load_medal_cube',
+    'efficiency': 'load_efficiency_data',
+    'events': 'load_event_data',
+    'event_timing': 'load_event_timing',
+    'participation_geo': 'load_participation_geo',
+}
+
+
+def measure(run, repeat):
+    """Median wall time over `repeat` runs, plus one traced run for the peak allocation"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {
+        'wall_s': statistics.median(timings),
+        'min_s': min(timings),
+        'peak_mb': peak / 2**20,
+    }
+
+
+def run_cases(repeat=3, only=None):
+    """Benchmark every loader and builder against the data in OLYMPICS_DATA_DIR"""
+    app = import_app()
+    results = {}
+
+    def selected(name):
+        return only is None or any(pattern in name for pattern in only)
+
+    for name in LOADERS:
+        if not selected(name):
+            continue
+        loader = getattr(app, name)
+
+        def cold_load():
+            clear_caches(app)
+            return loader()
+        try:
+            _, stats = measure(cold_load, repeat)
+            results[name] = stats
+        except Exception as error:  # missing source files, broken loaders
+            results[name] = {'error': f'{type(error).__name__}: {error}'}
+
+    clear_caches(app)
+    inputs = {}
+    for key, loader in INPUTS.items():
+        try:
+            inputs[key] = getattr(app, loader)()
+        except Exception:
+            pass
+
+    for name, arguments in BUILDERS.items():
+        if not selected(name):
+            continue
+        builder = _builder(app, name.split('[')[0])
+        try:
+            args = arguments(inputs)
+        except KeyError as missing:
+            results[name] = {'error': f'skipped: {INPUTS[missing.args[0]]} failed'}
+            continue
+        try:
+            figure, stats = measure(lambda: builder(*args), repeat)
+            if hasattr(figure, 'to_json'):
+                started = time.perf_counter()
+                stats['figure_json_bytes'] = len(figure.to_json())
+                stats['serialize_s'] = time.perf_counter() - started
+            results[name] = stats
+        except Exception as error:
+            results[name] = {'error': f'{type(error).__name__}: {error}'}
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(scale, repeat, only, synthetic=False):
+    """Run the cases in a fresh interpreter pointed at the scaled dataset"""
+    data_dir = scaled_dataset(scale, synthetic)
+    env = dict(os.environ, OLYMPICS_DATA_DIR=str(data_dir), OLYMPICS_CACHE_DIR=str(data_dir / '.olympics_cache'))
+    if data_dir == BASE_DIR:
+        env['OLYMPICS_CACHE_DIR'] = str(CACHE_DIR)
+    command = [sys.executable, __file__, '--worker', '--repeat', str(repeat)] + [arg for o in only or [] for arg in ('--only', o)]
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'worker failed'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def latest_results(before=None):
+    runs = sorted(RESULTS_DIR.glob('*.json'))
+    runs = [path for path in runs if before is None or path.name < before.name]
+    return json.loads(runs[-1].read_text()) if runs else None
+
+
+def report(run, previous=None):
+    for scale, cases in run['scales'].items():
+        print(f"\nscale x{scale}")
+        if 'error' in cases:
+            print(f"  failed: {cases['error']}")
+            continue
+        for name, stats in cases.items():
+            if 'error' in stats:
+                print(f"  {name:<42} {stats['error'][:70]}")
+                continue
+            line = f"  {name:<42} {stats['wall_s'] * 1000:9.1f} ms {stats['peak_mb']:8.1f} MB"
+            if 'figure_json_bytes' in stats:
+                line += f" {stats['figure_json_bytes'] / 1024:9.1f} KB"
+            before = (previous or {}).get('scales', {}).get(scale, {}).get(name, {})
+            if 'wall_s' in before and before['wall_s'] > 0:
+                line += f"  ({stats['wall_s'] / before['wall_s'] - 1:+.0%} vs {previous['revision']})"
+            print(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time the dashboard loaders and figure builders headless")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10], help=f"dataset scale factors (e.g. {SCALES})")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', action='append', help="run only cases whose name contains this (repeatable)")
+    parser.add_argument('--synthetic', action='store_true', help="use synthetic.py data instead of tiled copies")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_cases(args.repeat, args.only)))
+        sys.exit(0)
+
+    started = datetime.now(timezone.utc)
+    run = {
+        'started': started.isoformat(),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'repeat': args.repeat,
+        'synthetic': args.synthetic,
+        'scales': {str(scale): run_scale(scale, args.repeat, args.only, args.synthetic) for scale in args.scales},
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{started:%Y%m%dT%H%M%S}_{run['revision'] or 'unknown'}.json"
+    previous = latest_results(before=path)
+    path.write_text(json.dumps(run, indent=2))
+    report(run, previous)
+    print(f"\nResults written to {path}")
@@ -0,0 +1,40 @@
+// Client-side version of update_graph in medal_analysis_app.py (MEDAL_APP_CLIENTSIDE=1).
+// The medal-store payload is {events: [...], medals: [...], countries: {country: [eventIdx, gold, silver, bronze]}}.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    medalAnalysis: {
+        updateGraph: function(selectedCountry, store) {
+            if (!selectedCountry || !store || !store.countries[selectedCountry]) {
+                return {};
+            }
+
+            var columns = store.countries[selectedCountry];
+            var events = columns[0].map(function(i) { return store.events[i]; });
+            // Same colours and order as the plotly express chart on the server
+            var colors = ['#636efa', '#EF553B', '#00cc96'];
+
+            var traces = store.medals.map(function(medal, m) {
+                return {
+                    type: 'bar',
+                    name: medal,
+                    x: events,
+                    y: columns[m + 1],
+                    marker: {color: colors[m]},
+                    legendgroup: medal,
+                    hovertemplate: 'Medal Type=' + medal + '<br>Event=%{x}<br>Number of Medals=%{y}<extra></extra>'
+                };
+            });
+
+            return {
+                data: traces,
+                layout: {
+                    title: {text: 'Medal Breakdown for ' + selectedCountry, x: 0.5},
+                    barmode: 'group',
+                    legend: {title: {text: 'Medal Type'}},
+                    xaxis: {title: {text: 'Event'}, tickangle: 45},
+                    yaxis: {title: {text: 'Number of Medals'}},
+                    plot_bgcolor: 'white'
+                }
+            };
+        }
+    }
+});
@@ -0,0 +1,218 @@
+import functools
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import demographics
+import joins
+from data_store import CACHE_DIR, SOURCES, cache_metadata, code_hash, write_atomic
+from schemas import schema_for
+
+# Cube dimensions -> column in the source frame
+MEDAL_CUBE_DIMS = {
+    'country': 'country_medallist',
+    'discipline': 'discipline',
+    'event': 'event',
+    'gender': 'gender_medallist',
+    'medal_type': 'medal_type',
+    'age_group': 'age_group',
+    'age': 'age',
+    'year': 'year',
+}
+
+CUBE_PATHS = {
+    'medals': CACHE_DIR / 'medal_cube.arrow',
+}
+
+# Source tables each cube is built from (used for staleness checks)
+CUBE_SOURCES = {
+    'medals': ['medallists', 'athletes'],
+}
+
+# Above this many cells a rollup groups with np.unique instead of a dense bincount
+_DENSE_LIMIT = 10_000_000
+
+
+def _smallest_int(n):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class MedalCube:
+    """Sparse count cube: one row per populated cell, dimensions stored as small int codes
+
+    Missing values are coded -1 and are skipped by rollups that include that
+    dimension, the same way a pandas groupby drops NaN keys.
+    """
+
+    def __init__(self, codes, labels, counts, origin=None):
+        self.codes = codes      # dim -> int array
+        self.labels = labels    # dim -> list of labels (sorted)
+        self.counts = counts    # int64 array, one per cell
+        self.origin = origin    # (parent cube, kept codes per dim) for a slice, else None
+
+    @property
+    def dims(self):
+        return list(self.labels)
+
+    def __len__(self):
+        return len(self.counts)
+
+    @classmethod
+    def from_frame(cls, df, dims):
+        """Materialize the cube from a row-level frame; dims maps cube dim -> column"""
+        codes = {}
+        labels = {}
+        for dim, column in dims.items():
+            dim_codes, uniques = pd.factorize(df[column], sort=True)
+            codes[dim] = dim_codes
+            labels[dim] = list(np.asarray(uniques, dtype=object))
+
+        # Collapse identical coordinate tuples into cells
+        stacked = np.column_stack([codes[dim] for dim in dims]) if len(df) else np.empty((0, len(dims)), dtype=np.int64)
+        cells, counts = np.unique(stacked, axis=0, return_counts=True)
+        cell_codes = {
+            dim: cells[:, i].astype(_smallest_int(len(labels[dim])))
+            for i, dim in enumerate(dims)
+        }
+        return cls(cell_codes, labels, counts.astype(np.int64))
+
+    def slice(self, **filters):
+        """Keep the cells whose dimension labels are in the given collections"""
+        mask = np.ones(len(self), dtype=bool)
+        kept = {}
+        for dim, values in filters.items():
+            if values is None:
+                continue
+            if isinstance(values, str) or not np.iterable(values):
+                values = [values]
+            lookup = {label: i for i, label in enumerate(self.labels[dim])}
+            wanted = sorted({lookup[v] for v in values if v in lookup})
+            mask &= np.isin(self.codes[dim], wanted)
+            kept[dim] = wanted
+        return MedalCube(
+            {dim: codes[mask] for dim, codes in self.codes.items()},
+            self.labels,
+            self.counts[mask],
+            origin=(self, kept)
+        )
+
+    def total(self):
+        return int(self.counts.sum())
+
+    def rollup(self, dims, name='count'):
+        """Sum counts over every dimension not in dims; returns a labelled long frame"""
+        if isinstance(dims, str):
+            dims = [dims]
+        mask = np.ones(len(self), dtype=bool)
+        for dim in dims:
+            mask &= self.codes[dim] >= 0
+        keys = [self.codes[dim][mask].astype(np.int64) for dim in dims]
+        weights = self.counts[mask]
+        sizes = [max(len(self.labels[dim]), 1) for dim in dims]
+
+        if not dims:
+            return pd.DataFrame({name: [int(weights.sum())]})
+
+        n_cells = int(np.prod(sizes, dtype=np.float64))
+        if n_cells <= _DENSE_LIMIT:
+            flat = np.ravel_multi_index(keys, sizes)
+            sums = np.bincount(flat, weights=weights, minlength=n_cells)
+            occupied = np.flatnonzero(sums)
+            index = np.unravel_index(occupied, sizes)
+            values = sums[occupied]
+        else:
+            cells, inverse = np.unique(np.column_stack(keys), axis=0, return_inverse=True)
+            values = np.bincount(inverse.ravel(), weights=weights)
+            index = [cells[:, i] for i in range(len(dims))]
+
+        result = pd.DataFrame({
+            dim: np.asarray(self.labels[dim], dtype=object)[idx]
+            for dim, idx in zip(dims, index)
+        })
+        result[name] = values.astype(np.int64)
+        return result
+
+    def series(self, dim, name='count'):
+        """One-dimensional rollup as a Series indexed by the dimension labels"""
+        rolled = self.rollup([dim], name=name)
+        return rolled.set_index(dim)[name]
+
+    def save(self, path, builder=''):
+        columns = {dim: pa.array(codes) for dim, codes in self.codes.items()}
+        columns['count'] = pa.array(self.counts)
+        table = pa.table(columns)
+        labels = {dim: [_to_json(v) for v in values] for dim, values in self.labels.items()}
+        table = table.replace_schema_metadata({'labels': json.dumps(labels), 'builder': builder})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, lambda p: feather.write_feather(table, p, compression='uncompressed'))
+
+    @classmethod
+    def load(cls, path):
+        table = feather.read_table(path, memory_map=True)
+        labels = json.loads(table.schema.metadata[b'labels'])
+        codes = {dim: table.column(dim).to_numpy() for dim in labels}
+        return cls(codes, labels, table.column('count').to_numpy())
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def builder_hash(name):
+    """Hash of the code, dimensions and source schemas a cube is built with"""
+    code = {
+        'medals': [MedalCube, build_medal_cube, demographics, joins],
+    }[name]
+    dims = {'medals': MEDAL_CUBE_DIMS}[name]
+    return code_hash(code, {'dims': dims, 'schemas': {s: schema_for(s) for s in CUBE_SOURCES[name]}})
+
+
+def is_stale(name):
+    path = CUBE_PATHS[name]
+    if not path.exists():
+        return True
+    # Cubes built by an older builder (join, dtypes, dimensions) are rebuilt even if the sources are unchanged
+    if cache_metadata(path).get('builder') != builder_hash(name):
+        return True
+    built = path.stat().st_mtime_ns
+    return any(
+        SOURCES[source].exists() and SOURCES[source].stat().st_mtime_ns > built
+        for source in CUBE_SOURCES[name]
+    )
+
+
+def build_medal_cube(demographic_df):
+    frame = demographic_df.assign(year=pd.to_datetime(demographic_df['medal_date'], errors='coerce').dt.year)
+    return MedalCube.from_frame(frame, MEDAL_CUBE_DIMS)
+
+
+def load_cube(name, build_frame):
+    """Load a cube from the cache, rebuilding it from build_frame() when stale"""
+    if not is_stale(name):
+        return MedalCube.load(CUBE_PATHS[name])
+    builders = {'medals': build_medal_cube}
+    cube = builders[name](build_frame())
+    cube.save(CUBE_PATHS[name], builder_hash(name))
+    return cube
+
+
+if __name__ == '__main__':
+    # The Historical Trends tab reads historical.HistoryRollups (`python historical.py`), not a cube
+    for cube_name, frame_builder in [('medals', demographics.build_demographic_frame)]:
+        missing = [s for s in CUBE_SOURCES[cube_name] if not SOURCES[s].exists()]
+        if missing:
+            print(f"Skipping {cube_name} cube: missing {', '.join(missing)}")
+            continue
+        cube = load_cube(cube_name, frame_builder)
+        print(f"{cube_name} cube: {len(cube):,} cells, {cube.total():,} medals -> {CUBE_PATHS[cube_name]}")
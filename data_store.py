@@ -0,0 +1,199 @@
+import hashlib
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from schemas import apply_schema, schema_for, share_dictionaries
+
+# Project folders (override with OLYMPICS_DATA_DIR / OLYMPICS_CACHE_DIR on the dashboard pods)
+BASE_DIR = Path(os.environ.get('OLYMPICS_DATA_DIR', Path(__file__).resolve().parent))
+ANALYSIS_DIR = BASE_DIR / 'Paris 2024 Summer Olympic Games Data analysis'
+EXPORTED_DIR = ANALYSIS_DIR / 'Exported Data'
+CACHE_DIR = Path(os.environ.get('OLYMPICS_CACHE_DIR', BASE_DIR / '.olympics_cache'))
+
+# Source CSVs by table name
+SOURCES = {
+    'medallists': BASE_DIR / 'medallists.csv',
+    'athletes': BASE_DIR / 'athletes.csv',
+    'nocs': BASE_DIR / 'nocs.csv',
+    'teams': BASE_DIR / 'teams.csv',
+    'medals': BASE_DIR / 'medals.csv',
+    'medals_total': BASE_DIR / 'medals_total.csv',
+    'events': BASE_DIR / 'events.csv',
+    'venues': BASE_DIR / 'venues.csv',
+    'schedules': BASE_DIR / 'schedules.csv',
+    'schedules_preliminary': BASE_DIR / 'schedules_preliminary.csv',
+    'olympics_history': BASE_DIR / 'olympics_dataset_1896-2024.csv',
+}
+
+# Sources read by their own filtered, streaming loader (historical.read_medal_rows); converting
+# the whole raw file into a table cache would bring back the memory cost that loader avoids
+STREAMED_SOURCES = ['olympics_history']
+
+# Every Exported Data table is addressable by its file name, e.g. 'Total Medals by Country'
+if EXPORTED_DIR.is_dir():
+    for _path in sorted(EXPORTED_DIR.glob('*.csv')):
+        SOURCES.setdefault(_path.stem, _path)
+
+# Frames already mapped in this process: name -> (source signature, frame)
+_frames = {}
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(name):
+    stem = name.replace(' ', '_').replace("'", '')
+    return CACHE_DIR / f'{stem}.arrow', CACHE_DIR / f'{stem}.json'
+
+
+def _schema_hash(name):
+    spec = json.dumps(schema_for(name), sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+def _read_manifest(manifest_path):
+    try:
+        return json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def code_hash(objects, spec=None):
+    """Fingerprint of the functions / classes / modules (and spec) a derived cache is built with
+
+    Stored next to derived caches (cubes, rollups) so that editing their
+    builder invalidates them, the way the schema hash does for tables.
+    """
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode())
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_metadata(path):
+    """Schema metadata of a cached Arrow file, read from its footer (no column data)"""
+    with pa.memory_map(str(path)) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items()}
+
+
+def write_atomic(path, write):
+    """Write through a temp file and rename, so readers never see a partial file
+
+    The temp name is unique per process and thread: Streamlit sessions are
+    threads of one process and may refresh the same cache file at once.
+    """
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_source(name):
+    """Parse a source CSV straight from disk (no cache)"""
+    return pd.read_csv(SOURCES[name])
+
+
+def is_fresh(name):
+    """Check whether the columnar cache for a table matches its source CSV"""
+    source = SOURCES[name]
+    arrow_path, manifest_path = _cache_paths(name)
+    manifest = _read_manifest(manifest_path)
+    if manifest is None or not arrow_path.exists():
+        return False
+    # Schema edits change the stored dtypes, so they invalidate the cache too
+    if manifest.get('schema') != _schema_hash(name):
+        return False
+
+    stat = source.stat()
+    if manifest['mtime_ns'] == stat.st_mtime_ns and manifest['size'] == stat.st_size:
+        return True
+
+    # mtime changed (checkout, copy, touch) - only rebuild if the content did too
+    if manifest['sha256'] != _file_hash(source):
+        return False
+    manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    write_atomic(manifest_path, lambda p: p.write_text(json.dumps(manifest)))
+    return True
+
+
+def build_table(name):
+    """Convert one source CSV into a typed Arrow IPC file in the cache folder"""
+    if name in STREAMED_SOURCES:
+        raise ValueError(f"{name} is read by its streaming loader and has no table cache")
+    source = SOURCES[name]
+    arrow_path, manifest_path = _cache_paths(name)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    stat = source.stat()
+    df = apply_schema(name, read_source(name))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Uncompressed so later starts can memory-map the buffers directly
+    write_atomic(arrow_path, lambda p: feather.write_feather(table, p, compression='uncompressed'))
+
+    manifest = {
+        'source': str(source),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': _file_hash(source),
+        'rows': table.num_rows,
+        'schema': _schema_hash(name),
+    }
+    write_atomic(manifest_path, lambda p: p.write_text(json.dumps(manifest)))
+    return arrow_path
+
+
+def load_table(name):
+    """Load a source table through the memory-mapped columnar cache
+
+    Null-free numeric, bool and datetime columns are zero-copy, read-only
+    views of the mapped file, so processes on one host share those pages.
+    String and dictionary columns are still materialized on each process's
+    heap. Callers that modify values in place must copy the column first.
+    """
+    source = SOURCES[name]
+    stat = source.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _frames.get(name)
+    if cached is not None and cached[0] == signature:
+        # Shallow copy so callers can add/rename columns without touching the shared frame
+        return cached[1].copy(deep=False)
+
+    arrow_path, _ = _cache_paths(name)
+    if not is_fresh(name):
+        build_table(name)
+
+    table = feather.read_table(arrow_path, memory_map=True)
+    # split_blocks: one block per column, so nothing is consolidated (copied) into 2-D blocks
+    df = share_dictionaries(name, table.to_pandas(split_blocks=True))
+    _frames[name] = (signature, df)
+    return df.copy(deep=False)
+
+
+def build_all():
+    """Refresh the cache for every source CSV present on disk (streamed sources excepted)"""
+    built = []
+    for name, source in SOURCES.items():
+        if name not in STREAMED_SOURCES and source.exists() and not is_fresh(name):
+            build_table(name)
+            built.append(name)
+    return built
+
+
+if __name__ == '__main__':
+    rebuilt = build_all()
+    print(f"Rebuilt {len(rebuilt)} table(s) in {CACHE_DIR}")
+    for name in rebuilt:
+        print(f"  - {name}")
@@ -0,0 +1,46 @@
+import logging
+
+import pandas as pd
+
+from data_store import load_table
+from joins import indexed_join
+
+logger = logging.getLogger(__name__)
+
+AGE_BINS = [10, 20, 30, 40, 50, 60]
+AGE_LABELS = ['10-20', '20-30', '30-40', '40-50', '50-60']
+
+
+def build_demographic_frame():
+    """Join medallists to athlete bio data on athlete code and derive age / age group"""
+    athletes_df = load_table('athletes')
+    medallists_df = load_table('medallists')
+
+    # birth_date is already datetime64 and gender categorical (see schemas.py)
+    athletes_df['age'] = 2024 - athletes_df['birth_date'].dt.year
+    athletes_df['gender'] = athletes_df['gender'].cat.add_categories(['Unknown']).fillna('Unknown')
+
+    # One row per medal: code_athlete -> athletes.code is many-to-one, unlike the old join on
+    # the free-text name (which duplicated rows for namesakes). The medallist name is kept as 'name'.
+    athlete_medals_df, report = indexed_join(
+        medallists_df,
+        athletes_df.drop(columns=['name']),
+        left_on='code_athlete',
+        right_on='code',
+        how='inner',
+        suffixes=('_medallist', '_athlete')
+    )
+    if report['unmatched'] or report['duplicate_keys']:
+        logger.warning(
+            "Medallist/athlete join: %d of %d medal rows unmatched (e.g. %s), %d duplicate athlete codes",
+            report['unmatched'], report['left_rows'], report['unmatched_keys'][:5], report['duplicate_keys']
+        )
+
+    athlete_medals_df['age_group'] = pd.cut(
+        athlete_medals_df['age'],
+        bins=AGE_BINS,
+        labels=AGE_LABELS,
+        include_lowest=True
+    )
+
+    return athlete_medals_df
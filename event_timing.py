@@ -0,0 +1,150 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_table
+from results import query_results
+from schedule import LOCAL_TZ, to_utc_seconds
+
+DAY = 86400
+KINDS = ['sessions', 'medal_events']
+BUCKETS = ['hour', 'day', 'venue']
+# Gender codes of schedules.csv / results -> labels used by the demographic frame
+GENDERS = {'M': 'Male', 'W': 'Female', 'X': 'Mixed', 'O': 'Open', 'U': 'Unknown'}
+MIXED_GENDERS = ['X', 'O']
+# Venues outside the Paris time zone; every other venue is on LOCAL_TZ
+VENUE_TIMEZONES = {"Teahupo'o, Tahiti": 'Pacific/Tahiti'}
+# results/*.csv stamp every venue's wall clock with +02:00 (Tahiti included), so
+# their Paris reading already is the venue's local time: no per-venue conversion
+WALL_CLOCK_KINDS = ['medal_events']
+
+
+def local_seconds(utc_seconds, venues=None):
+    """UTC epoch seconds -> wall-clock epoch seconds at each venue (DST aware, vectorized)
+
+    Without venues, or for venues not in VENUE_TIMEZONES, the wall clock is
+    Paris time: a surfing heat at 19:00 in Paris is bucketed at 07:00, when
+    it ran in Tahiti.
+    """
+    stamps = pd.DatetimeIndex(pd.to_datetime(utc_seconds, unit='s', utc=True))
+    seconds = stamps.tz_convert(LOCAL_TZ).tz_localize(None).asi8 // 10**9
+    if venues is not None:
+        venues = np.asarray(venues, dtype=object)
+        for venue, tz in VENUE_TIMEZONES.items():
+            at = venues == venue
+            if at.any():
+                seconds[at] = stamps[at].tz_convert(tz).tz_localize(None).asi8 // 10**9
+    return seconds
+
+
+def medal_events(results):
+    """One row per event at the time its medals were decided: the event's last result timestamp"""
+    results = results.dropna(subset=['date'])
+    last = results.groupby('event_code', observed=True)['date'].idxmax()
+    return results.loc[last.to_numpy(), ['discipline_name', 'gender', 'venue', 'date']].rename(
+        columns={'discipline_name': 'discipline', 'date': 'start'}
+    )
+
+
+class EventTiming:
+    """Histograms of sessions and medal events by venue-local hour, competition day and venue
+
+    Sessions come from schedules.csv (cancelled ones excluded); medal events
+    from the result timestamps of results/*.csv. Every histogram is kept per
+    (discipline, gender), as an array of shape (disciplines, genders, buckets),
+    so filtering by discipline or gender is a sum over a few rows instead of
+    a rescan of the sessions.
+    """
+
+    def __init__(self, disciplines, days, venues, counts):
+        self.disciplines = disciplines  # Index of discipline names
+        self.days = days                # DatetimeIndex of venue-local competition days
+        self.venues = venues            # Index of venue names
+        self.counts = counts            # (kind, bucket) -> int64 array
+
+    @classmethod
+    def build(cls, frames):
+        """frames: kind -> frame with discipline, gender, venue and tz-aware start columns"""
+        times = {
+            kind: local_seconds(to_utc_seconds(df['start']), None if kind in WALL_CLOCK_KINDS else df['venue'])
+            for kind, df in frames.items()
+        }
+        valid = {kind: to_utc_seconds(df['start']) >= 0 for kind, df in frames.items()}
+        # Shared vocabularies so the two kinds line up bucket for bucket
+        _, disciplines = pd.factorize(pd.concat([df['discipline'].astype(str) for df in frames.values()]), sort=True)
+        _, venues = pd.factorize(pd.concat([df['venue'].astype(object) for df in frames.values()]), sort=True)
+        epoch_days = np.concatenate([times[kind][valid[kind]] // DAY for kind in frames])
+        first_day, n_days = int(epoch_days.min()), int(epoch_days.max() - epoch_days.min()) + 1
+        genders = pd.Index(list(GENDERS))
+
+        counts = {}
+        for kind, df in frames.items():
+            keep = valid[kind]
+            discipline = disciplines.get_indexer(df['discipline'].astype(str))[keep]
+            gender = genders.get_indexer(df['gender'].astype(object).fillna('U'))[keep]
+            buckets = {
+                'hour': (times[kind][keep] // 3600 % 24, 24),
+                'day': (times[kind][keep] // DAY - first_day, n_days),
+                'venue': (venues.get_indexer(df['venue'].astype(object))[keep], len(venues)),
+            }
+            for bucket, (codes, size) in buckets.items():
+                ok = (discipline >= 0) & (gender >= 0) & (codes >= 0)
+                flat = np.ravel_multi_index(
+                    [discipline[ok], gender[ok], codes[ok]], (len(disciplines), len(genders), size)
+                )
+                counts[kind, bucket] = np.bincount(flat, minlength=len(disciplines) * len(genders) * size).reshape(
+                    len(disciplines), len(genders), size
+                )
+        days = pd.DatetimeIndex(pd.to_datetime((first_day + np.arange(n_days)) * DAY, unit='s'), name='day')
+        return cls(pd.Index(disciplines, name='discipline'), days, pd.Index(venues, name='venue'), counts)
+
+    @classmethod
+    def load(cls):
+        sessions = load_table('schedules')
+        sessions = sessions[sessions['status'] != 'CANCELLED']
+        sessions = sessions[['discipline', 'gender', 'venue', 'start_date']].rename(columns={'start_date': 'start'})
+        results = query_results(columns=['date', 'event_code', 'discipline_name', 'gender', 'venue'])
+        return cls.build({'sessions': sessions, 'medal_events': medal_events(results)})
+
+    def histogram(self, kind, bucket, disciplines=None, genders=None, include_mixed=True):
+        """Counts per hour / day / venue for the selected disciplines and genders
+
+        Genders may be codes (M, W) or labels (Male, Female); mixed and open
+        events are included unless include_mixed is False, sessions without a
+        gender only when no gender filter is given.
+        """
+        counts = self.counts[kind, bucket]
+        if disciplines is not None:
+            rows = self.disciplines.get_indexer(list(disciplines))
+            counts = counts[rows[rows >= 0]]
+        if genders is not None:
+            labels = {label: code for code, label in GENDERS.items()}
+            codes = {labels.get(g, g) for g in genders} | (set(MIXED_GENDERS) if include_mixed else set())
+            counts = counts[:, [i for i, code in enumerate(GENDERS) if code in codes]]
+        index = {
+            'hour': pd.RangeIndex(24, name='hour'),
+            'day': self.days,
+            'venue': self.venues,
+        }[bucket]
+        return pd.Series(counts.sum(axis=(0, 1)), index=index, name=kind)
+
+    def table(self, bucket, disciplines=None, genders=None, include_mixed=True):
+        """Sessions and medal events side by side for one bucket"""
+        return pd.concat(
+            [self.histogram(kind, bucket, disciplines, genders, include_mixed) for kind in KINDS], axis=1
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Session and medal-event timing histograms")
+    parser.add_argument('bucket', nargs='?', choices=BUCKETS, default='hour')
+    parser.add_argument('--discipline', action='append', help="restrict to a discipline (repeatable)")
+    parser.add_argument('--gender', action='append', help="restrict to a gender, e.g. M or Female (repeatable)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    timing = EventTiming.load()
+    print(f"Built in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(timing.table(args.bucket, args.discipline, args.gender).to_string())
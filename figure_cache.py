@@ -0,0 +1,222 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from cube import MedalCube
+from data_store import CACHE_DIR, code_hash, write_atomic
+
+FIGURE_CACHE_DIR = CACHE_DIR / 'figures'
+MAX_FIGURES = int(os.environ.get('OLYMPICS_FIGURE_CACHE_SIZE', 256))
+MAX_DISK_FIGURES = int(os.environ.get('OLYMPICS_FIGURE_DISK_SIZE', 2048))
+# Disk tier is shared by every worker process on the host; off unless asked for
+DISK_TIER = os.environ.get('OLYMPICS_FIGURE_DISK', '0') == '1'
+# Part of every key: bump it to drop all cached figures, e.g. after changing a
+# helper module the builders call (the builder's own file is already hashed)
+FIGURE_CACHE_VERSION = 1
+
+# Frame / cube fingerprints by object identity, dropped when the object dies
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def _content_fingerprint(value):
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif value.origin is not None:
+        # A slice is its parent plus the kept codes: no need to read its cells
+        parent, kept = value.origin
+        digest.update(fingerprint(parent).encode())
+        digest.update(repr(sorted(kept.items())).encode())
+    else:
+        digest.update(repr(value.labels).encode())
+        for dim in value.dims:
+            digest.update(np.ascontiguousarray(value.codes[dim]).tobytes())
+        digest.update(np.ascontiguousarray(value.counts).tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint(value):
+    """Content hash of a frame, series or cube, computed once per object
+
+    Loader results (st.cache_resource) are the same object on every rerun,
+    so passing one to a builder costs a dict lookup, not a rescan of its
+    rows. The object must not be modified after it was first fingerprinted.
+    """
+    key = id(value)
+    with _fingerprints_lock:
+        known = _fingerprints.get(key)
+    if known is not None:
+        return known
+    computed = _content_fingerprint(value)
+    with _fingerprints_lock:
+        if key not in _fingerprints:
+            _fingerprints[key] = computed
+            weakref.finalize(value, _fingerprints.pop, key, None)
+    return computed
+
+
+def _hash_into(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series, MedalCube)):
+        digest.update(type(value).__name__.encode())
+        digest.update(fingerprint(value).encode())
+    elif isinstance(value, np.ndarray) and value.dtype == object:
+        _hash_into(digest, value.tolist())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}:{len(value)}'.encode())
+        for item in value:
+            _hash_into(digest, item)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _hash_into(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def content_hash(*values):
+    """Stable hash of the builder inputs (frames and cubes by content, see fingerprint)"""
+    digest = hashlib.sha256()
+    for value in values:
+        _hash_into(digest, value)
+    return digest.hexdigest()
+
+
+class SerializedFigure(go.Figure):
+    """A built figure kept as its plotly JSON
+
+    to_json() returns the stored text and to_dict() / to_plotly_json() the
+    parsed plotly-json dict, so st.plotly_chart gets the figure without its
+    traces being walked and serialized again. Only the title is a real
+    property (for span labels); the figure must not be modified.
+    """
+
+    def __init__(self, text):
+        spec = json.loads(text)
+        title = spec.get('layout', {}).get('title')
+        super().__init__(layout={'title': title} if title else None)
+        self._text = text
+        self._spec = spec
+
+    def to_dict(self):
+        return self._spec
+
+    def to_plotly_json(self):
+        return self._spec
+
+    def to_json(self, *args, **kwargs):
+        return self._text
+
+
+class FigureCache:
+    """Bounded LRU of serialized figures, with an optional on-disk JSON tier
+
+    Figures are stored as SerializedFigure, so the JSON is produced once per
+    build. The memory tier is per process and shared by every Streamlit
+    session in it; the disk tier lets other worker processes reuse a figure
+    without rebuilding it.
+    """
+
+    def __init__(self, max_figures=MAX_FIGURES, disk_dir=None, max_disk_figures=MAX_DISK_FIGURES):
+        self.max_figures = max_figures
+        self.disk_dir = disk_dir
+        self.max_disk_figures = max_disk_figures
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return figure
+        if self.disk_dir is not None:
+            path = self.disk_dir / f'{key}.json'
+            try:
+                text = path.read_text()
+            except OSError:
+                text = None
+            if text is not None:
+                figure = SerializedFigure(text)
+                self._remember(key, figure)
+                self.disk_hits += 1
+                return figure
+        self.misses += 1
+        return None
+
+    def put(self, key, figure):
+        """Serialize a built figure once and store it; returns the SerializedFigure to render"""
+        figure = SerializedFigure(figure.to_json())
+        self._remember(key, figure)
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.disk_dir / f'{key}.json', lambda p: p.write_text(figure.to_json()))
+            self._prune_disk()
+        return figure
+
+    def _remember(self, key, figure):
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_figures:
+                self._figures.popitem(last=False)
+
+    def _prune_disk(self):
+        files = list(self.disk_dir.glob('*.json'))
+        if len(files) <= self.max_disk_figures:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:len(files) - self.max_disk_figures]:
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+
+figure_cache = FigureCache(disk_dir=FIGURE_CACHE_DIR if DISK_TIER else None)
+
+
+def builder_hash(builder):
+    """Hash of a builder's source, of the file defining it (globals, helpers) and the cache version"""
+    defined_in = hashlib.sha256(Path(builder.__code__.co_filename).read_bytes()).hexdigest()
+    return code_hash([builder], {'file': defined_in, 'version': FIGURE_CACHE_VERSION})
+
+
+def cached_figure(builder):
+    """Decorator: reuse the figure a builder made earlier for the same inputs
+
+    The key covers the builder's name and code (builder_hash), the content
+    of every frame/cube argument and the other parameters. Every call, the
+    first one included, returns the shared SerializedFigure, so callers
+    must not mutate the figure they get back.
+    """
+    code = builder_hash(builder)
+
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        key = content_hash(builder.__module__, builder.__qualname__, code, args, kwargs)
+        figure = figure_cache.get(key)
+        if figure is None:
+            figure = figure_cache.put(key, builder(*args, **kwargs))
+        return figure
+
+    return wrapper
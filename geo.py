@@ -0,0 +1,52 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_table
+from joins import indexed_join
+
+logger = logging.getLogger(__name__)
+
+# Bundled with the repo so maps need no network: approximate country centroids (0.1 degree)
+# and the ISO 3166 alpha-3 code of each NOC. Historical NOCs (URS, FRG, ...) point at their
+# successor state; teams without a home country (AIN, EOR, IOA, ...) have no location.
+CENTROIDS_PATH = Path(__file__).resolve().parent / 'noc_centroids.csv'
+
+
+def load_noc_geo():
+    """nocs.csv joined once to the centroid table: code, country, country_long, iso3, latitude, longitude"""
+    nocs = load_table('nocs')[['code', 'country', 'country_long']]
+    centroids = pd.read_csv(CENTROIDS_PATH, keep_default_na=False, na_values=[''])
+    geo, report = indexed_join(nocs, centroids, left_on='code', right_on='code', how='left')
+    if report['unmatched']:
+        logger.warning("%d NOCs have no centroid (e.g. %s)", report['unmatched'], report['unmatched_keys'][:5])
+    unlocated = geo.loc[geo['latitude'].isna(), 'code'].tolist()
+    if unlocated:
+        # Expected for teams without a home country (AIN, EOR, IOA, ...): they are left off the maps
+        logger.info("%d NOCs have no location: %s", len(unlocated), ', '.join(unlocated))
+    return geo
+
+
+def enrich(df, geo, value, code='code', rank_name='Ranking'):
+    """Copy of df with iso3 / latitude / longitude by NOC code and a rank by `value`
+
+    Rank 1 is the largest value (ties share the best rank). The input frame
+    is never modified, so it is safe to pass frames shared through a cache.
+    """
+    rows = pd.Index(geo['code']).get_indexer(df[code])
+    located = rows >= 0
+    enriched = df.copy()
+    for column in ['iso3', 'latitude', 'longitude']:
+        values = geo[column].to_numpy()[rows.clip(min=0)]
+        enriched[column] = np.where(located, values, None if values.dtype == object else np.nan)
+    enriched[rank_name] = df[value].rank(ascending=False, method='min').astype('Int64')
+    return enriched
+
+
+def top_labels(enriched, value, label, n=3):
+    """Text labels and positions of the n largest rows, for one text trace (no per-row loop)"""
+    top = enriched.dropna(subset=['latitude', 'longitude']).nlargest(n, value)
+    text = top[label].astype(str) + ': ' + top[value].round().astype(int).map('{:,}'.format)
+    return top['longitude'].to_numpy(), top['latitude'].to_numpy(), text.to_numpy()
@@ -0,0 +1,193 @@
+import argparse
+import functools
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_store import write_atomic
+from geo import CENTROIDS_PATH
+
+GEOMETRY_DIR = Path(__file__).resolve().parent / 'country_shapes'
+
+# Detail level -> (simplification tolerance in degrees, coordinate decimals)
+DETAIL_LEVELS = {
+    'low': (0.25, 1),
+    'medium': (0.05, 2),
+    'high': (0.01, 3),
+}
+# Attributes of the source shapes holding a country code, in order of preference (Natural Earth
+# admin-0 naming). ISO_A3 is -99 for France, Norway, ... in Natural Earth; ISO_A3_EH fixes those
+# and is ISO based, ADM0_A3 is Natural Earth's own code (KOS, SDS, ...) and never -99.
+ISO_FIELDS = ['ISO_A3_EH', 'ADM0_A3', 'ISO_A3', 'iso_a3', 'ISO3']
+NAME_FIELDS = ['ADMIN', 'NAME', 'name']
+MISSING_CODE = '-99'
+
+
+def asset_path(level):
+    return GEOMETRY_DIR / f'countries_{level}.geojson'
+
+
+def level_for_viewport(width_px, lon_span=360.0):
+    """Coarsest detail level whose simplification error stays under a pixel of the viewport"""
+    degrees_per_pixel = lon_span / max(width_px, 1)
+    for level, (tolerance, _) in DETAIL_LEVELS.items():
+        if tolerance <= degrees_per_pixel:
+            return level
+    return list(DETAIL_LEVELS)[-1]
+
+
+@functools.lru_cache(maxsize=None)
+def load_geometry(level):
+    """FeatureCollection of country shapes keyed by NOC code (feature id), None if the asset is missing"""
+    path = asset_path(level)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def shapes_for(codes, level):
+    """Only the features of the given NOC codes, so a figure carries no shapes it doesn't colour"""
+    geometry = load_geometry(level)
+    if geometry is None:
+        return None
+    wanted = set(codes)
+    return {'type': 'FeatureCollection', 'features': [f for f in geometry['features'] if f['id'] in wanted]}
+
+
+def simplify_ring(ring, tolerance):
+    """Douglas-Peucker on one closed ring; None when fewer than 4 points (a triangle) remain"""
+    points = np.asarray(ring, dtype=float)[:, :2]
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last] - start
+        dx, dy = end - start
+        length = np.hypot(dx, dy)
+        if length == 0:  # the ring's closing point: distance to the start itself
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(dx * inner[:, 1] - dy * inner[:, 0]) / length
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack += [(first, split), (split, last)]
+    simplified = points[keep]
+    return simplified if len(simplified) >= 4 else None
+
+
+def simplify_polygons(polygons, tolerance, decimals):
+    """Simplified, rounded polygons (lists of rings); holes that collapse are dropped
+
+    Parts whose outer ring collapses are dropped too, but a country always
+    keeps its largest part (unsimplified if need be), so small island
+    states stay on the map. Rings are simplified one by one: at coarse
+    tolerances neighbours may show slivers along a shared border.
+    """
+    simplified = []
+    for polygon in polygons:
+        rings = [simplify_ring(ring, tolerance) for ring in polygon]
+        if rings[0] is not None:
+            simplified.append([ring for ring in rings if ring is not None])
+    if not simplified:
+        largest = max(polygons, key=lambda polygon: len(polygon[0]))
+        simplified = [[np.asarray(largest[0], dtype=float)[:, :2]]]
+    return [[np.round(ring, decimals).tolist() for ring in polygon] for polygon in simplified]
+
+
+def _polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+def _field(properties, fields, source):
+    field = next((f for f in fields if f in properties), None)
+    if field is None:
+        raise ValueError(f"{source} has none of the attributes {fields}")
+    return field
+
+
+def read_country_shapes(source, codes=None):
+    """ISO alpha-3 code -> polygons, from a GeoJSON FeatureCollection in lon / lat degrees
+
+    Features sharing a code are merged. A feature whose code is -99 raises
+    unless `codes` maps its name to a code (e.g. {'Kosovo': 'XKX'}), so no
+    country silently drops off the map.
+    """
+    features = json.loads(Path(source).read_text())['features']
+    field = _field(features[0]['properties'], ISO_FIELDS, source)
+    name_field = _field(features[0]['properties'], NAME_FIELDS, source)
+    codes = codes or {}
+
+    shapes = {}
+    missing = []
+    for feature in features:
+        name = feature['properties'][name_field]
+        code = codes.get(name, str(feature['properties'][field]))
+        if code == MISSING_CODE:
+            missing.append(name)
+            continue
+        shapes.setdefault(code, []).extend(_polygons(feature['geometry']))
+    if missing:
+        raise ValueError(f"{source}: {field} is {MISSING_CODE} for {', '.join(sorted(missing))}; "
+                         f"give their codes with --code NAME=ISO")
+    return shapes
+
+
+def build_assets(source, levels=DETAIL_LEVELS, codes=None):
+    """Write one simplified GeoJSON per detail level from a country shapes GeoJSON
+
+    `source` is e.g. Natural Earth's ne_10m_admin_0_countries.geojson. Every
+    NOC whose ISO code (from noc_centroids.csv) has a shape gets a feature
+    with the NOC code as its id; historical NOCs reuse their successor
+    state's shape. Returns the size in bytes of each level's file.
+    """
+    shapes = read_country_shapes(source, codes)
+    nocs = pd.read_csv(CENTROIDS_PATH, keep_default_na=False, na_values=['']).dropna(subset=['iso3'])
+    nocs = nocs[nocs['iso3'].isin(list(shapes))]
+
+    GEOMETRY_DIR.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for level in levels:
+        tolerance, decimals = DETAIL_LEVELS[level]
+        simplified = {iso3: simplify_polygons(shapes[iso3], tolerance, decimals) for iso3 in set(nocs['iso3'])}
+        features = [
+            {
+                'type': 'Feature',
+                'id': code,
+                'properties': {},
+                'geometry': (
+                    {'type': 'Polygon', 'coordinates': simplified[iso3][0]} if len(simplified[iso3]) == 1
+                    else {'type': 'MultiPolygon', 'coordinates': simplified[iso3]}
+                ),
+            }
+            for code, iso3 in zip(nocs['code'], nocs['iso3'])
+        ]
+        text = json.dumps({'type': 'FeatureCollection', 'features': features}, separators=(',', ':'))
+        write_atomic(asset_path(level), lambda p: p.write_text(text))
+        sizes[level] = len(text)
+    load_geometry.cache_clear()
+    return sizes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the simplified country geometry assets keyed by NOC code")
+    parser.add_argument('source', help="country shapes GeoJSON with an ISO alpha-3 attribute (e.g. Natural Earth admin 0)")
+    parser.add_argument('--levels', nargs='+', choices=list(DETAIL_LEVELS), default=list(DETAIL_LEVELS))
+    parser.add_argument('--code', action='append', default=[], metavar='NAME=ISO',
+                        help="code of a shape whose code attribute is -99 (repeatable)")
+    args = parser.parse_args()
+
+    codes = dict(item.split('=', 1) for item in args.code)
+    for level, size in build_assets(args.source, args.levels, codes).items():
+        print(f"{level}: {size / 1024:,.0f} KB -> {asset_path(level)}")
@@ -0,0 +1,224 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.feather as feather
+
+from data_store import CACHE_DIR, SOURCES, cache_metadata, code_hash, write_atomic
+
+HISTORY_MEDALS_PATH = CACHE_DIR / 'history_medals.arrow'
+HISTORY_ROLLUPS_PATH = CACHE_DIR / 'history_rollups.arrow'
+
+# Columns kept from the raw file; the rest (player_id, Name, City, ...) is dropped while reading
+HISTORY_COLUMNS = {
+    'Year': pa.int16(),
+    'Season': pa.string(),
+    'Team': pa.string(),
+    'NOC': pa.string(),
+    'Sex': pa.string(),
+    'Sport': pa.string(),
+    'Event': pa.string(),
+    'Medal': pa.string(),
+}
+# Year is read as text and cast once validated, so a malformed value drops its row instead of the read
+YEAR_PATTERN = r'^\s*\d{1,4}\s*$'
+# Raw bytes parsed per block; the reader keeps a few blocks in flight, so this bounds peak memory
+READ_BLOCK_BYTES = 1 << 20
+
+# Per-Games rollup dimension -> column of the historical frame
+ROLLUP_DIMS = {
+    'medal': 'Medal',
+    'sex': 'Sex',
+    'sport_category': 'Sport_Category',
+    'noc': 'NOC',
+}
+ROLLUP_VALUES = ['count', 'cumulative', 'rolling']
+# Window of the rolling rollup, in Games editions (not calendar years)
+ROLLING_GAMES = 3
+
+# Create sports categories mapping
+SPORTS_CATEGORIES = {
+    'Ball Games': ['Basketball', 'Football', 'Handball', 'Volleyball', 'Rugby', 'Baseball', 'Softball'],
+    'Combat Sports': ['Boxing', 'Judo', 'Wrestling', 'Taekwondo', 'Karate'],
+    'Aquatics': ['Swimming', 'Diving', 'Water Polo', 'Artistic Swimming'],
+    'Athletics': ['Athletics'],
+    'Gymnastics': ['Artistic Gymnastics', 'Rhythmic Gymnastics', 'Trampoline Gymnastics'],
+    'Cycling': ['Cycling Road', 'Cycling Track', 'Cycling Mountain Bike', 'Cycling BMX'],
+    'Other': ['Archery', 'Badminton', 'Fencing', 'Golf', 'Rowing', 'Sailing', 'Tennis']
+}
+
+SPORT_TO_CATEGORY = {sport: category
+    for category, sports in SPORTS_CATEGORIES.items()
+    for sport in sports}
+
+
+def read_medal_rows(path, block_size=READ_BLOCK_BYTES):
+    """Stream the raw file in blocks, keeping only medal rows of HISTORY_COLUMNS
+
+    Only one block of raw rows is in memory at a time; the filtered blocks
+    are dictionary encoded once at the end, so repeated strings (Sex, Medal,
+    Sport, Team, ...) are stored once. Rows whose Year is missing or not a
+    number are dropped.
+    """
+    reader = pv.open_csv(
+        path,
+        read_options=pv.ReadOptions(block_size=block_size),
+        convert_options=pv.ConvertOptions(
+            column_types={**HISTORY_COLUMNS, 'Year': pa.string()},
+            include_columns=list(HISTORY_COLUMNS),
+            include_missing_columns=True,
+        ),
+    )
+    schema = pa.schema(HISTORY_COLUMNS)
+    year_index = schema.get_field_index('Year')
+    batches = []
+    for batch in reader:
+        medal = batch.column('Medal')
+        year = batch.column('Year')
+        keep = pc.and_(
+            pc.and_(pc.is_valid(medal), pc.not_equal(medal, 'No medal')),
+            pc.match_substring_regex(year, YEAR_PATTERN),
+        )
+        batch = batch.filter(keep)
+        years = pc.cast(pc.utf8_trim_whitespace(batch.column('Year')), HISTORY_COLUMNS['Year'])
+        batches.append(batch.set_column(year_index, schema.field(year_index), years))
+    table = pa.Table.from_batches(batches, schema=schema)
+    return pa.table({
+        name: column if pa.types.is_integer(column.type) else _sorted_dictionary(column)
+        for name, column in zip(table.column_names, table.columns)
+    })
+
+
+def _sorted_dictionary(column):
+    # Categories in sorted order, so factorize(sort=True) and legends order labels as before
+    encoded = pc.dictionary_encode(column.combine_chunks())
+    order = np.argsort(encoded.dictionary.to_numpy(zero_copy_only=False), kind='stable')
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    indices = encoded.indices
+    remapped = pa.array(rank[indices.fill_null(0).to_numpy()], mask=indices.is_null().to_numpy(zero_copy_only=False))
+    return pa.DictionaryArray.from_arrays(remapped, encoded.dictionary.take(pa.array(order)))
+
+
+def sport_categories(sports):
+    """Sport_Category for a categorical Sport column, mapped on its categories only"""
+    categories = pd.Index(sorted(SPORTS_CATEGORIES))
+    lookup = categories.get_indexer(sports.cat.categories.map(SPORT_TO_CATEGORY))
+    codes = sports.cat.codes.to_numpy()
+    return pd.Categorical.from_codes(np.where(codes >= 0, lookup[codes], -1), categories)
+
+
+@functools.lru_cache(maxsize=None)
+def builder_hashes():
+    """Hashes of the code building the reduced table and the rollups, stored in their metadata"""
+    medals = code_hash([read_medal_rows, _sorted_dictionary], [HISTORY_COLUMNS, YEAR_PATTERN])
+    rollups = code_hash([HistoryRollups, sport_categories], [medals, ROLLUP_DIMS, ROLLING_GAMES, SPORTS_CATEGORIES])
+    return {'medals': medals, 'rollups': rollups}
+
+
+def _is_stale(path, kind, *inputs):
+    if not path.exists():
+        return True
+    if cache_metadata(path).get('builder') != builder_hashes()[kind]:
+        return True
+    return any(source.stat().st_mtime_ns > path.stat().st_mtime_ns for source in inputs)
+
+
+def _with_builder(table, kind):
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), 'builder': builder_hashes()[kind]})
+
+
+def is_stale():
+    """Whether the reduced table is missing, older than the CSV or built by older code"""
+    return _is_stale(HISTORY_MEDALS_PATH, 'medals', SOURCES['olympics_history'])
+
+
+def build_historical_frame():
+    """Medal rows of the 1896-2024 dataset with a Sport_Category column
+
+    The reduced table (medal rows, HISTORY_COLUMNS, categorical strings) is
+    cached, so only the first start after the CSV changes reads the raw file.
+    """
+    if is_stale():
+        table = _with_builder(read_medal_rows(SOURCES['olympics_history']), 'medals')
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        write_atomic(HISTORY_MEDALS_PATH, lambda p: feather.write_feather(table, p, compression='uncompressed'))
+    history_df = feather.read_table(HISTORY_MEDALS_PATH, memory_map=True).to_pandas()
+    history_df['Sport_Category'] = sport_categories(history_df['Sport'])
+    return history_df
+
+
+class HistoryRollups:
+    """Medal counts per Games and label for each ROLLUP_DIMS dimension
+
+    Stored long: one row per (dimension, Year, label) from the label's first
+    medal on, with the per-Games count, the running total and the total over
+    the last ROLLING_GAMES Games. The whole table is a few thousand rows,
+    so the Historical Trends tab never touches the row-level history.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    @classmethod
+    def build(cls, history_df):
+        years, year_codes = np.unique(history_df['Year'].to_numpy(), return_inverse=True)
+        frames = []
+        for dim, column in ROLLUP_DIMS.items():
+            values = history_df[column].astype('category')
+            labels = values.cat.categories
+            codes = values.cat.codes.to_numpy().astype(np.int64)
+            valid = codes >= 0  # missing labels are left out, like a groupby
+            counts = np.bincount(
+                year_codes[valid] * len(labels) + codes[valid], minlength=len(years) * len(labels)
+            ).reshape(len(years), len(labels))
+            cumulative = counts.cumsum(axis=0)
+            rolling = cumulative.copy()
+            rolling[ROLLING_GAMES:] -= cumulative[:-ROLLING_GAMES]
+            year_index, label_index = np.nonzero(cumulative)
+            frames.append(pd.DataFrame({
+                'dimension': dim,
+                'Year': years[year_index],
+                'label': np.asarray(labels, dtype=object)[label_index],
+                'count': counts[year_index, label_index],
+                'cumulative': cumulative[year_index, label_index],
+                'rolling': rolling[year_index, label_index],
+            }))
+        table = pd.concat(frames, ignore_index=True)
+        table['dimension'] = pd.Categorical(table['dimension'], categories=list(ROLLUP_DIMS))
+        return cls(table)
+
+    def get(self, dimension, value='count'):
+        """(Year, label, value) rows of one dimension; zero cells are dropped"""
+        rows = self.table[(self.table['dimension'] == dimension) & (self.table[value] > 0)]
+        return rows[['Year', 'label', value]].reset_index(drop=True)
+
+    def totals(self, value='count'):
+        """Medals per Games (or running / rolling total), indexed by Year"""
+        return self.get('medal', value).groupby('Year')[value].sum()
+
+    def save(self, path):
+        table = _with_builder(pa.Table.from_pandas(self.table, preserve_index=False), 'rollups')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, lambda p: feather.write_feather(table, p, compression='uncompressed'))
+
+    @classmethod
+    def load(cls, path):
+        return cls(feather.read_table(path, memory_map=True).to_pandas())
+
+
+def load_history_rollups():
+    """Per-Games rollups from the cache, rebuilt when the reduced history table changed"""
+    if is_stale() or _is_stale(HISTORY_ROLLUPS_PATH, 'rollups', HISTORY_MEDALS_PATH):
+        HistoryRollups.build(build_historical_frame()).save(HISTORY_ROLLUPS_PATH)
+    return HistoryRollups.load(HISTORY_ROLLUPS_PATH)
+
+
+if __name__ == '__main__':
+    rollups = load_history_rollups()
+    counts = rollups.table['dimension'].value_counts(sort=False)
+    print(f"{len(rollups.table):,} rollup rows ({', '.join(f'{d}: {n:,}' for d, n in counts.items())}) "
+          f"-> {HISTORY_ROLLUPS_PATH}")
@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from data_store import CACHE_DIR, EXPORTED_DIR, SOURCES, build_table, write_atomic
+from medal_pivot import MEDAL_TYPES, medal_pivot
+
+STATE_DIR = CACHE_DIR / 'incremental'
+STATE_FILE = STATE_DIR / 'state.json'
+
+
+def _host_split(df):
+    # Host Nation Performance: every medal of a country is either a host or an 'other' medal
+    host = df['country'] == 'France'
+    df['host_country_medals'] = df['total'].where(host, 0)
+    df['other_country_medals'] = df['total'].where(~host, 0)
+    return df
+
+
+# Exported aggregates that are plain sums over medallists rows, so new rows can be applied as
+# deltas. Mirrors the queries in the .sql file (see sql_engine.py). Cross-Discipline Medalists
+# (COUNT DISTINCT), Performance by Age Group (depends on today's date) and the team joins are
+# not additive and stay with the full refresh.
+AGGREGATES = {
+    'Total Medals by Country': {
+        'keys': ['country'],
+        'columns': {'Gold': 'Gold Medal', 'Silver': 'Silver Medal', 'Bronze': 'Bronze Medal'},
+        'order': (['country'], [True]),
+    },
+    'Top Athletes by Medal Count': {
+        'keys': ['name', 'country'],
+        'columns': {'medal_count': 'total'},
+        'order': (['medal_count'], [False]),
+        'limit': 10,
+    },
+    'Medals by Discipline': {
+        'keys': ['discipline'],
+        'columns': {'total_medals': 'total'},
+        'order': (['total_medals'], [False]),
+    },
+    'Medal Trends Over Time': {
+        'keys': ['medal_date', 'country'],
+        'columns': {'Gold_Medals': 'Gold Medal', 'Silver_Medals': 'Silver Medal', 'Bronze_Medals': 'Bronze Medal'},
+        'order': (['medal_date', 'country'], [True, True]),
+    },
+    'Top Athletes by Discipline': {
+        'keys': ['discipline', 'name', 'country'],
+        'columns': {'total_medals': 'total', 'Gold_Medals': 'Gold Medal', 'Silver_Medals': 'Silver Medal', 'Bronze_Medals': 'Bronze Medal'},
+        'order': (['discipline', 'total_medals'], [True, False]),
+    },
+    'Dominance in a Specific Event': {
+        'keys': ['event', 'country'],
+        'columns': {'total_medals': 'total', 'Gold_Medals': 'Gold Medal', 'Silver_Medals': 'Silver Medal', 'Bronze_Medals': 'Bronze Medal'},
+        'having': lambda df: df['total_medals'] > 1,
+        'order': (['total_medals', 'Gold_Medals'], [False, False]),
+    },
+    'Gender Comparison in Medal Wins': {
+        'keys': ['gender', 'discipline'],
+        'columns': {'total_medals': 'total', 'Gold_Medals': 'Gold Medal', 'Silver_Medals': 'Silver Medal', 'Bronze_Medals': 'Bronze Medal'},
+        'order': (['total_medals', 'discipline'], [False, True]),
+    },
+    "Country's Best Disciplines": {
+        'keys': ['country', 'discipline'],
+        'columns': {'Gold_Medals': 'Gold Medal'},
+        'order': (['country', 'Gold_Medals'], [True, False]),
+    },
+    'Medal Distribution by Event Type': {
+        'keys': ['event_type'],
+        'columns': {'total_medals': 'total', 'Gold_Medals': 'Gold Medal', 'Silver_Medals': 'Silver Medal', 'Bronze_Medals': 'Bronze Medal'},
+        'order': (['total_medals'], [False]),
+    },
+    'Host Nation Performance': {
+        'keys': ['country'],
+        'columns': {'host_country_medals': 'host_country_medals', 'other_country_medals': 'other_country_medals'},
+        'post': _host_split,
+        'order': (['host_country_medals', 'other_country_medals'], [False, False]),
+    },
+}
+
+
+def _state_path(name):
+    return STATE_DIR / f"{name.replace(' ', '_').replace(chr(39), '')}.arrow"
+
+
+def _header_hash(path):
+    with open(path, 'rb') as handle:
+        return hashlib.sha256(handle.readline()).hexdigest()
+
+
+def _read_state():
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def read_new_rows(path, state):
+    """Rows appended to the CSV since the recorded byte offset (all rows on a full rebuild)"""
+    with open(path, 'rb') as handle:
+        header = handle.readline()
+        start = state['offset'] if state else handle.tell()
+        handle.seek(start)
+        data = handle.read()
+    # Only consume complete lines; a partially written last line is picked up next time
+    end = data.rfind(b'\n') + 1
+    delta = pd.read_csv(io.BytesIO(header + data[:end]), dtype=str, keep_default_na=False, na_values=[''])
+    return delta, start + end
+
+
+def medal_counts(rows, keys):
+    """Per-group total and per-medal-type counts of a batch of medallist rows"""
+    return medal_pivot(rows, keys, dropna=False).wide(columns=MEDAL_TYPES, total='total')
+
+
+def _load_aggregate(name, keys):
+    path = _state_path(name)
+    if not path.exists():
+        return None
+    return feather.read_table(path).to_pandas().set_index(keys)
+
+
+def _save_aggregate(name, state):
+    table = pa.Table.from_pandas(state.reset_index(), preserve_index=False)
+    write_atomic(_state_path(name), lambda p: feather.write_feather(table, p))
+
+
+def render(name, state):
+    """Turn a maintained aggregate into the rows of its export (column names, HAVING, ORDER, LIMIT)"""
+    spec = AGGREGATES[name]
+    df = state.reset_index()
+    if 'post' in spec:
+        df = spec['post'](df)
+    df = df[spec['keys'] + list(spec['columns'].values())]
+    df.columns = spec['keys'] + list(spec['columns'])
+    if 'having' in spec:
+        df = df[spec['having'](df)]
+    columns, ascending = spec['order']
+    df = df.sort_values(columns, ascending=ascending, kind='stable')
+    if 'limit' in spec:
+        df = df.head(spec['limit'])
+    return df.reset_index(drop=True)
+
+
+def refresh(export_dir=EXPORTED_DIR, full=False):
+    """Fold rows appended to medallists.csv into every maintained aggregate
+
+    The byte offset of the last consumed line is the high-water mark; the
+    latest medal_date seen is recorded alongside it. If the file was
+    rewritten rather than appended to (it shrank or its header changed), or
+    full=True, the aggregates are rebuilt from scratch.
+    """
+    source = SOURCES['medallists']
+    state = None if full else _read_state()
+    size = source.stat().st_size
+    if state and (size < state['offset'] or state['header'] != _header_hash(source)):
+        state = None
+
+    rows, offset = read_new_rows(source, state)
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    for name, spec in AGGREGATES.items():
+        keys = spec['keys']
+        current = _load_aggregate(name, keys) if state else None
+        if len(rows) == 0 and current is not None:
+            continue
+        delta = medal_counts(rows, keys)
+        updated = delta if current is None else current.add(delta, fill_value=0).astype('int64')
+        _save_aggregate(name, updated)
+        path = export_dir / f'{name}.csv'
+        output = render(name, updated)
+        write_atomic(path, lambda p: output.to_csv(p, index=False))
+        SOURCES[name] = path
+        build_table(name)
+
+    dates = pd.to_datetime(rows['medal_date'], errors='coerce')
+    previous_mark = state['high_water'] if state else None
+    high_water = max(filter(None, [previous_mark, dates.max().strftime('%Y-%m-%d') if dates.notna().any() else None]), default=None)
+    new_state = {
+        'offset': offset,
+        'rows': (state['rows'] if state else 0) + len(rows),
+        'high_water': high_water,
+        'header': _header_hash(source),
+    }
+    write_atomic(STATE_FILE, lambda p: p.write_text(json.dumps(new_state)))
+    return len(rows), new_state
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Apply new medallists.csv rows to the Exported Data aggregates")
+    parser.add_argument('--full', action='store_true', help="rebuild every aggregate from the whole file")
+    args = parser.parse_args()
+
+    applied, status = refresh(full=args.full)
+    print(f"Applied {applied:,} new medal row(s); {status['rows']:,} rows folded in, latest medal_date {status['high_water']}")
@@ -0,0 +1,246 @@
+import contextlib
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+# Fraction of reruns profiled: '0' off, '1' every rerun, '0.01' one rerun in a hundred
+PROFILE_RATE = float(os.environ.get('OLYMPICS_PROFILE', '0'))
+# Sampled reruns are appended here as JSON lines when set
+PROFILE_LOG = os.environ.get('OLYMPICS_PROFILE_LOG')
+# ?debug=1 shows the sidebar panel and profiles every rerun of that session
+DEBUG_PARAM = 'debug'
+MAX_PROFILES = 50
+
+CATEGORIES = ['load', 'filter', 'build', 'render']
+
+_local = threading.local()
+_log_lock = threading.Lock()
+# Recent sampled reruns of every session in this process
+recent_profiles = deque(maxlen=MAX_PROFILES)
+
+
+def _statm():
+    try:
+        return os.open('/proc/self/statm', os.O_RDONLY)
+    except OSError:  # not Linux: memory counters are reported as 0
+        return None
+
+
+_STATM = _statm()
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if _STATM is not None else 0
+
+
+def rss_bytes():
+    """Resident set size of the process (one pread, a few microseconds)"""
+    if _STATM is None:
+        return 0
+    return int(os.pread(_STATM, 64, 0).split()[1]) * _PAGE_SIZE
+
+
+class RerunProfile:
+    """Timed spans of one script rerun
+
+    Every span records its wall time, its self time (children excluded) and
+    the change in process RSS while it ran. RSS is process-wide, so with
+    several sessions rendering at once the memory column is indicative only.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.time()
+        self.spans = []
+        self._origin = time.perf_counter_ns()
+        self._rss = rss_bytes()
+        self._stack = []  # child time accumulated for each open span
+        self.duration_ns = None
+        self.rss_delta = None
+
+    def measure(self, name, category, **args):
+        return _Span(self, name, category, args)
+
+    def finish(self):
+        self.duration_ns = time.perf_counter_ns() - self._origin
+        self.rss_delta = rss_bytes() - self._rss
+
+    def totals(self):
+        """Self time per category in ms; 'other' is script time outside any span"""
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for span in self.spans:
+            totals[span['category']] = totals.get(span['category'], 0.0) + span['self_ms']
+        totals['other'] = max(self.duration_ns / 1e6 - sum(totals.values()), 0.0)
+        return totals
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'started': self.started,
+            'duration_ms': self.duration_ns / 1e6,
+            'rss_delta_mb': self.rss_delta / 2**20,
+            'totals_ms': self.totals(),
+            'spans': self.spans,
+        }
+
+
+class _Span:
+    __slots__ = ('profile', 'name', 'category', 'args', 'start', 'rss')
+
+    def __init__(self, profile, name, category, args):
+        self.profile = profile
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.profile._stack.append(0)
+        self.rss = rss_bytes()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        profile = self.profile
+        children = profile._stack.pop()
+        duration = end - self.start
+        if profile._stack:
+            profile._stack[-1] += duration
+        profile.spans.append({
+            'name': self.name,
+            'category': self.category,
+            'start_ms': (self.start - profile._origin) / 1e6,
+            'duration_ms': duration / 1e6,
+            'self_ms': (duration - children) / 1e6,
+            'depth': len(profile._stack),
+            'rss_delta_mb': (rss_bytes() - self.rss) / 2**20,
+            **self.args,
+        })
+        return False
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def current():
+    """Profile of the rerun running on this thread, None when not sampled"""
+    return getattr(_local, 'profile', None)
+
+
+def span(name, category, **args):
+    """Context manager timing a block; free when the rerun is not sampled"""
+    profile = current()
+    return _NO_SPAN if profile is None else profile.measure(name, category, **args)
+
+
+def instrumented(category, name=None):
+    """Decorator: time every call of a loader or builder (cache hits included)"""
+    def decorate(function):
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = current()
+            if profile is None:
+                return function(*args, **kwargs)
+            with profile.measure(label, category):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def plotly_chart(figure, **kwargs):
+    """st.plotly_chart in a render span: Streamlit serializes the figure during this call"""
+    profile = current()
+    if profile is None:
+        return st.plotly_chart(figure, **kwargs)
+    title = figure.layout.title.text or 'chart'
+    with profile.measure(title, 'render'):
+        return st.plotly_chart(figure, **kwargs)
+
+
+def chrome_trace(profiles):
+    """Chrome trace-event JSON (chrome://tracing, Perfetto) for a list of profile dicts"""
+    events = []
+    pid = os.getpid()
+    for tid, profile in enumerate(profiles, start=1):
+        origin = profile['started'] * 1e6
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': profile['label']}})
+        events.append({
+            'name': 'rerun', 'cat': 'rerun', 'ph': 'X', 'pid': pid, 'tid': tid,
+            'ts': origin, 'dur': profile['duration_ms'] * 1e3, 'args': {'rss_delta_mb': profile['rss_delta_mb']},
+        })
+        for item in profile['spans']:
+            args = {k: v for k, v in item.items() if k not in ('name', 'category', 'start_ms', 'duration_ms')}
+            events.append({
+                'name': item['name'], 'cat': item['category'], 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': origin + item['start_ms'] * 1e3, 'dur': item['duration_ms'] * 1e3, 'args': args,
+            })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def _log(profile):
+    line = json.dumps(profile) + '\n'
+    with _log_lock, open(PROFILE_LOG, 'a', encoding='utf-8') as handle:
+        handle.write(line)
+
+
+@contextlib.contextmanager
+def profile_rerun():
+    """Wrap the script body: samples the rerun, records its profile and shows the debug panel"""
+    debug = st.query_params.get(DEBUG_PARAM) == '1'
+    if not debug and (PROFILE_RATE <= 0 or random.random() >= PROFILE_RATE):
+        yield None
+        return
+
+    reruns = st.session_state.get('_profile_reruns', 0) + 1
+    st.session_state['_profile_reruns'] = reruns
+    profile = _local.profile = RerunProfile(f'rerun {reruns}')
+    try:
+        yield profile
+    finally:
+        # Reruns and stops requested by Streamlit unwind through here too; keep what was measured
+        _local.profile = None
+        profile.finish()
+        record = profile.to_dict()
+        recent_profiles.append(record)
+        history = st.session_state.setdefault('_profiles', deque(maxlen=MAX_PROFILES))
+        history.append(record)
+        if PROFILE_LOG:
+            _log(record)
+    if debug:
+        render_debug_sidebar(record, list(history))
+
+
+def render_debug_sidebar(record, history):
+    """Breakdown of the last rerun plus JSON / Chrome-trace downloads of the session's reruns"""
+    with st.sidebar.expander("⏱️ Render profile", expanded=True):
+        st.caption(f"{record['label']}: {record['duration_ms']:.0f} ms, RSS {record['rss_delta_mb']:+.1f} MB")
+        totals = pd.Series(record['totals_ms'], name='ms').round(1)
+        st.bar_chart(totals)
+        spans = pd.DataFrame(record['spans'])
+        if not spans.empty:
+            spans = spans.sort_values('start_ms')
+            spans['name'] = ['  ' * depth + name for depth, name in zip(spans['depth'], spans['name'])]
+            st.dataframe(
+                spans[['name', 'category', 'duration_ms', 'self_ms', 'rss_delta_mb']].round(2),
+                hide_index=True, use_container_width=True,
+            )
+        st.download_button("Download JSON", json.dumps(history, indent=1), file_name='rerun_profiles.json',
+                           mime='application/json')
+        st.download_button("Download Chrome trace", json.dumps(chrome_trace(history)), file_name='rerun_trace.json',
+                           mime='application/json')
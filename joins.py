@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+
+def _join_keys(left_keys, right_keys):
+    # Compare numeric codes as numbers and everything else as text, so 1903136 == '1903136'
+    if pd.api.types.is_numeric_dtype(left_keys) and pd.api.types.is_numeric_dtype(right_keys):
+        return left_keys, right_keys
+    return left_keys.astype('string'), right_keys.astype('string')
+
+
+class KeyIndex:
+    """Prebuilt key -> row position index over one side of a join
+
+    Duplicate keys are resolved by keeping the first row for each key; the
+    dropped keys are kept on the index so the join report can list them.
+    """
+
+    def __init__(self, keys):
+        keys = pd.Series(keys).reset_index(drop=True)
+        duplicated = keys.duplicated(keep='first')
+        self.duplicate_keys = keys[duplicated].dropna().unique()
+        self.positions = np.flatnonzero(~duplicated.to_numpy() & keys.notna().to_numpy())
+        self.index = pd.Index(keys.iloc[self.positions])
+
+    def lookup(self, keys):
+        """Row positions for each key, -1 where the key is not in the index"""
+        found = self.index.get_indexer(pd.Index(keys))
+        return np.where(found >= 0, self.positions[found], -1)
+
+
+def indexed_join(left, right, left_on, right_on, how='inner', suffixes=('_x', '_y'), index=None):
+    """Many-to-one join of left onto right through a KeyIndex
+
+    Every left row matches at most one right row, so the result never has
+    more rows than left. Returns (frame, report) where report counts the
+    matched, unmatched and duplicate keys.
+    """
+    left_keys, right_keys = _join_keys(left[left_on], right[right_on])
+    if index is None:
+        index = KeyIndex(right_keys)
+    rows = index.lookup(left_keys)
+    matched = rows >= 0
+
+    if how == 'inner':
+        left_part = left.iloc[np.flatnonzero(matched)]
+        right_part = right.iloc[rows[matched]]
+    elif how == 'left':
+        left_part = left
+        right_part = right.iloc[rows.clip(min=0)]
+        right_part = right_part.where(np.broadcast_to(matched[:, None], right_part.shape))
+    else:
+        raise ValueError(f"Unsupported join type: {how}")
+
+    # Same suffix rule as pd.merge for columns present on both sides
+    overlap = left.columns.intersection(right.columns).difference([left_on] if left_on == right_on else [])
+    left_part = left_part.rename(columns={c: f"{c}{suffixes[0]}" for c in overlap})
+    right_part = right_part.rename(columns={c: f"{c}{suffixes[1]}" for c in overlap})
+    if left_on == right_on:
+        right_part = right_part.drop(columns=[right_on])
+
+    joined = pd.concat(
+        [left_part.reset_index(drop=True), right_part.reset_index(drop=True)],
+        axis=1
+    )
+
+    report = {
+        'left_rows': len(left),
+        'right_rows': len(right),
+        'matched': int(matched.sum()),
+        'unmatched': int((~matched).sum()),
+        'unmatched_keys': left_keys[~matched].dropna().unique().tolist()[:20],
+        'duplicate_keys': len(index.duplicate_keys),
+        'result_rows': len(joined),
+    }
+    return joined, report
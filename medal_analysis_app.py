@@ -1,14 +1,52 @@
+import argparse
+import functools
+import os
+
 import pandas as pd
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, ClientsideFunction
 import plotly.express as px
+from flask import jsonify
+
+from data_store import load_table
+from medal_pivot import MEDAL_COLUMNS, MedalPivot
+
+# Load data once at import time: under the production server the app is imported in the
+# master process before workers fork, so every worker shares this frame copy-on-write
+df_events = load_table('Dominance in a Specific Event')
+
+# Long format once (straight from the medal count matrix) and index the slices by country,
+# so the callback is a dictionary lookup instead of a scan + melt on every dropdown change
+melted_events = MedalPivot.from_wide(df_events, ['country', 'event']).long(var_name='Medal Type', value_name='Count')
+country_slices = {
+    country: group.drop(columns='country').reset_index(drop=True)
+    for country, group in melted_events.groupby('country', sort=False, observed=True)
+}
+FIGURE_CACHE_SIZE = int(os.environ.get('MEDAL_APP_FIGURE_CACHE', 128))
 
-# Load data
-df_events = pd.read_csv(r'C:\Users\sreev\Data Visualization\Olympics 2024\Paris 2024 Summer Olympic Games Data analysis\Exported Data\Dominance in a Specific Event.csv')  # Replace with your file path
+# MEDAL_APP_CLIENTSIDE=1 ships the per-country breakdown to the browser once and filters / plots
+# it there, so dropdown changes never reach the server. Read at import so gunicorn workers agree.
+CLIENTSIDE = os.environ.get('MEDAL_APP_CLIENTSIDE', '0') == '1'
+# Browser code of the client-side mode. Dash serves (and injects) every file of its assets
+# folder, so this is the assets folder only in that mode; the default 'assets' doesn't exist.
+CLIENTSIDE_ASSETS = 'clientside'
+
+
+def encode_medal_breakdown(df):
+    """Compact columnar payload: event names once, then per country event indices + counts"""
+    events = sorted(df['event'].unique())
+    event_index = {event: i for i, event in enumerate(events)}
+    countries = {}
+    for country, group in df.groupby('country', sort=False, observed=True):
+        countries[country] = [group['event'].map(event_index).tolist()] + [
+            group[column].astype(int).tolist() for column in MEDAL_COLUMNS
+        ]
+    return {'events': events, 'medals': MEDAL_COLUMNS, 'countries': countries}
 
 # Initialize Dash app
-app = dash.Dash(__name__)
+app = dash.Dash(__name__, **({'assets_folder': CLIENTSIDE_ASSETS} if CLIENTSIDE else {}))
+server = app.server  # WSGI entry point, e.g. `gunicorn medal_analysis_app:server`
 
 # Layout
 app.layout = html.Div([
@@ -20,27 +58,37 @@ app.layout = html.Div([
         style={'width': '50%', 'margin': 'auto'}
     ),
     dcc.Graph(id='medal-breakdown'),
-])
+] + ([dcc.Store(id='medal-store', data=encode_medal_breakdown(df_events))] if CLIENTSIDE else []))
+
+# Health check for the load balancer
+@server.route('/healthz')
+def healthz():
+    return jsonify(status='ok', rows=len(df_events), pid=os.getpid())
 
 # Callback
-@app.callback(
-    Output('medal-breakdown', 'figure'),
-    [Input('country-dropdown', 'value')]
-)
 def update_graph(selected_country):
-    if not selected_country:
+    if not selected_country or selected_country not in country_slices:
         return {}
     
-    # Filter data by selected country
-    filtered_data = df_events[df_events['country'] == selected_country]
-    
-    # Melt the dataframe to long format for easier plotting
-    melted_data = filtered_data.melt(
-        id_vars=['event'], 
-        value_vars=['Gold_Medals', 'Silver_Medals', 'Bronze_Medals'],
-        var_name='Medal Type',
-        value_name='Count'
+    return country_figure(selected_country)
+
+if CLIENTSIDE:
+    # clientside/medal_breakdown.js, served as the assets folder in this mode
+    app.clientside_callback(
+        ClientsideFunction(namespace='medalAnalysis', function_name='updateGraph'),
+        Output('medal-breakdown', 'figure'),
+        [Input('country-dropdown', 'value'), Input('medal-store', 'data')]
     )
+else:
+    app.callback(
+        Output('medal-breakdown', 'figure'),
+        [Input('country-dropdown', 'value')]
+    )(update_graph)
+
+# Figures are memoized per country (bounded); Dash only serializes them, never mutates them
+@functools.lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def country_figure(selected_country):
+    melted_data = country_slices[selected_country]
     
     # Create the bar chart
     fig = px.bar(
@@ -55,6 +103,33 @@ def update_graph(selected_country):
     fig.update_layout(xaxis_tickangle=45, title_x=0.5, plot_bgcolor='white')
     return fig
 
+def serve(host='0.0.0.0', port=8060, workers=4, threads=2):
+    """Run the app under gunicorn with the data preloaded before the workers fork"""
+    # gunicorn is POSIX-only; on Windows run the debug server or use another WSGI server on `server`
+    from gunicorn.app.base import BaseApplication
+
+    class MedalAnalysisServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('preload_app', True)
+
+        def load(self):
+            return server
+
+    MedalAnalysisServer().run()
+
 # Run app
 if __name__ == '__main__':
-    app.run_server(debug=True, port=8060)
+    parser = argparse.ArgumentParser(description="Medal Analysis by Event dashboard")
+    parser.add_argument('--prod', action='store_true', help="serve with multiple gunicorn workers instead of the debug server")
+    parser.add_argument('--port', type=int, default=int(os.environ.get('MEDAL_APP_PORT', 8060)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('MEDAL_APP_WORKERS', os.cpu_count() or 1)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('MEDAL_APP_THREADS', 2)))
+    args = parser.parse_args()
+
+    if args.prod:
+        serve(port=args.port, workers=args.workers, threads=args.threads)
+    else:
+        app.run_server(debug=True, port=args.port)
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+MEDAL_TYPES = ['Gold Medal', 'Silver Medal', 'Bronze Medal']
+MEDAL_COLUMNS = ['Gold_Medals', 'Silver_Medals', 'Bronze_Medals']
+
+# Spellings used across the sources -> medal code (0 gold, 1 silver, 2 bronze)
+_MEDAL_LOOKUP = pd.Index(MEDAL_TYPES + ['Gold', 'Silver', 'Bronze'])
+
+
+def medal_codes(values):
+    """medal_type values -> int8 codes 0/1/2 (-1 for missing or 'No medal')
+
+    Accepts the 'Gold Medal' / 'Gold' spellings and medal_code 1/2/3. Only
+    the distinct values are looked up, so categoricals cost one small lookup.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.to_numpy(dtype=float, na_value=np.nan) - 1
+        return np.where((codes >= 0) & (codes <= 2), codes, -1).astype(np.int8)
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('category')
+    lookup = _MEDAL_LOOKUP.get_indexer(values.cat.categories.astype(str))
+    lookup = np.where(lookup >= 0, lookup % 3, -1).astype(np.int8)
+    categories = values.cat.codes.to_numpy()
+    return np.where(categories >= 0, lookup[categories], -1).astype(np.int8)
+
+
+def _group_codes(df, keys, dropna):
+    """One int code per row for the combination of key columns, plus the group labels"""
+    codes = []
+    uniques = []
+    for key in keys:
+        key_codes, key_uniques = pd.factorize(df[key], sort=True, use_na_sentinel=dropna)
+        codes.append(key_codes)
+        uniques.append(key_uniques)
+    if len(keys) == 1:
+        return codes[0], pd.Index(uniques[0], name=keys[0])
+
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    flat = np.full(len(df), -1, dtype=np.int64)
+    flat[valid] = np.ravel_multi_index([c[valid] for c in codes], [len(u) for u in uniques])
+    # Keep only the combinations that occur, in sorted key order
+    group_codes, combos = pd.factorize(flat[valid], sort=True)
+    flat[valid] = group_codes
+    levels = np.unravel_index(combos, [len(u) for u in uniques])
+    index = pd.MultiIndex(levels=uniques, codes=levels, names=keys)
+    return flat, index
+
+
+class MedalPivot:
+    """(group x 3) gold / silver / bronze count matrix for one grouping"""
+
+    def __init__(self, index, counts):
+        self.index = index      # group labels (Index or MultiIndex)
+        self.counts = counts    # int64 array, shape (len(index), 3)
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def from_wide(cls, df, keys, columns=MEDAL_COLUMNS):
+        """Wrap an already pivoted frame (e.g. an export with Gold_Medals / ... columns)"""
+        index = pd.MultiIndex.from_frame(df[keys]) if len(keys) > 1 else pd.Index(df[keys[0]])
+        return cls(index, df[columns].to_numpy(dtype=np.int64))
+
+    def totals(self):
+        return self.counts.sum(axis=1)
+
+    def wide(self, columns=MEDAL_COLUMNS, total=None):
+        """One row per group; the count columns are views of the matrix"""
+        wide = pd.DataFrame(self.counts, index=self.index, columns=columns, copy=False)
+        if total:
+            wide.insert(0, total, self.totals())
+        return wide
+
+    def long(self, var_name='Medal Type', value_name='Count', labels=MEDAL_COLUMNS):
+        """Long form: one row per (group, medal type), the three rows of a group adjacent
+
+        Built straight from the count matrix: every key column is its level
+        values taken at the repeated group codes, the counts are a view of
+        the matrix, so no wide frame is materialized and reshaped.
+        """
+        if isinstance(self.index, pd.MultiIndex):
+            levels, codes = self.index.levels, self.index.codes
+        else:
+            levels, codes = [self.index], [np.arange(len(self.index))]
+        columns = {
+            name: level.take(np.repeat(level_codes, 3), allow_fill=True, fill_value=np.nan)
+            for name, level, level_codes in zip(self.index.names, levels, codes)
+        }
+        columns[var_name] = np.tile(np.array(labels, dtype=object), len(self.index))
+        columns[value_name] = self.counts.ravel()
+        return pd.DataFrame(columns, copy=False)
+
+
+def medal_pivot(df, keys, medal_column='medal_type', dropna=True):
+    """Count gold / silver / bronze per group of `keys` with a single bincount
+
+    Rows whose medal type is not one of the three (or missing) are ignored;
+    with dropna=False missing key values form their own group, like
+    groupby(dropna=False).
+    """
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    groups, index = _group_codes(df, keys, dropna)
+    medals = medal_codes(df[medal_column])
+    valid = (groups >= 0) & (medals >= 0)
+    counts = np.bincount(groups[valid] * 3 + medals[valid], minlength=len(index) * 3)
+    return MedalPivot(index, counts.reshape(len(index), 3))
@@ -0,0 +1,246 @@
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from data_store import BASE_DIR, CACHE_DIR, write_atomic
+from schemas import SCHEMAS, apply_schema, share_dictionaries
+
+RESULTS_DIR = BASE_DIR / 'results'
+RESULTS_CACHE_DIR = CACHE_DIR / 'results'
+CHUNK_ROWS = 50_000
+
+# Union of the columns found across the discipline files, in file order. Files that lack a
+# column (e.g. Sailing has no start_order/bib, team sports have result_WLT instead of rank)
+# get it as all-null so every partition has the same schema.
+RESULT_COLUMNS = [
+    'date', 'stage_code', 'event_code', 'event_name', 'event_stage', 'stage', 'gender',
+    'discipline_name', 'discipline_code', 'venue', 'participant_code', 'participant_name',
+    'participant_type', 'participant_country_code', 'participant_country', 'rank', 'result',
+    'result_type', 'result_WLT', 'result_IRM', 'result_diff', 'qualification_mark',
+    'start_order', 'bib',
+]
+
+
+def _arrow_type(spec):
+    if spec == 'timestamp':
+        return pa.timestamp('ns', tz='UTC')
+    if spec in ('Int8', 'Int16'):
+        return pa.int16()
+    if spec == 'category' or spec.startswith('dict:'):
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+# result_type -> which numeric column the decoded 'result' goes to
+RESULT_UNITS = {
+    'TIME': 'result_seconds',
+    'IRM_TIME': 'result_seconds',
+    'DISTANCE': 'result_metres',
+    'WEIGHT': 'result_kg',
+    'POINTS': 'result_points',
+    'IRM_POINTS': 'result_points',
+    'SETS': 'result_points',
+    'SCORE': 'result_points',
+    'STROKES': 'result_points',
+    'PERCENT': 'result_points',
+}
+
+# Invalid Result Marks seen in the results files; anything else decodes to 'OTHER'
+IRM_CODES = [
+    'OK', 'DNF', 'DNS', 'DSQ', 'DQ', 'DQB', 'NM', 'EL', 'WD', 'WDR', 'RET', 'RT', 'LAP', 'DNC',
+    'BFD', 'UFD', 'DPI', 'OCS', 'RDG', 'SCP', 'REL', 'INJ', 'OVL', 'BUW', 'FS', 'W/O', 'Fall', 'OTHER',
+]
+IRM_DTYPE = pd.CategoricalDtype(IRM_CODES)
+
+RESULT_SCHEMA = pa.schema([
+    (column, _arrow_type(SCHEMAS['results'].get(column, 'string')))
+    for column in RESULT_COLUMNS
+])
+
+
+def discover_result_files(results_dir=None):
+    """Map discipline name -> CSV path for every file in results/"""
+    return {path.stem: path for path in sorted(Path(results_dir or RESULTS_DIR).glob('*.csv'))}
+
+
+def _partition_path(discipline):
+    return RESULTS_CACHE_DIR / f'discipline={quote(discipline, safe="")}' / 'part-0.parquet'
+
+
+def normalize_chunk(discipline, chunk):
+    """Bring one parsed chunk to the shared results schema"""
+    missing = [column for column in RESULT_COLUMNS if column not in chunk.columns]
+    chunk = chunk.reindex(columns=RESULT_COLUMNS)
+    chunk[missing] = chunk[missing].astype(object)
+    chunk = apply_schema(f'results/{discipline}', chunk)
+    return pa.Table.from_pandas(chunk, schema=RESULT_SCHEMA, preserve_index=False)
+
+
+def _build_partition(discipline, path, chunk_rows):
+    target = _partition_path(discipline)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per process and thread, as two sessions may rebuild the same stale partition at
+    # once; the leading '.' keeps it out of the dataset discovery of concurrent queries
+    tmp_path = target.with_name(f'.{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    rows = 0
+    # Parse as text so 'result', 'bib' and the codes keep one type across files; the
+    # schema registry then types the known columns
+    with pq.ParquetWriter(tmp_path, RESULT_SCHEMA) as writer:
+        for chunk in pd.read_csv(path, dtype=str, chunksize=chunk_rows):
+            writer.write_table(normalize_chunk(discipline, chunk))
+            rows += len(chunk)
+    os.replace(tmp_path, target)
+    return discipline, rows
+
+
+def _read_manifest():
+    try:
+        return json.loads((RESULTS_CACHE_DIR / '_manifest.json').read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def build_results(workers=None, chunk_rows=CHUNK_ROWS, force=False):
+    """Stream every changed results/*.csv into its discipline partition
+
+    Files are parsed in parallel across a process pool (workers=1 parses in
+    this process). Returns {discipline: rows} for the partitions rebuilt.
+    """
+    files = discover_result_files()
+    manifest = {} if force else _read_manifest()
+    stale = {}
+    for discipline, path in files.items():
+        stat = path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        if manifest.get(discipline) != signature or not _partition_path(discipline).exists():
+            stale[discipline] = (path, signature)
+
+    built = {}
+    if workers == 1 or len(stale) <= 1:
+        for discipline, (path, _) in stale.items():
+            built.update([_build_partition(discipline, path, chunk_rows)])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_build_partition, discipline, path, chunk_rows)
+                for discipline, (path, _) in stale.items()
+            ]
+            built.update(future.result() for future in futures)
+
+    # Drop partitions whose source file is gone
+    dropped = set(manifest) - set(files)
+    for discipline in dropped:
+        _partition_path(discipline).unlink(missing_ok=True)
+        manifest.pop(discipline)
+
+    # Nothing changed on the usual query path, so nothing is written
+    if stale or dropped:
+        manifest.update({discipline: signature for discipline, (_, signature) in stale.items()})
+        RESULTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        write_atomic(RESULTS_CACHE_DIR / '_manifest.json', lambda p: p.write_text(json.dumps(manifest)))
+    return built
+
+
+def results_dataset():
+    # Cheap when nothing changed: one stat() per discipline file
+    build_results()
+    return ds.dataset(RESULTS_CACHE_DIR, format='parquet', partitioning='hive', exclude_invalid_files=True)
+
+
+def _isin(field, values):
+    if isinstance(values, str):
+        values = [values]
+    return ds.field(field).isin(list(values))
+
+
+def query_results(discipline=None, event_code=None, stage=None, columns=None, decode=False):
+    """Read results with the filters pushed down to the partitioned table
+
+    discipline prunes whole partitions; event_code and stage (the 'stage'
+    text, e.g. 'Final') are evaluated in the scanner against row-group
+    statistics. Each filter takes one value or a list. decode=True adds the
+    numeric result columns from decode_results().
+    """
+    expression = None
+    for field, values in (('discipline', discipline), ('event_code', event_code), ('stage', stage)):
+        if values is None:
+            continue
+        condition = _isin(field, values)
+        expression = condition if expression is None else expression & condition
+
+    table = results_dataset().to_table(columns=columns, filter=expression)
+    df = table.to_pandas(types_mapper={pa.int16(): pd.Int16Dtype()}.get)
+    df = share_dictionaries('results', df)
+    return decode_results(df) if decode else df
+
+
+def parse_clock(values):
+    """Vectorized 'h:mm:ss.ff' / 'm:ss.ff' / 'ss.ff' (optionally '+' / '-' prefixed) -> seconds
+
+    The sign applies to the whole value ('-1:02.5' is -62.5). Strings that
+    are not clock values (e.g. 'FLT (2, 8)') decode to NaN.
+    """
+    text = pd.Series(values, dtype='string').str.strip()
+    negative = text.str.startswith('-').to_numpy(dtype=bool, na_value=False)
+    text = text.str.replace(r'^[+-]', '', regex=True)
+    # Only one leading sign: '--1' or '1:-05' are not clock values
+    signed = text.str.contains('[+-]').to_numpy(dtype=bool, na_value=False)
+    parts = text.str.split(':', n=2, expand=True)
+    n_parts = (text.str.count(':') + 1).to_numpy(dtype=float, na_value=np.nan)
+    seconds = np.zeros(len(text))
+    valid = ~np.isnan(n_parts) & ~signed
+    for i in range(parts.shape[1]):
+        numbers = pd.to_numeric(parts[i], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        used = i < n_parts
+        # Right-align the components: the last one is seconds, then minutes, then hours
+        weight = np.power(60.0, np.where(used, n_parts - 1 - i, 0))
+        seconds += np.where(used, np.nan_to_num(numbers) * weight, 0)
+        valid &= ~(used & np.isnan(numbers))
+    seconds = np.where(negative, -seconds, seconds)
+    return pd.Series(np.where(valid, seconds, np.nan), index=getattr(values, 'index', None))
+
+
+def decode_results(df):
+    """Add numeric result columns and an IRM status enum to a results frame
+
+    result_seconds / result_metres / result_kg / result_points hold the
+    'result' value in the unit given by result_type; result_diff_value is
+    'result_diff' in the same unit (seconds for timed events). irm_status is
+    'OK' for valid results and the Invalid Result Mark (DNF, DSQ, ...) otherwise.
+    """
+    df = df.copy(deep=False)
+    result_type = df['result_type'].astype('string')
+    numeric = pd.to_numeric(df['result'], errors='coerce')
+    clock = parse_clock(df['result'])
+
+    for column in sorted(set(RESULT_UNITS.values())):
+        types = [t for t, unit in RESULT_UNITS.items() if unit == column]
+        selected = result_type.isin(types).to_numpy(dtype=bool, na_value=False)
+        source = clock if column == 'result_seconds' else numeric
+        df[column] = source.where(selected)
+
+    # result_diff: '+0:51' for timed events, '+9.64' / '104.75' elsewhere
+    diff = parse_clock(df['result_diff']) if 'result_diff' in df.columns else pd.Series(np.nan, index=df.index)
+    df['result_diff_value'] = diff
+
+    irm = df['result_IRM'].astype('string') if 'result_IRM' in df.columns else pd.Series(pd.NA, index=df.index, dtype='string')
+    is_irm = result_type.str.startswith('IRM').fillna(False) | irm.notna()
+    status = irm.where(irm.isin(IRM_CODES), 'OTHER').where(is_irm, 'OK')
+    df['irm_status'] = status.astype(IRM_DTYPE)
+    return df
+
+
+if __name__ == '__main__':
+    rebuilt = build_results(workers=os.cpu_count())
+    print(f"Rebuilt {len(rebuilt)} results partition(s) in {RESULTS_CACHE_DIR}")
+    for name, count in sorted(rebuilt.items()):
+        print(f"  - {name}: {count:,} rows")
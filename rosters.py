@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+from data_store import CACHE_DIR, SOURCES, cache_metadata, code_hash, load_table, write_atomic
+from schemas import schema_for
+
+TEAM_MEMBERS_PATH = CACHE_DIR / 'team_members.arrow'
+
+# role -> (names column, codes column) in teams.csv; both hold Python list literals
+LIST_COLUMNS = {
+    'athlete': ('athletes', 'athletes_codes'),
+    'coach': ('coaches', 'coaches_codes'),
+}
+
+# Separator between the quoted elements of a list literal: names containing an
+# apostrophe are repr'd in double quotes ("D'ALMEIDA Marcus"), the rest in single quotes
+_SEPARATOR = r"""['"]\s*,\s*['"]"""
+# The brackets and outer quotes around the elements
+_BRACKETS = r"""^\[\s*['"]?|['"]?\s*\]$"""
+
+
+def explode_list_column(values):
+    """Parse a column of list literals in one vectorized pass
+
+    Returns (row, position, element) arrays: the source row of every list
+    element, its index inside the list and its text.
+    """
+    literals = pc.utf8_trim_whitespace(pa.array(values, type=pa.string(), from_pandas=True))
+    # Strip the [' and '] around the elements, then split on the quote-comma-quote separators
+    lists = pc.split_pattern_regex(pc.replace_substring_regex(literals, _BRACKETS, ''), _SEPARATOR)
+    elements = pc.list_flatten(lists).to_numpy(zero_copy_only=False)
+    rows = pc.list_parent_indices(lists).to_numpy()
+    keep = elements != ''  # '[]' parses to a single empty element
+    rows, elements = rows[keep], elements[keep]
+    starts = np.r_[0, np.flatnonzero(rows[1:] != rows[:-1]) + 1]
+    positions = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+    return rows, positions, elements
+
+
+def build_team_members(teams_df):
+    """Exploded roster: one row per (team, member) with the member's code, name and role"""
+    teams = teams_df['code'].to_numpy()
+    frames = []
+    for role, (names_column, codes_column) in LIST_COLUMNS.items():
+        rows, positions, codes = explode_list_column(teams_df[codes_column])
+        members = pd.DataFrame({'code_team': teams[rows], 'code_member': codes, 'position': positions.astype(np.int16)})
+        # Names line up with codes by list position
+        name_rows, name_positions, names = explode_list_column(teams_df[names_column])
+        names = pd.Series(names, index=pd.MultiIndex.from_arrays([name_rows, name_positions]))
+        members['name'] = names.reindex(pd.MultiIndex.from_arrays([rows, positions])).to_numpy()
+        members['role'] = role
+        frames.append(members)
+
+    # Codes stay strings: most are numeric athlete codes but some coach codes are not
+    team_members = pd.concat(frames, ignore_index=True)
+    team_members['role'] = pd.Categorical(team_members['role'], categories=list(LIST_COLUMNS))
+    return team_members[['code_team', 'code_member', 'name', 'role', 'position']]
+
+
+def builder_hash():
+    """Hash of the parsing code and the teams schema, stored in the cache's metadata"""
+    return code_hash([explode_list_column, build_team_members], {'columns': LIST_COLUMNS, 'patterns': [_BRACKETS, _SEPARATOR], 'schema': schema_for('teams')})
+
+
+def is_stale():
+    """Whether the roster table is missing, older than teams.csv or built by older code"""
+    if not TEAM_MEMBERS_PATH.exists():
+        return True
+    if cache_metadata(TEAM_MEMBERS_PATH).get('builder') != builder_hash():
+        return True
+    return SOURCES['teams'].stat().st_mtime_ns > TEAM_MEMBERS_PATH.stat().st_mtime_ns
+
+
+def load_team_members():
+    """Team roster table from the columnar cache, rebuilt when teams.csv changed"""
+    if is_stale():
+        team_members = build_team_members(load_table('teams'))
+        table = pa.Table.from_pandas(team_members, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), 'builder': builder_hash()})
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        write_atomic(TEAM_MEMBERS_PATH, lambda p: feather.write_feather(table, p, compression='uncompressed'))
+    return feather.read_table(TEAM_MEMBERS_PATH, memory_map=True).to_pandas()
+
+
+if __name__ == '__main__':
+    team_members = load_team_members()
+    counts = team_members['role'].value_counts()
+    print(f"{team_members['code_team'].nunique():,} teams: "
+          f"{counts['athlete']:,} athlete and {counts['coach']:,} coach entries -> {TEAM_MEMBERS_PATH}")
@@ -0,0 +1,181 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_table
+
+HOUR = 3600
+LOCAL_TZ = 'Europe/Paris'
+
+
+def to_utc_seconds(values):
+    # tz-aware timestamps -> int64 seconds since the epoch (UTC); missing -> -1
+    stamps = pd.to_datetime(values, utc=True)
+    seconds = stamps.to_numpy(dtype='datetime64[s]', na_value=np.datetime64('NaT')).astype(np.int64)
+    return np.where(stamps.isna().to_numpy(), -1, seconds)
+
+
+def _group_index(codes, order, n_groups):
+    """CSR layout: positions (in `order`) of each group, sliced by offsets[g]:offsets[g + 1]"""
+    grouped = order[np.argsort(codes[order], kind='stable')]
+    grouped = grouped[codes[grouped] >= 0]
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[grouped], minlength=n_groups), out=offsets[1:])
+    return grouped, offsets
+
+
+def _code(labels, value):
+    # Unknown values map to -2 so they never match the -1 of missing codes
+    code = labels.get_indexer([value])[0]
+    return code if code >= 0 else -2
+
+
+class ScheduleIndex:
+    """Sessions of schedules.csv with interval and venue / discipline indexes
+
+    Times are int64 seconds since the epoch (UTC). Every session is registered
+    in each hour bucket it overlaps, so "live at T" only scans the sessions of
+    one bucket. Sessions without an end time are treated as instantaneous.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = sessions.reset_index(drop=True)
+        self.start = to_utc_seconds(self.sessions['start_date'])
+        end = to_utc_seconds(self.sessions['end_date'])
+        self.end = np.where(end < self.start, self.start, end)
+        self.by_start = np.argsort(self.start, kind='stable')
+
+        self.venue_codes, self.venues = pd.factorize(self.sessions['venue_code'], sort=True)
+        self.discipline_codes, self.disciplines = pd.factorize(self.sessions['discipline'], sort=True)
+        self._venue_index = _group_index(self.venue_codes, self.by_start, len(self.venues))
+        self._discipline_index = _group_index(self.discipline_codes, self.by_start, len(self.disciplines))
+
+        # Hour-bucket interval index
+        self.origin = int(self.start.min()) // HOUR * HOUR
+        first = (self.start - self.origin) // HOUR
+        last = (np.maximum(self.end - 1, self.start) - self.origin) // HOUR
+        spans = last - first + 1
+        rows = np.repeat(np.arange(len(self.start)), spans)
+        buckets = np.repeat(first, spans) + np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+        self.n_buckets = int(last.max()) + 1
+        self._bucket_rows, self._bucket_offsets = _group_index(buckets, np.argsort(self.start[rows], kind='stable'), self.n_buckets)
+        self._bucket_rows = rows[self._bucket_rows]
+
+    @classmethod
+    def load(cls, include_cancelled=False):
+        sessions = load_table('schedules')
+        if not include_cancelled:
+            sessions = sessions[sessions['status'] != 'CANCELLED']
+        return cls(sessions)
+
+    def __len__(self):
+        return len(self.start)
+
+    def _positions(self, venue=None, discipline=None):
+        """Row positions (ordered by start time) for venue code(s) and/or discipline(s)"""
+        positions = self.by_start
+        for value, labels, (grouped, offsets) in (
+            (venue, self.venues, self._venue_index),
+            (discipline, self.disciplines, self._discipline_index),
+        ):
+            if value is None:
+                continue
+            values = [value] if np.isscalar(value) else list(value)
+            codes = labels.get_indexer(values)
+            subset = np.concatenate([grouped[:0]] + [grouped[offsets[c]:offsets[c + 1]] for c in codes if c >= 0])
+            positions = subset if positions is self.by_start else np.intersect1d(positions, subset)
+        if positions is not self.by_start:
+            positions = positions[np.argsort(self.start[positions], kind='stable')]
+        return positions
+
+    def live_positions(self, when, venue=None, discipline=None):
+        """Row positions of the sessions running at `when` (naive timestamps are taken as UTC)"""
+        stamp = pd.Timestamp(when)
+        t = (stamp if stamp.tzinfo else stamp.tz_localize('UTC')).value // 10**9
+        bucket = (t - self.origin) // HOUR
+        if not 0 <= bucket < self.n_buckets:
+            return self.by_start[:0]
+        rows = self._bucket_rows[self._bucket_offsets[bucket]:self._bucket_offsets[bucket + 1]]
+        start, end = self.start[rows], self.end[rows]
+        rows = rows[(start <= t) & ((t < end) | (start == end) & (start == t))]
+        for value, labels, codes in ((venue, self.venues, self.venue_codes), (discipline, self.disciplines, self.discipline_codes)):
+            if value is not None:
+                rows = rows[codes[rows] == _code(labels, value)]
+        return rows
+
+    def live_at(self, when, venue=None, discipline=None):
+        """Sessions running at `when`"""
+        return self.sessions.iloc[self.live_positions(when, venue, discipline)]
+
+    def hour_counts(self, venue=None, discipline=None, local=True):
+        """Sessions starting in each hour of the day (0-23), local Paris time by default"""
+        positions = self._positions(venue, discipline)
+        if local:
+            stamps = pd.to_datetime(self.start[positions], unit='s', utc=True).tz_convert(LOCAL_TZ)
+            hours = stamps.hour.to_numpy()
+        else:
+            hours = self.start[positions] // HOUR % 24
+        return np.bincount(hours, minlength=24)
+
+    def events_per_hour(self, local=True):
+        """Venue x hour-of-day table of session starts"""
+        hours = pd.to_datetime(self.start, unit='s', utc=True)
+        hours = (hours.tz_convert(LOCAL_TZ) if local else hours).hour.to_numpy()
+        valid = self.venue_codes >= 0
+        counts = np.bincount(
+            self.venue_codes[valid] * 24 + hours[valid], minlength=len(self.venues) * 24
+        ).reshape(len(self.venues), 24)
+        return pd.DataFrame(counts, index=pd.Index(self.venues, name='venue_code'), columns=pd.RangeIndex(24, name='hour'))
+
+    def overlaps(self, venue=None, discipline=None):
+        """Pairs of sessions whose time ranges intersect, per venue
+
+        Intersection is strict (a.start < b.end and b.start < a.end), so
+        back-to-back and zero-length sessions never overlap. Within a venue
+        the sessions are sorted by start, so everything that overlaps session
+        i and starts after it lies in i+1 .. searchsorted(end_i).
+        """
+        positions = self._positions(venue, discipline)
+        pairs = []
+        codes = self.venue_codes[positions]
+        for code in np.unique(codes[codes >= 0]):
+            rows = positions[codes == code]
+            starts = self.start[rows]
+            stops = np.searchsorted(starts, self.end[rows], side='left')
+            counts = np.maximum(stops - np.arange(1, len(rows) + 1), 0)
+            if not counts.any():
+                continue
+            first = np.repeat(np.arange(len(rows)), counts)
+            second = first + 1 + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            pairs.append(np.column_stack([rows[first], rows[second]]))
+        if not pairs:
+            return pd.DataFrame(columns=['venue_code', 'first', 'second', 'overlap_minutes'])
+        pairs = np.concatenate(pairs)
+        # The candidates start before end_i; a later-sorted zero-length session at start_i is not inside it
+        pairs = pairs[self.start[pairs[:, 0]] < self.end[pairs[:, 1]]]
+        first, second = pairs[:, 0], pairs[:, 1]
+        overlap = np.minimum(self.end[first], self.end[second]) - self.start[second]
+        return pd.DataFrame({
+            'venue_code': self.venues[self.venue_codes[first]],
+            'first': self.sessions['url'].to_numpy()[first],
+            'second': self.sessions['url'].to_numpy()[second],
+            'overlap_minutes': overlap // 60,
+        })
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Query the Paris 2024 competition schedule")
+    parser.add_argument('--at', help="list the sessions live at this time, e.g. 2024-08-01T20:00+02:00")
+    parser.add_argument('--venue', help="restrict to a venue code")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = ScheduleIndex.load()
+    print(f"Indexed {len(index):,} sessions in {(time.perf_counter() - started) * 1000:.1f} ms")
+    if args.at:
+        live = index.live_at(args.at, venue=args.venue)
+        print(live[['start_date', 'end_date', 'discipline', 'phase', 'venue_code']].to_string(index=False))
+    else:
+        print(index.events_per_hour().loc[[args.venue] if args.venue else slice(None)].to_string())
@@ -0,0 +1,171 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from data_store import CACHE_DIR, SOURCES, write_atomic
+from schedule import to_utc_seconds
+
+CHANGES_PATH = CACHE_DIR / 'schedule_changes.arrow'
+
+# A session is identified by these columns plus its occurrence number among sessions
+# sharing them (in start order), since a few urls repeat and some are missing
+SESSION_KEY = ['discipline', 'event', 'phase', 'url']
+# The preliminary schedule only lists sport-level sessions, so comparing it with the
+# final schedule aligns the sessions of each discipline by start order instead
+COARSE_KEY = ['discipline']
+
+_MULTIPLIER = np.uint64(1_000_003)
+
+CHANGE_TYPES = ['added', 'cancelled', 'moved', 're-venued']
+CHANGE_COLUMNS = SESSION_KEY + ['change', 'old_start', 'new_start', 'old_venue', 'new_venue']
+
+
+def normalize_schedule(df):
+    """schedules.csv snapshot -> canonical session frame sorted by start"""
+    sessions = pd.DataFrame({
+        'discipline': df['discipline_code'],
+        'event': df['event'],
+        'phase': df['phase'],
+        'url': df['url'],
+        'start': to_utc_seconds(df['start_date']),
+        'end': to_utc_seconds(df['end_date']),
+        'venue_code': df['venue_code'],
+        'cancelled': (df['status'] == 'CANCELLED').to_numpy(),
+    })
+    return sessions.sort_values('start', kind='stable').reset_index(drop=True)
+
+
+def normalize_preliminary(df):
+    """schedules_preliminary.csv snapshot -> the same canonical frame
+
+    It has no event / phase / url, so the matchup (team sports) and the
+    description stand in for them.
+    """
+    matchup = (df['team_1_code'].fillna('') + ' - ' + df['team_2_code'].fillna('')).where(df['team_1_code'].notna())
+    sessions = pd.DataFrame({
+        'discipline': df['sport_code'],
+        'event': matchup,
+        'phase': df['description'],
+        'url': df['sport_url'],
+        'start': to_utc_seconds(df['date_start_utc']),
+        'end': to_utc_seconds(df['date_end_utc']),
+        'venue_code': df['venue_code'],
+        'cancelled': np.zeros(len(df), dtype=bool),
+    })
+    return sessions.sort_values('start', kind='stable').reset_index(drop=True)
+
+
+def read_snapshot(path):
+    """Load and normalize a schedule snapshot of either layout"""
+    df = pd.read_csv(path)
+    return normalize_preliminary(df) if 'date_start_utc' in df.columns else normalize_schedule(df)
+
+
+def session_hashes(sessions, keys=SESSION_KEY):
+    """uint64 identity of every session: hash of its key columns and occurrence number"""
+    combined = np.zeros(len(sessions), dtype=np.uint64)
+    for name in keys:
+        values = sessions[name].to_numpy(dtype=object)
+        combined = combined * _MULTIPLIER ^ pd.util.hash_array(np.where(pd.isna(values), '', values))
+    # Occurrence number among sessions with the same key (frames are in start order)
+    order = np.argsort(combined, kind='stable')
+    ranked = combined[order]
+    first = np.r_[True, ranked[1:] != ranked[:-1]]
+    positions = np.arange(len(order))
+    occurrence = np.empty(len(order), dtype=np.uint64)
+    occurrence[order] = positions - np.maximum.accumulate(np.where(first, positions, 0))
+    return combined * _MULTIPLIER ^ pd.util.hash_array(occurrence)
+
+
+def diff(old, new, keys=SESSION_KEY, old_hash=None, new_hash=None):
+    """Change log between two normalized snapshots
+
+    One row per change: 'added', 'cancelled' (dropped, or newly flagged
+    CANCELLED), 'moved' (start or end changed) and 're-venued'. A session
+    that moved to another venue gets both a 'moved' and a 're-venued' row.
+    Precomputed session_hashes can be passed in when diffing many snapshots.
+    """
+    old_hash = session_hashes(old, keys) if old_hash is None else old_hash
+    new_hash = session_hashes(new, keys) if new_hash is None else new_hash
+    _, old_pos, new_pos = np.intersect1d(old_hash, new_hash, assume_unique=True, return_indices=True)
+    dropped = np.setdiff1d(np.arange(len(old)), old_pos)
+    added = np.setdiff1d(np.arange(len(new)), new_pos)
+
+    def column(frame, name, positions):
+        return frame[name].to_numpy()[positions]
+
+    moved = (column(old, 'start', old_pos) != column(new, 'start', new_pos)) | (
+        column(old, 'end', old_pos) != column(new, 'end', new_pos))
+    revenued = column(old, 'venue_code', old_pos).astype(str) != column(new, 'venue_code', new_pos).astype(str)
+    newly_cancelled = column(new, 'cancelled', new_pos) & ~column(old, 'cancelled', old_pos)
+
+    # One (old position, new position) pair per change; -1 where the session is absent
+    old_rows = np.concatenate([np.full(len(added), -1), dropped, old_pos[newly_cancelled], old_pos[moved], old_pos[revenued]])
+    new_rows = np.concatenate([added, np.full(len(dropped), -1), new_pos[newly_cancelled], new_pos[moved], new_pos[revenued]])
+    codes = np.repeat([0, 1, 1, 2, 3], [len(added), len(dropped), newly_cancelled.sum(), moved.sum(), revenued.sum()])
+
+    def take(frame, name, rows, fill):
+        values = frame[name].to_numpy()
+        present = rows >= 0
+        out = np.full(len(rows), fill, dtype=values.dtype if fill == -1 else object)
+        out[present] = values[rows[present]]
+        return out
+
+    changes = {}
+    for name in SESSION_KEY:
+        changes[name] = np.where(new_rows >= 0, take(new, name, new_rows, None), take(old, name, old_rows, None))
+    changes['change'] = pd.Categorical.from_codes(codes, CHANGE_TYPES)
+    changes['old_start'] = take(old, 'start', old_rows, -1)
+    changes['new_start'] = take(new, 'start', new_rows, -1)
+    changes['old_venue'] = take(old, 'venue_code', old_rows, None)
+    changes['new_venue'] = take(new, 'venue_code', new_rows, None)
+    return pd.DataFrame(changes, columns=CHANGE_COLUMNS)
+
+
+def diff_series(snapshots, keys=SESSION_KEY):
+    """Diff consecutive snapshots (paths, oldest first); each file is parsed and hashed once"""
+    frames = []
+    previous = previous_hash = None
+    for path in snapshots:
+        current = read_snapshot(path)
+        current_hash = session_hashes(current, keys)
+        if previous is not None:
+            changes = diff(previous, current, keys, previous_hash, current_hash)
+            changes.insert(0, 'snapshot', Path(path).name)
+            frames.append(changes)
+        previous, previous_hash = current, current_hash
+    if not frames:
+        return pd.DataFrame(columns=['snapshot'] + CHANGE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def save_changes(changes, path=CHANGES_PATH):
+    """Write the change log as a compact Arrow file (strings dictionary-encoded)"""
+    changes = changes.copy()
+    for name in changes.columns:
+        if changes[name].dtype == object:
+            changes[name] = changes[name].astype('category')
+    table = pa.Table.from_pandas(changes, preserve_index=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, lambda p: feather.write_feather(table, p))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Change log between schedule snapshots")
+    parser.add_argument('snapshots', nargs='*', type=Path,
+                        help="snapshot CSVs, oldest first (default: preliminary vs final schedule)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.snapshots:
+        changes = diff_series(args.snapshots)
+    else:
+        changes = diff_series([SOURCES['schedules_preliminary'], SOURCES['schedules']], keys=COARSE_KEY)
+    save_changes(changes)
+    print(changes['change'].value_counts().to_string())
+    print(f"{len(changes):,} change(s) written to {CHANGES_PATH} in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,223 @@
+import pandas as pd
+
+# Column dtypes per source table. Specs:
+#   'category'          categorical with its own dictionary
+#   'dict:<name>'       categorical over a dictionary shared by every table (see SHARED_DICTIONARIES)
+#   'date'              naive datetime64 (YYYY-MM-DD style columns)
+#   'timestamp'         tz-aware ISO timestamps, normalized to UTC
+#   'Int8' / 'Int16'    nullable small integers (float columns that only hold whole numbers)
+#   'bool'
+SCHEMAS = {
+    'medallists': {
+        'medal_date': 'date',
+        'medal_type': 'category',
+        'medal_code': 'Int8',
+        'gender': 'category',
+        'country_code': 'dict:country_code',
+        'country': 'dict:country',
+        'country_long': 'category',
+        'nationality_code': 'dict:country_code',
+        'nationality': 'dict:country',
+        'nationality_long': 'category',
+        'team_gender': 'category',
+        'discipline': 'dict:discipline',
+        'event': 'dict:event',
+        'event_type': 'category',
+        'birth_date': 'date',
+        'is_medallist': 'bool',
+    },
+    'medals': {
+        'medal_type': 'category',
+        'medal_code': 'Int8',
+        'medal_date': 'date',
+        'gender': 'category',
+        'discipline': 'dict:discipline',
+        'event': 'dict:event',
+        'event_type': 'category',
+        'country_code': 'dict:country_code',
+        'country': 'dict:country',
+        'country_long': 'category',
+    },
+    'athletes': {
+        'gender': 'category',
+        'function': 'category',
+        'country_code': 'dict:country_code',
+        'country': 'dict:country',
+        'nationality_code': 'dict:country_code',
+        'nationality': 'dict:country',
+        'birth_date': 'date',
+    },
+    'teams': {
+        'team_gender': 'category',
+        'country_code': 'dict:country_code',
+        'country': 'dict:country',
+        'country_long': 'category',
+        'discipline': 'dict:discipline',
+        'disciplines_code': 'category',
+        'events': 'dict:event',
+        'num_athletes': 'Int16',
+        'num_coaches': 'Int16',
+    },
+    'events': {
+        'event': 'dict:event',
+        'sport': 'dict:discipline',
+        'sport_code': 'category',
+    },
+    'schedules': {
+        'start_date': 'timestamp',
+        'end_date': 'timestamp',
+        'day': 'date',
+        'status': 'category',
+        'discipline': 'dict:discipline',
+        'discipline_code': 'category',
+        'event': 'dict:event',
+        'event_medal': 'Int8',
+        'gender': 'category',
+        'event_type': 'category',
+        'venue': 'category',
+        'venue_code': 'category',
+        'location_code': 'category',
+    },
+    'schedules_preliminary': {
+        'date_start_utc': 'timestamp',
+        'date_end_utc': 'timestamp',
+        'venue_code': 'category',
+        'sport': 'dict:discipline',
+        'sport_code': 'category',
+    },
+    # Shared by every results/<Discipline>.csv file
+    'results': {
+        'date': 'timestamp',
+        'event_code': 'category',
+        'event_name': 'category',
+        'stage': 'category',
+        'gender': 'category',
+        'discipline_name': 'dict:discipline',
+        'discipline_code': 'category',
+        'venue': 'category',
+        'participant_type': 'category',
+        'participant_country_code': 'dict:country_code',
+        'participant_country': 'dict:country',
+        'rank': 'Int16',
+        'result_type': 'category',
+        'result_IRM': 'category',
+        'result_WLT': 'category',
+        'qualification_mark': 'category',
+        'start_order': 'Int16',
+    },
+}
+
+# Shared dictionaries, seeded from the reference tables and extended (append-only) with any
+# new values seen at load time, so the category codes of a value never change once assigned.
+SHARED_DICTIONARIES = {
+    'country': [],
+    'country_code': [],
+    'discipline': [],
+    'event': [],
+}
+
+# One dtype object per dictionary, so frames typed against it share the same categories Index
+_shared_dtypes = {}
+_seeded = False
+
+
+def _seed_dictionaries():
+    global _seeded
+    if _seeded:
+        return
+    _seeded = True
+    # Read the reference CSVs directly: they go through the schema themselves when cached
+    from data_store import SOURCES
+    if SOURCES['nocs'].exists():
+        nocs = pd.read_csv(SOURCES['nocs'], usecols=['code', 'country'])
+        extend_dictionary('country_code', nocs['code'])
+        extend_dictionary('country', nocs['country'])
+    if SOURCES['events'].exists():
+        events = pd.read_csv(SOURCES['events'], usecols=['event', 'sport'])
+        extend_dictionary('discipline', events['sport'])
+        extend_dictionary('event', events['event'])
+
+
+def extend_dictionary(name, values):
+    """Append unseen values to a shared dictionary and return its current categorical dtype"""
+    categories = SHARED_DICTIONARIES[name]
+    known = set(categories)
+    new_values = sorted({v for v in pd.unique(pd.Series(values).dropna()) if v not in known})
+    if new_values or name not in _shared_dtypes:
+        categories.extend(new_values)
+        _shared_dtypes[name] = pd.CategoricalDtype(categories=list(categories))
+    return _shared_dtypes[name]
+
+
+def _convert(series, spec):
+    if spec == 'category':
+        return series.astype('category')
+    if spec.startswith('dict:'):
+        return series.astype(extend_dictionary(spec[len('dict:'):], series))
+    if spec == 'date':
+        return pd.to_datetime(series, errors='coerce')
+    if spec == 'timestamp':
+        return pd.to_datetime(series, errors='coerce', utc=True, format='ISO8601')
+    if spec == 'bool':
+        return series.astype('boolean')
+    # Nullable integers; values with a fractional part would raise, so coerce through numeric first
+    return pd.to_numeric(series, errors='coerce').astype(spec)
+
+
+def schema_for(name):
+    if name in SCHEMAS:
+        return SCHEMAS[name]
+    if name.startswith('results/'):
+        return SCHEMAS['results']
+    return {}
+
+
+def apply_schema(name, df):
+    """Convert the columns of a freshly parsed source table to their registered dtypes"""
+    schema = schema_for(name)
+    if not schema:
+        return df
+    _seed_dictionaries()
+    df = df.copy(deep=False)
+    for column, spec in schema.items():
+        if column in df.columns:
+            df[column] = _convert(df[column], spec)
+    return df
+
+
+def share_dictionaries(name, df):
+    """Re-point 'dict:' columns of a cached frame at the process-wide shared dtypes"""
+    schema = schema_for(name)
+    shared = {c: spec[len('dict:'):] for c, spec in schema.items() if spec.startswith('dict:') and c in df.columns}
+    if not shared:
+        return df
+    _seed_dictionaries()
+    for column, dictionary in shared.items():
+        df[column] = df[column].astype(extend_dictionary(dictionary, df[column]))
+    return df
+
+
+def memory_report(names=None):
+    """Per-table memory before (raw read_csv) and after (typed) the schema is applied"""
+    from data_store import SOURCES, read_source
+
+    rows = []
+    for name in names or [n for n in SCHEMAS if n in SOURCES]:
+        if not SOURCES[name].exists():
+            continue
+        raw = read_source(name)
+        typed = apply_schema(name, raw)
+        before = raw.memory_usage(deep=True).sum()
+        after = typed.memory_usage(deep=True).sum()
+        rows.append({
+            'table': name,
+            'rows': len(raw),
+            'before_kb': round(before / 1024, 1),
+            'after_kb': round(after / 1024, 1),
+            'saved_pct': round((1 - after / before) * 100, 1) if before else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    print(memory_report().to_string(index=False))
@@ -0,0 +1,134 @@
+import argparse
+import re
+import sqlite3
+import time
+
+import pandas as pd
+
+from data_store import ANALYSIS_DIR, EXPORTED_DIR, SOURCES, build_table, read_source, write_atomic
+
+SQL_FILE = ANALYSIS_DIR / 'Paris 2024 Summer Olympic Games Data analysis.sql'
+
+# Query titles in the .sql file that differ from the Exported Data file name
+EXPORT_NAMES = {
+    'Analyzing Medal Trends Over Time': 'Medal Trends Over Time',
+}
+
+# Exports whose queries join teams to medallists on (country, discipline), which counts a medal
+# once per team of that pair; attribution.py builds them per team instead, and every refresh uses it
+ATTRIBUTED_EXPORTS = ['Team Performance', 'Medal Conversion Efficiency']
+
+# MySQL-only expressions used by the analyses -> SQLite equivalents
+_BIRTH_YEAR = (
+    "CAST(CASE WHEN birth_date LIKE '____-__-__' THEN substr(birth_date, 1, 4) "
+    "ELSE substr(birth_date, 7, 4) END AS INTEGER)"
+)
+MYSQL_TO_SQLITE = [
+    (re.compile(r"YEAR\(\s*CURDATE\(\)\s*\)", re.I), "CAST(strftime('%Y', 'now') AS INTEGER)"),
+    # medallists.csv now stores ISO dates; older exports used dd-mm-yyyy, so accept both
+    (re.compile(r"YEAR\(\s*STR_TO_DATE\(\s*birth_date\s*,\s*'%d-%m-%Y'\s*\)\s*\)", re.I), _BIRTH_YEAR),
+]
+
+# Speeds up the (country_code, discipline) joins between teams and medallists
+INDEXES = {
+    'medallists': [('country_code', 'discipline'), ('country',), ('discipline',)],
+    'teams': [('country_code', 'discipline')],
+}
+
+
+def parse_sql_file(path=SQL_FILE):
+    """Split the analysis .sql file into {export name: SELECT statement}"""
+    queries = {}
+    title = None
+    statement = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        stripped = line.strip()
+        if not statement and stripped.startswith('--'):
+            # First comment line above a query is its title, e.g. '-- 4. Dominance in a Specific Event'
+            text = stripped.lstrip('-').strip()
+            if title is None and text and not text.lower().startswith('advance'):
+                title = re.sub(r'^\d+\.\s*', '', text).rstrip(':').strip()
+            continue
+        if not stripped and not statement:
+            continue
+        statement.append(line)
+        if stripped.endswith(';'):
+            sql = '\n'.join(statement).strip().rstrip(';')
+            if sql.lower().startswith('select') and title:
+                queries[EXPORT_NAMES.get(title, title)] = sql
+            title = None
+            statement = []
+    return queries
+
+
+def to_sqlite(sql):
+    for pattern, replacement in MYSQL_TO_SQLITE:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def referenced_tables(sql):
+    return sorted({name for name in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)', sql, re.I) if name in SOURCES})
+
+
+def connect(tables):
+    """In-memory SQLite database with the raw CSV tables loaded once"""
+    connection = sqlite3.connect(':memory:')
+    for table in tables:
+        # Raw CSV values (not the typed cache) so dates keep the text format the queries expect
+        read_source(table).to_sql(table, connection, index=False)
+        for columns in INDEXES.get(table, []):
+            connection.execute(
+                f"CREATE INDEX idx_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
+            )
+    return connection
+
+
+def run_queries(names=None, queries=None):
+    """Execute the analysis queries and return {export name: DataFrame}
+
+    ATTRIBUTED_EXPORTS are taken from attribution.build_team_aggregates
+    instead of their SQL.
+    """
+    queries = queries or parse_sql_file()
+    if names:
+        queries = {name: queries[name] for name in names}
+    sql_queries = {name: sql for name, sql in queries.items() if name not in ATTRIBUTED_EXPORTS}
+    results = {}
+    if sql_queries:
+        tables = sorted({table for sql in sql_queries.values() for table in referenced_tables(sql)})
+        connection = connect(tables)
+        try:
+            results = {name: pd.read_sql_query(to_sqlite(sql), connection) for name, sql in sql_queries.items()}
+        finally:
+            connection.close()
+    if len(sql_queries) < len(queries):
+        from attribution import build_team_aggregates  # attribution imports export() from this module
+
+        results.update(build_team_aggregates())
+    return {name: results[name] for name in queries}
+
+
+def export(results, export_dir=EXPORTED_DIR):
+    """Write each result to Exported Data/<name>.csv atomically and refresh its columnar cache"""
+    for name, df in results.items():
+        path = export_dir / f'{name}.csv'
+        write_atomic(path, lambda p: df.to_csv(p, index=False))
+        SOURCES[name] = path
+        build_table(name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the Paris 2024 SQL analyses on the bundled CSVs")
+    parser.add_argument('names', nargs='*', help="export names to refresh (default: all)")
+    parser.add_argument('--dry-run', action='store_true', help="run the queries without writing the exports")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run_queries(args.names or None)
+    if not args.dry_run:
+        export(results)
+    elapsed = time.perf_counter() - started
+    for name, df in results.items():
+        print(f"{name}: {len(df):,} rows")
+    print(f"{'Ran' if args.dry_run else 'Refreshed'} {len(results)} export(s) in {elapsed:.2f}s")
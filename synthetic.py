@@ -0,0 +1,505 @@
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_store import BASE_DIR, EXPORTED_DIR, SOURCES, read_source
+from results import RESULT_COLUMNS, discover_result_files
+
+# Column order of the real files, so loaders and schemas see the same layout
+MEDALLIST_COLUMNS = [
+    'medal_date', 'medal_type', 'medal_code', 'name', 'gender', 'country_code', 'country', 'country_long',
+    'nationality_code', 'nationality', 'nationality_long', 'team', 'team_gender', 'discipline', 'event',
+    'event_type', 'url_event', 'birth_date', 'code_athlete', 'code_team', 'is_medallist',
+]
+ATHLETE_COLUMNS = [
+    'code', 'current', 'name', 'name_short', 'name_tv', 'gender', 'function', 'country_code', 'country',
+    'country_long', 'nationality', 'nationality_long', 'nationality_code', 'height', 'weight', 'disciplines',
+    'events', 'birth_date',
+]
+TEAM_COLUMNS = [
+    'code', 'current', 'team', 'team_gender', 'country_code', 'country', 'country_long', 'discipline',
+    'disciplines_code', 'events', 'athletes', 'coaches', 'athletes_codes', 'num_athletes', 'coaches_codes',
+    'num_coaches',
+]
+SCHEDULE_COLUMNS = [
+    'start_date', 'end_date', 'day', 'status', 'discipline', 'discipline_code', 'event', 'event_medal', 'phase',
+    'gender', 'event_type', 'venue', 'venue_code', 'location_description', 'location_code', 'url',
+]
+MEDAL_COLUMNS = [
+    'medal_type', 'medal_code', 'medal_date', 'name', 'gender', 'discipline', 'event', 'event_type', 'url_event',
+    'code', 'country_code', 'country', 'country_long',
+]
+HISTORY_COLUMNS = ['player_id', 'Name', 'Sex', 'Team', 'NOC', 'Year', 'Season', 'City', 'Sport', 'Event', 'Medal']
+
+# Summer Games held since 1896 (none in 1916, 1940, 1944)
+SUMMER_GAMES = {
+    1896: 'Athina', 1900: 'Paris', 1904: 'St. Louis', 1908: 'London', 1912: 'Stockholm', 1920: 'Antwerpen',
+    1924: 'Paris', 1928: 'Amsterdam', 1932: 'Los Angeles', 1936: 'Berlin', 1948: 'London', 1952: 'Helsinki',
+    1956: 'Melbourne', 1960: 'Roma', 1964: 'Tokyo', 1968: 'Mexico City', 1972: 'Munich', 1976: 'Montreal',
+    1980: 'Moskva', 1984: 'Los Angeles', 1988: 'Seoul', 1992: 'Barcelona', 1996: 'Atlanta', 2000: 'Sydney',
+    2004: 'Athina', 2008: 'Beijing', 2012: 'London', 2016: 'Rio de Janeiro', 2020: 'Tokyo', 2024: 'Paris',
+}
+TEAM_EVENT_TYPES = {'TEAM', 'HTEAM', 'COUP', 'HCOUP'}
+MEDAL_NAMES = np.array(['Gold Medal', 'Silver Medal', 'Bronze Medal'], dtype=object)
+HISTORY_MEDALS = np.array(['Gold', 'Silver', 'Bronze', 'No medal'], dtype=object)
+# Keep each generated batch around this many participants so memory stays flat at any scale
+BATCH_PARTICIPANTS = 200_000
+LOCAL_OFFSET = '+02:00'
+
+
+def _slug(values):
+    return pd.Series(values).str.lower().str.replace(r"[^a-z0-9]+", '-', regex=True).str.strip('-')
+
+
+def _list_literal(groups):
+    # Same repr as the real files, including "D'ALMEIDA" style double quotes
+    return groups.agg(list).map(repr)
+
+
+class Profile:
+    """Distributions learned once from the bundled tables
+
+    Cardinalities (NOCs, events, venues) come from the reference tables and
+    the skew (medals per NOC, field sizes, session hours, ages, result
+    values) is resampled from the Paris 2024 data.
+    """
+
+    def __init__(self):
+        medallists = read_source('medallists')
+        events = read_source('events')
+        nocs = read_source('nocs')
+        schedules = read_source('schedules')
+        results = pd.concat(
+            [pd.read_csv(path, usecols=lambda c: c in RESULT_COLUMNS) for path in discover_result_files().values()],
+            ignore_index=True,
+        )
+
+        # NOCs: medal weight with smoothing so every NOC can appear; participation is flatter
+        self.nocs = nocs[['code', 'country', 'country_long']].drop_duplicates('code').reset_index(drop=True)
+        medals = medallists['country_code'].value_counts().reindex(self.nocs['code'], fill_value=0).to_numpy()
+        self.medal_strength = np.log(medals + 0.5)
+        participation = np.sqrt(medals + 1.0)
+        self.participation = participation / participation.sum()
+
+        # Events and their shape
+        self.events = events[['event', 'sport', 'sport_code']].reset_index(drop=True)
+        keys = pd.MultiIndex.from_frame(self.events[['sport', 'event']])
+        event_types = medallists.groupby(['discipline', 'event'])['event_type'].agg(lambda s: s.mode().iat[0])
+        fallback = schedules.groupby(['discipline', 'event'])['event_type'].agg(
+            lambda s: s.mode().iat[0] if s.notna().any() else 'ATH')
+        self.event_type = event_types.reindex(keys).fillna(fallback.reindex(keys)).fillna('ATH').to_numpy()
+        team_sizes = medallists.dropna(subset=['code_team']).groupby(['discipline', 'event', 'code_team']).size()
+        team_sizes = team_sizes.groupby(['discipline', 'event']).median().reindex(keys).to_numpy()
+        is_team = np.isin(self.event_type, list(TEAM_EVENT_TYPES))
+        self.team_size = np.where(is_team, np.nan_to_num(team_sizes, nan=2), 1).astype(np.int64)
+        fields = results.groupby(['discipline_name', 'event_name'])['participant_code'].nunique()
+        self.field_size = fields.reindex(keys).fillna(16).clip(4, 120).to_numpy(dtype=np.int64)
+        gender = self.events['event'].str.extract(r"^(Men|Women)", expand=False).map({'Men': 'M', 'Women': 'W'})
+        self.event_gender = gender.fillna('X').to_numpy()
+        self.sport_slug = _slug(self.events['sport']).to_numpy()
+        self.event_slug = _slug(self.events['event']).to_numpy()
+
+        # Per discipline: stages in running order, result values, session hours / lengths / venues
+        results['date'] = pd.to_datetime(results['date'], errors='coerce', utc=True)
+        self.stages = {}
+        self.result_pool = {}
+        for sport, group in results.groupby('discipline_name'):
+            order = group.groupby('stage')['date'].median().sort_values()
+            self.stages[sport] = order.index[-4:].tolist() or ['Final']
+            pool = group[['result', 'result_type', 'result_IRM', 'result_WLT']].reindex(
+                columns=['result', 'result_type', 'result_IRM', 'result_WLT'])
+            self.result_pool[sport] = pool.reset_index(drop=True)
+
+        start = pd.to_datetime(schedules['start_date'], utc=True).dt.tz_convert('Europe/Paris')
+        end = pd.to_datetime(schedules['end_date'], utc=True).dt.tz_convert('Europe/Paris')
+        sessions = schedules.assign(
+            minute=start.dt.hour * 60 + start.dt.minute,
+            length=((end - start).dt.total_seconds() // 60).fillna(60).clip(15, 600),
+        )
+        self.session_pool = {
+            sport: group[['minute', 'length', 'venue', 'venue_code', 'location_description', 'location_code']]
+            .reset_index(drop=True)
+            for sport, group in sessions.groupby('discipline')
+        }
+        self.default_sessions = sessions[['minute', 'length', 'venue', 'venue_code', 'location_description',
+                                          'location_code']].reset_index(drop=True)
+
+        # People
+        births = pd.to_datetime(medallists['birth_date'], errors='coerce')
+        ages = 2024 - births.dt.year
+        stats = ages.groupby(medallists['discipline']).agg(['mean', 'std'])
+        self.age_mean = stats['mean'].reindex(self.events['sport']).fillna(26).to_numpy()
+        self.age_std = stats['std'].reindex(self.events['sport']).fillna(4.5).clip(2, 10).to_numpy()
+        names = medallists['name'].dropna().str.extract(r"^((?:[A-Z'\-]{2,}\s?)+)\s+(.+)$").dropna()
+        self.surnames = names[0].str.strip().unique()
+        given = names[1].groupby(medallists.loc[names.index, 'gender']).unique()
+        self.given = {'Male': given.get('Male', np.array(['Alex'])), 'Female': given.get('Female', np.array(['Sam']))}
+
+
+class CsvSink:
+    """Appends frames to CSVs under a root folder, writing each header once"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.rows = {}
+
+    def write(self, relative, df, columns):
+        path = self.root / relative
+        first = relative not in self.rows
+        if first:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        df.reindex(columns=columns).to_csv(path, mode='w' if first else 'a', header=first, index=False)
+        self.rows[relative] = self.rows.get(relative, 0) + len(df)
+
+
+def _participants(profile, event_index, replicas, rng, field_scale=1.0):
+    """One row per competitor (athlete or team) of every event instance, with its final rank"""
+    events = np.tile(event_index, replicas)
+    sizes = np.maximum(np.round(profile.field_size[events] * field_scale).astype(np.int64), 3)
+    instance = np.repeat(np.arange(len(events)), sizes)
+    event = events[instance]
+    noc = rng.choice(len(profile.nocs), size=len(instance), p=profile.participation)
+    # Strong NOCs finish higher: rank by medal strength plus Gumbel noise within each instance
+    score = profile.medal_strength[noc] + rng.gumbel(size=len(instance)) * 1.5
+    order = np.lexsort((-score, instance))
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    rank = np.empty(len(instance), dtype=np.int64)
+    rank[order] = np.arange(len(instance)) - np.repeat(starts, sizes)
+    return pd.DataFrame({
+        'instance': instance, 'event': event, 'noc': noc, 'rank': rank + 1,
+        'size': profile.team_size[event],
+    })
+
+
+def _people(profile, participants, year, first_code, rng):
+    """Expand competitors into athletes (team members get one row each)"""
+    member_of = np.repeat(np.arange(len(participants)), participants['size'].to_numpy())
+    event = participants['event'].to_numpy()[member_of]
+    event_gender = profile.event_gender[event]
+    male = np.where(event_gender == 'M', True, np.where(event_gender == 'W', False, rng.random(len(member_of)) < 0.5))
+    gender = np.where(male, 'Male', 'Female')
+    given = np.where(
+        male,
+        rng.choice(profile.given['Male'], size=len(member_of)),
+        rng.choice(profile.given['Female'], size=len(member_of)),
+    )
+    name = pd.Series(rng.choice(profile.surnames, size=len(member_of))).str.cat(pd.Series(given), sep=' ')
+    age = np.clip(rng.normal(profile.age_mean[event], profile.age_std[event]), 14, 70)
+    birth = pd.Timestamp(f'{year}-07-26') - pd.to_timedelta(age * 365.25, unit='D')
+    height = np.round(rng.normal(np.where(male, 180, 168), 9))
+    return pd.DataFrame({
+        'participant': member_of,
+        'code': first_code + np.arange(len(member_of)),
+        'name': name.to_numpy(),
+        'gender': gender,
+        'birth_date': birth.strftime('%Y-%m-%d'),
+        'height': height,
+        'weight': np.round(rng.normal(height - 105, 9)),
+    })
+
+
+def _sessions(profile, participants, year, rng):
+    """One schedule session per (event instance, stage), final stage last"""
+    instance_events = participants.groupby('instance')['event'].first()
+    events = instance_events.to_numpy()
+    opening = pd.Timestamp(f'{year}-07-27')
+    frames = []
+    for sport, group in pd.Series(events).groupby(profile.events['sport'].to_numpy()[events]):
+        stages = profile.stages.get(sport, ['Final'])
+        pool = profile.session_pool.get(sport, profile.default_sessions)
+        n = len(group) * len(stages)
+        instance = np.repeat(instance_events.index.to_numpy()[group.index], len(stages))
+        stage_number = np.tile(np.arange(len(stages)), len(group))
+        final_day = np.repeat(rng.integers(len(stages), 17, size=len(group)), len(stages))
+        picks = pool.iloc[rng.integers(0, len(pool), size=n)].reset_index(drop=True)
+        day = opening + pd.to_timedelta(final_day - (len(stages) - 1 - stage_number), unit='D')
+        start = day + pd.to_timedelta(picks['minute'].to_numpy(), unit='m')
+        frames.append(picks.assign(
+            instance=instance, stage_number=stage_number, stages=len(stages),
+            stage=np.array(stages, dtype=object)[stage_number],
+            start=start, end=start + pd.to_timedelta(picks['length'].to_numpy(), unit='m'),
+        ))
+    return pd.concat(frames, ignore_index=True)
+
+
+def generate_games(profile, sink, year, replicas, first_code, rng):
+    """Paris-format tables for one edition: athletes, teams, medallists, schedules, results"""
+    participants = _participants(profile, np.arange(len(profile.events)), replicas, rng)
+    people = _people(profile, participants, year, first_code, rng)
+    nocs = profile.nocs
+    events = profile.events
+    p_event = participants['event'].to_numpy()
+    p_noc = participants['noc'].to_numpy()
+
+    # Teams: code like the real ones, e.g. FBLMTEAM18--BRA + a unique number
+    is_team = participants['size'].to_numpy() > 1
+    team_codes = np.where(
+        is_team,
+        pd.Series(events['sport_code'].to_numpy()[p_event]) + profile.event_gender[p_event] + 'TEAM'
+        + participants['size'].astype(str).to_numpy() + '--' + nocs['code'].to_numpy()[p_noc]
+        + pd.Series(first_code + np.arange(len(participants))).astype(str).to_numpy(),
+        None,
+    )
+    members = people[is_team[people['participant'].to_numpy()]]
+    members = members.assign(code=members['code'].astype(str))
+    rosters = members.groupby('participant')
+    teams = pd.DataFrame({
+        'code': team_codes[rosters.size().index],
+        'athletes': _list_literal(rosters['name']).to_numpy(),
+        'athletes_codes': _list_literal(rosters['code']).to_numpy(),
+        'num_athletes': rosters.size().to_numpy(),
+    })
+    team_rows = rosters.size().index.to_numpy()
+    teams = teams.assign(
+        current=True,
+        team=nocs['country_long'].to_numpy()[p_noc[team_rows]],
+        team_gender=profile.event_gender[p_event[team_rows]],
+        country_code=nocs['code'].to_numpy()[p_noc[team_rows]],
+        country=nocs['country'].to_numpy()[p_noc[team_rows]],
+        country_long=nocs['country_long'].to_numpy()[p_noc[team_rows]],
+        discipline=events['sport'].to_numpy()[p_event[team_rows]],
+        disciplines_code=events['sport_code'].to_numpy()[p_event[team_rows]],
+        events=events['event'].to_numpy()[p_event[team_rows]],
+        num_coaches=0,
+    )
+    sink.write('teams.csv', teams, TEAM_COLUMNS)
+
+    who = people['participant'].to_numpy()
+    a_event, a_noc = p_event[who], p_noc[who]
+    athletes = people.assign(
+        current=True,
+        name_short=people['name'],
+        name_tv=people['name'],
+        function='Athlete',
+        country_code=nocs['code'].to_numpy()[a_noc],
+        country=nocs['country'].to_numpy()[a_noc],
+        country_long=nocs['country_long'].to_numpy()[a_noc],
+        nationality=nocs['country'].to_numpy()[a_noc],
+        nationality_long=nocs['country_long'].to_numpy()[a_noc],
+        nationality_code=nocs['code'].to_numpy()[a_noc],
+        disciplines="['" + events['sport'].to_numpy()[a_event] + "']",
+        events=pd.Series(events['event'].to_numpy()[a_event]).map(lambda e: repr([e])).to_numpy(),
+    )
+    sink.write('athletes.csv', athletes, ATHLETE_COLUMNS)
+
+    sessions = _sessions(profile, participants, year, rng)
+    sessions['event'] = participants.groupby('instance')['event'].first().reindex(sessions['instance']).to_numpy()
+    s_event = sessions['event'].to_numpy()
+    stage_slug = _slug(sessions['stage']).to_numpy()
+    sessions['url'] = (
+        '/en/paris-2024/results/' + profile.sport_slug[s_event] + '/' + profile.event_slug[s_event] + '/'
+        + stage_slug + '-' + pd.Series(sessions['instance']).map('{:06d}--'.format).to_numpy()
+    )
+    start_text = sessions['start'].dt.strftime('%Y-%m-%dT%H:%M:%S') + LOCAL_OFFSET
+    schedules = pd.DataFrame({
+        'start_date': start_text,
+        'end_date': sessions['end'].dt.strftime('%Y-%m-%dT%H:%M:%S') + LOCAL_OFFSET,
+        'day': sessions['start'].dt.strftime('%Y-%m-%d'),
+        'status': 'FINISHED',
+        'discipline': events['sport'].to_numpy()[s_event],
+        'discipline_code': events['sport_code'].to_numpy()[s_event],
+        'event': events['event'].to_numpy()[s_event],
+        'event_medal': (sessions['stage_number'] == sessions['stages'] - 1).astype(int),
+        'phase': events['event'].to_numpy()[s_event] + ' ' + sessions['stage'].astype(str),
+        'gender': profile.event_gender[s_event],
+        'event_type': profile.event_type[s_event],
+        'venue': sessions['venue'], 'venue_code': sessions['venue_code'],
+        'location_description': sessions['location_description'], 'location_code': sessions['location_code'],
+        'url': sessions['url'],
+    })
+    sink.write('schedules.csv', schedules, SCHEDULE_COLUMNS)
+
+    # Medallists: every member of the top three competitors of each instance
+    finals = sessions[sessions['stage_number'] == sessions['stages'] - 1].set_index('instance')
+    podium = participants.index[participants['rank'].to_numpy() <= 3]
+    winners = people[np.isin(who, podium)]
+    w = winners['participant'].to_numpy()
+    w_event, w_noc, w_rank = p_event[w], p_noc[w], participants['rank'].to_numpy()[w]
+    final = finals.reindex(participants['instance'].to_numpy()[w])
+    medallists = pd.DataFrame({
+        'medal_date': final['start'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'medal_type': MEDAL_NAMES[w_rank - 1],
+        'medal_code': w_rank.astype(float),
+        'name': winners['name'].to_numpy(),
+        'gender': winners['gender'].to_numpy(),
+        'country_code': nocs['code'].to_numpy()[w_noc],
+        'country': nocs['country'].to_numpy()[w_noc],
+        'country_long': nocs['country_long'].to_numpy()[w_noc],
+        'nationality_code': nocs['code'].to_numpy()[w_noc],
+        'nationality': nocs['country'].to_numpy()[w_noc],
+        'nationality_long': nocs['country_long'].to_numpy()[w_noc],
+        'team': np.where(is_team[w], nocs['country_long'].to_numpy()[w_noc], None),
+        'team_gender': np.where(is_team[w], profile.event_gender[w_event], None),
+        'discipline': events['sport'].to_numpy()[w_event],
+        'event': events['event'].to_numpy()[w_event],
+        'event_type': profile.event_type[w_event],
+        'url_event': final['url'].to_numpy(),
+        'birth_date': winners['birth_date'].to_numpy(),
+        'code_athlete': winners['code'].to_numpy(),
+        'code_team': team_codes[w],
+        'is_medallist': True,
+    })
+    sink.write('medallists.csv', medallists, MEDALLIST_COLUMNS)
+
+    # medals.csv: one row per medal, credited to the team for team events
+    medals = medallists.assign(
+        medal_code=w_rank,
+        code=np.where(is_team[w], team_codes[w], winners['code'].astype(str).to_numpy()),
+        name=np.where(is_team[w], medallists['country'], medallists['name']),
+        gender=np.where(is_team[w], profile.event_gender[w_event], medallists['gender'].str[0].replace('F', 'W')),
+    )
+    medals = medals[~pd.Series(w).duplicated().to_numpy()]
+    sink.write('medals.csv', medals, MEDAL_COLUMNS)
+
+    _write_results(profile, sink, participants, people, sessions, team_codes, rng)
+    return first_code + len(people) + len(participants)
+
+
+def _write_results(profile, sink, participants, people, sessions, team_codes, rng):
+    """results/<discipline>.csv: the best competitors of each instance advance stage by stage"""
+    nocs = profile.nocs
+    first_member = people.drop_duplicates('participant').set_index('participant')
+    instance = participants['instance'].to_numpy()
+    sizes = np.bincount(instance)
+    for sport, stage_sessions in sessions.groupby(profile.events['sport'].to_numpy()[sessions['event'].to_numpy()]):
+        # Stage k of n keeps the top max(8, field * (n - k) / n) competitors
+        keep = np.maximum(8, sizes[stage_sessions['instance'].to_numpy()] * (
+            stage_sessions['stages'] - stage_sessions['stage_number']).to_numpy() // stage_sessions['stages'].to_numpy())
+        rows = participants.reset_index().merge(
+            stage_sessions.assign(keep=keep)[['instance', 'stage', 'start', 'url', 'keep', 'venue']], on='instance'
+        )
+        rows = rows[rows['rank'] <= rows['keep']]
+        if rows.empty:
+            continue
+        pool = profile.result_pool.get(sport)
+        picks = pool.iloc[rng.integers(0, len(pool), size=len(rows))].reset_index(drop=True) if pool is not None \
+            else pd.DataFrame({'result': rng.integers(0, 100, size=len(rows)), 'result_type': 'POINTS'})
+        p = rows['index'].to_numpy()
+        event = rows['event'].to_numpy()
+        noc = rows['noc'].to_numpy()
+        person = first_member.reindex(p)
+        team = team_codes[p]
+        event_code = profile.events['sport_code'].to_numpy()[event] + profile.event_gender[event] + pd.Series(
+            profile.event_slug[event]).str.upper().str.replace('-', '', regex=False).str[:8].to_numpy()
+        frame = pd.DataFrame({
+            'date': rows['start'].dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy() + LOCAL_OFFSET,
+            'stage_code': event_code + '--' + rows['url'].str.extract(r'/([^/]+)$', expand=False).to_numpy(),
+            'event_code': event_code,
+            'event_name': profile.events['event'].to_numpy()[event],
+            'event_stage': profile.events['event'].to_numpy()[event] + ' ' + rows['stage'].astype(str).to_numpy(),
+            'stage': rows['stage'].to_numpy(),
+            'gender': profile.event_gender[event],
+            'discipline_name': sport,
+            'discipline_code': profile.events['sport_code'].to_numpy()[event],
+            'venue': rows['venue'].to_numpy(),
+            'participant_code': np.where(team != None, team, person['code'].astype(str).to_numpy()),  # noqa: E711
+            'participant_name': np.where(team != None, nocs['country'].to_numpy()[noc], person['name'].to_numpy()),  # noqa: E711
+            'participant_type': np.where(team != None, 'Team', 'Person'),  # noqa: E711
+            'participant_country_code': nocs['code'].to_numpy()[noc],
+            'participant_country': nocs['country'].to_numpy()[noc],
+            'rank': rows['rank'].astype(float).to_numpy(),
+            'result': picks['result'].to_numpy(),
+            'result_type': picks['result_type'].to_numpy(),
+            'result_WLT': picks.get('result_WLT', pd.Series(index=picks.index, dtype=object)).to_numpy(),
+            'result_IRM': picks.get('result_IRM', pd.Series(index=picks.index, dtype=object)).to_numpy(),
+            'start_order': rng.integers(1, 40, size=len(rows)),
+        })
+        sink.write(f'results/{sport}.csv', frame, RESULT_COLUMNS)
+
+
+def generate_history(profile, sink, years, scale, first_code, rng):
+    """olympics_dataset_1896-2024.csv: one row per athlete entry, participation growing over time"""
+    for year in years:
+        era = (year - 1896) / (2024 - 1896)
+        held = np.flatnonzero(rng.random(len(profile.events)) < 0.25 + 0.75 * era)
+        participants = _participants(profile, held, scale, rng, field_scale=0.3 + 0.7 * era)
+        people = _people(profile, participants, year, first_code, rng)
+        first_code += len(people)
+        who = people['participant'].to_numpy()
+        event = participants['event'].to_numpy()[who]
+        noc = participants['noc'].to_numpy()[who]
+        rank = participants['rank'].to_numpy()[who]
+        history = pd.DataFrame({
+            'player_id': people['code'].to_numpy(),
+            'Name': people['name'].to_numpy(),
+            'Sex': np.where(people['gender'].to_numpy() == 'Male', 'M', 'F'),
+            'Team': profile.nocs['country'].to_numpy()[noc],
+            'NOC': profile.nocs['code'].to_numpy()[noc],
+            'Year': year,
+            'Season': 'Summer',
+            'City': SUMMER_GAMES[year],
+            'Sport': profile.events['sport'].to_numpy()[event],
+            'Event': profile.events['event'].to_numpy()[event],
+            'Medal': HISTORY_MEDALS[np.minimum(rank, 4) - 1],
+        })
+        sink.write(SOURCES['olympics_history'].name, history, HISTORY_COLUMNS)
+    return first_code
+
+
+def generate(root, scale=1, games=1, history_games=len(SUMMER_GAMES), seed=0, exports=False):
+    """Write a complete synthetic dataset laid out like the repo under `root`
+
+    `scale` multiplies every event's instances per Games; `games` editions of
+    the Paris-format tables are written (2024 and earlier Summer Games) and
+    `history_games` editions of the historical file. Work is batched so the
+    generator holds at most about BATCH_PARTICIPANTS competitors at a time.
+    """
+    root = Path(root)
+    profile = Profile()
+    sink = CsvSink(root)
+    rng = np.random.default_rng(seed)
+    years = sorted(SUMMER_GAMES)[::-1]
+
+    # Reference tables keep their real cardinalities
+    for name in ('nocs', 'events', 'venues', 'medals_total', 'schedules_preliminary'):
+        if SOURCES[name].exists():
+            root.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(SOURCES[name], root / SOURCES[name].name)
+
+    per_replica = int(profile.field_size.sum())
+    batch = max(1, BATCH_PARTICIPANTS // per_replica)
+    code = 1_000_000
+    for year in years[:games]:
+        for done in range(0, scale, batch):
+            code = generate_games(profile, sink, year, min(batch, scale - done), code, rng)
+
+    for block in range(0, scale, batch):
+        code = generate_history(profile, sink, sorted(years[:history_games]), min(batch, scale - block), code, rng)
+
+    if exports:
+        # Exported Data aggregates from the generated medallists, via the incremental refresher
+        exported = root / EXPORTED_DIR.relative_to(BASE_DIR)
+        exported.mkdir(parents=True, exist_ok=True)
+        env = dict(os.environ, OLYMPICS_DATA_DIR=str(root), OLYMPICS_CACHE_DIR=str(root / '.olympics_cache'))
+        subprocess.run([sys.executable, str(Path(__file__).with_name('incremental.py')), '--full'], env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        # Exports not derived from medallists (efficiency, team tables) are copied as-is
+        for source in EXPORTED_DIR.glob('*.csv'):
+            if not (exported / source.name).exists():
+                shutil.copy2(source, exported / source.name)
+    return sink.rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a schema-faithful synthetic Olympics dataset")
+    parser.add_argument('output', type=Path, help="folder to write the dataset to (repo layout)")
+    parser.add_argument('--scale', type=int, default=1, help="event instances per Games (1 = Paris 2024 size)")
+    parser.add_argument('--games', type=int, default=1, help="Paris-format editions to generate")
+    parser.add_argument('--history-games', type=int, default=len(SUMMER_GAMES), help="editions in the historical file")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--exports', action='store_true', help="also build the Exported Data aggregates")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = generate(args.output, args.scale, args.games, args.history_games, args.seed, args.exports)
+    for relative, rows in sorted(written.items()):
+        print(f"{relative}: {rows:,} rows")
+    print(f"Generated in {time.perf_counter() - started:.1f}s -> {args.output}")
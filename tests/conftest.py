@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The engines are root-level modules, not an installed package
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
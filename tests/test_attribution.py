@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from attribution import TeamAttribution, medal_conversion_efficiency, team_performance
+from rosters import build_team_members
+
+
+@pytest.fixture
+def attribution():
+    # Two French judo teams: the old (country, discipline) join counted each medal for both
+    teams = pd.DataFrame({
+        'code': ['JUDXTEAM6---FRA01', 'JUDMTEAM3---FRA01', 'JUDXTEAM6---JPN01'],
+        'team': ['France Mixed', 'France Men', 'Japan Mixed'],
+        'country': ['France', 'France', 'Japan'],
+        'events': ['Mixed Team', "Men's Team", 'Mixed Team'],
+        'athletes': ["['A', 'B']", "['A', 'C', 'D']", "['E', 'F']"],
+        'athletes_codes': ["['1', '2']", "['1', '3', '4']", "['5', '6']"],
+        'coaches': ["['K']", None, None],
+        'coaches_codes': ["['C1']", None, None],
+        'num_athletes': [2, 3, 2],
+    })
+    return TeamAttribution(teams, build_team_members(teams))
+
+
+def test_attribute_by_team_code_then_roster(attribution):
+    rows = attribution.attribute(
+        team_codes=['JUDXTEAM6---FRA01', None, None, None, 'UNKNOWN'],
+        athlete_codes=[1, 1, 3, 7, 5],
+        events=['Mixed Team', "Men's Team", 'Mixed Team', 'Men -60 kg', 'Mixed Team'],
+    )
+    # team code; roster (athlete 1 in the men's team event); athlete 3 is not on the mixed
+    # roster; an individual medal; an unknown team code falls back to athlete 5's roster
+    assert rows.tolist() == [0, 1, -1, -1, 2]
+    assert attribution.team_counts(rows).tolist() == [1, 1, 1]
+
+
+def test_team_performance_counts_each_medal_once(attribution):
+    medals = pd.DataFrame({
+        'code': ['JUDXTEAM6---FRA01', 'JUDXTEAM6---JPN01', '1'],
+        'event': ['Mixed Team', 'Mixed Team', 'Men -60 kg'],
+    })
+    result = team_performance(attribution, medals)
+    assert result.values.tolist() == [
+        ['France Mixed', 'France', 1],
+        ['Japan Mixed', 'Japan', 1],
+        ['France Men', 'France', 0],
+    ]
+
+
+def test_medal_conversion_efficiency(attribution):
+    medallists = pd.DataFrame({
+        'code_team': ['JUDXTEAM6---FRA01', 'JUDXTEAM6---FRA01', None, None],
+        'code_athlete': [1, 2, 3, 9],
+        'event': ['Mixed Team', 'Mixed Team', "Men's Team", 'Men -60 kg'],
+    })
+    result = medal_conversion_efficiency(attribution, medallists).set_index(['country', 'num_athletes'])
+    assert result.loc[('France', 2)].tolist() == [2, 100.0]
+    assert result.loc[('France', 3)].tolist() == [1, pytest.approx(33.3333)]
+    assert result.loc[('Japan', 2)].tolist() == [0, 0.0]
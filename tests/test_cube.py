@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import MedalCube
+
+DIMS = {'country': 'country_medallist', 'gender': 'gender_medallist', 'medal_type': 'medal_type', 'age': 'age'}
+
+
+@pytest.fixture(scope='module')
+def medallists():
+    rng = np.random.default_rng(7)
+    n = 500
+    df = pd.DataFrame({
+        'country_medallist': rng.choice(['France', 'Japan', 'USA', 'Kenya'], n),
+        'gender_medallist': rng.choice(['Male', 'Female'], n),
+        'medal_type': rng.choice(['Gold Medal', 'Silver Medal', 'Bronze Medal'], n),
+        'age': rng.integers(16, 40, n).astype(float),
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'age'] = np.nan
+    df.loc[rng.choice(n, 10, replace=False), 'country_medallist'] = None
+    return df
+
+
+def _groupby(df, dims, name='count'):
+    columns = [DIMS[dim] for dim in dims]
+    expected = df.groupby(columns).size().reset_index(name=name)
+    return expected.rename(columns={DIMS[dim]: dim for dim in dims})
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns[:-1])).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('dims', [['country'], ['gender', 'medal_type'], ['country', 'age'], ['age', 'gender', 'medal_type']])
+def test_rollup_matches_groupby(medallists, dims):
+    cube = MedalCube.from_frame(medallists, DIMS)
+    rolled = cube.rollup(dims)
+    expected = _groupby(medallists, dims)
+    pd.testing.assert_frame_equal(_sorted(rolled), _sorted(expected), check_dtype=False)
+
+
+def test_slice_matches_filtered_groupby(medallists):
+    cube = MedalCube.from_frame(medallists, DIMS)
+    sliced = cube.slice(gender=['Female'], medal_type=['Gold Medal', 'Bronze Medal', 'No such medal'], country=None)
+    filtered = medallists[
+        medallists['gender_medallist'].eq('Female') & medallists['medal_type'].isin(['Gold Medal', 'Bronze Medal'])
+    ]
+    assert sliced.total() == len(filtered)
+    pd.testing.assert_frame_equal(
+        _sorted(sliced.rollup(['country', 'medal_type'])),
+        _sorted(_groupby(filtered, ['country', 'medal_type'])),
+        check_dtype=False,
+    )
+    assert sliced.slice(gender='Male').total() == 0
+
+
+def test_total_and_rollup_of_no_dims(medallists):
+    cube = MedalCube.from_frame(medallists, DIMS)
+    assert cube.total() == len(medallists)
+    assert cube.rollup([]).to_dict('list') == {'count': [len(medallists)]}
+
+
+def test_save_and_load_round_trip(medallists, tmp_path):
+    cube = MedalCube.from_frame(medallists, DIMS)
+    cube.save(tmp_path / 'medals.arrow', builder='abc')
+    loaded = MedalCube.load(tmp_path / 'medals.arrow')
+    pd.testing.assert_frame_equal(loaded.rollup(['country', 'age']), cube.rollup(['country', 'age']))
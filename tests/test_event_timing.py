@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_store
+import results
+from event_timing import EventTiming
+from schedule import ScheduleIndex
+
+# Medal events of Paris 2024 with a dated result in results/*.csv
+MEDAL_EVENTS = 329
+
+
+@pytest.fixture(scope='module')
+def timing(tmp_path_factory):
+    """EventTiming and ScheduleIndex of the bundled data, with their caches in a temp folder"""
+    cache = tmp_path_factory.mktemp('cache')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(data_store, 'CACHE_DIR', cache)
+        patch.setattr(data_store, '_frames', {})
+        patch.setattr(results, 'RESULTS_CACHE_DIR', cache / 'results')
+        yield EventTiming.load(), ScheduleIndex.load()
+
+
+def test_session_hours_match_the_schedule_index(timing):
+    timing, index = timing
+    for discipline in index.disciplines:
+        hours = timing.histogram('sessions', 'hour', disciplines=[discipline]).to_numpy()
+        if discipline == 'Surfing':
+            # Teahupo'o is UTC-10 all year: its sessions are counted in Tahiti time
+            expected = np.roll(index.hour_counts(discipline=discipline, local=False), -10)
+        else:
+            expected = index.hour_counts(discipline=discipline)
+        assert hours.tolist() == expected.tolist(), discipline
+    assert timing.histogram('sessions', 'hour').sum() == len(index)
+
+
+def test_every_medal_event_is_counted_once_per_bucket(timing):
+    timing, _ = timing
+    for bucket in ['hour', 'day', 'venue']:
+        assert timing.histogram('medal_events', bucket).sum() == MEDAL_EVENTS
+
+
+def test_gender_filter_splits_the_counts(timing):
+    timing, _ = timing
+    men = timing.histogram('medal_events', 'day', genders=['Male'], include_mixed=False)
+    women = timing.histogram('medal_events', 'day', genders=['W'], include_mixed=False)
+    mixed = timing.histogram('medal_events', 'day', genders=[])
+    assert (men + women + mixed).sum() == MEDAL_EVENTS
+
+
+def test_surfing_is_bucketed_in_tahiti_time():
+    start = pd.to_datetime(['2024-08-05T19:00:00+02:00', '2024-08-05T19:00:00+02:00'], utc=True)
+    frame = pd.DataFrame({
+        'discipline': ['Surfing', 'Judo'],
+        'gender': ['M', 'M'],
+        'venue': ["Teahupo'o, Tahiti", 'Champ-de-Mars Arena'],
+        'start': start,
+    })
+    timing = EventTiming.build({'sessions': frame, 'medal_events': frame})
+    sessions = timing.table('hour')['sessions']
+    assert sessions[sessions > 0].to_dict() == {7: 1, 19: 1}
+    # Result timestamps already hold the venue's wall clock
+    medal_events = timing.table('hour', disciplines=['Surfing'])['medal_events']
+    assert medal_events[medal_events > 0].to_dict() == {19: 1}
@@ -0,0 +1,134 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import plotly.tools
+import pytest
+
+import figure_cache
+from cube import MedalCube
+from figure_cache import FigureCache, SerializedFigure, builder_hash, cached_figure, fingerprint
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FigureCache(max_figures=4)
+    monkeypatch.setattr(figure_cache, 'figure_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def serializations(monkeypatch):
+    # Walks of a figure's traces: to_json and to_dict of a plain go.Figure (SerializedFigure overrides both)
+    calls = []
+    for method in ['to_json', 'to_dict']:
+        def counting(self, *args, _original=getattr(go.Figure, method), _method=method, **kwargs):
+            calls.append(_method)
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(go.Figure, method, counting)
+    return calls
+
+
+def _render(figure):
+    # What st.plotly_chart does with the figure it is given
+    spec = plotly.tools.return_figure_from_figure_or_data(figure, validate_figure=True)
+    return pio.to_json(spec, validate=False)
+
+
+def test_second_call_neither_rebuilds_nor_reserializes(cache, serializations):
+    builds = []
+
+    @cached_figure
+    def build(df, title):
+        builds.append(title)
+        return px.bar(df, x='country', y='medals', title=title)
+
+    df = pd.DataFrame({'country': ['FRA', 'USA'], 'medals': [64, 126]})
+    expected = _render(px.bar(df, x='country', y='medals', title='Medals'))
+    first = build(df, 'Medals')
+    serialized = len(serializations)
+    second = build(df.copy(), 'Medals')
+    rendered = _render(second)
+
+    assert builds == ['Medals']
+    assert len(serializations) == serialized  # neither the hit nor its render walked a figure again
+    assert rendered == expected
+    assert second is first
+    assert isinstance(second, SerializedFigure)
+    assert second.layout.title.text == 'Medals'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_other_inputs_rebuild(cache):
+    @cached_figure
+    def build(df):
+        return px.bar(df, x='country', y='medals')
+
+    build(pd.DataFrame({'country': ['FRA'], 'medals': [64]}))
+    build(pd.DataFrame({'country': ['FRA'], 'medals': [65]}))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    figure = px.bar(x=['a', 'b'], y=[1, 2], title='Disk')
+    FigureCache(disk_dir=tmp_path).put('key', figure)
+
+    other = FigureCache(disk_dir=tmp_path)
+    restored = other.get('key')
+    assert other.disk_hits == 1
+    assert restored.to_json() == figure.to_json()
+    assert other.get('key') is restored
+
+
+def test_inputs_are_fingerprinted_once_per_object(cache, monkeypatch):
+    hashed = []
+    original = pd.util.hash_pandas_object
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', lambda *a, **k: hashed.append(1) or original(*a, **k))
+
+    @cached_figure
+    def build(df, title):
+        return px.bar(df, x='country', y='medals', title=title)
+
+    df = pd.DataFrame({'country': ['FRA', 'USA'], 'medals': [64, 126]})
+    for title in ['a', 'b', 'a']:
+        build(df, title)
+    assert len(hashed) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cube_slices_are_keyed_by_parent_and_filters():
+    cube = MedalCube({'gender': np.array([0, 1, 1])}, {'gender': ['Female', 'Male']}, np.array([1, 2, 3]))
+    parent = fingerprint(cube)
+
+    same = fingerprint(cube.slice(gender=['Male', 'Female']))
+    assert same == fingerprint(cube.slice(gender=np.array(['Female', 'Male'], dtype=object)))
+    assert same != fingerprint(cube.slice(gender=['Male']))
+    assert parent != same
+
+
+def _builder_module(tmp_path, name, helper_body):
+    path = tmp_path / f'{name}.py'
+    path.write_text(
+        'def build(values):\n'
+        '    def helper(value):\n'
+        f'        return {helper_body}\n'
+        '    return [helper(v) for v in values]\n'
+    )
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.build
+
+
+def test_builder_hash_covers_nested_code_and_version(tmp_path, monkeypatch):
+    first = _builder_module(tmp_path, 'builders_a', 'value + 1')
+    changed = _builder_module(tmp_path, 'builders_b', 'value + 2')
+    assert builder_hash(first) != builder_hash(changed)
+
+    before = builder_hash(first)
+    monkeypatch.setattr(figure_cache, 'FIGURE_CACHE_VERSION', figure_cache.FIGURE_CACHE_VERSION + 1)
+    assert builder_hash(first) != before
@@ -0,0 +1,35 @@
+import logging
+
+import pandas as pd
+import pytest
+
+import data_store
+from geo import enrich, load_noc_geo
+
+# Teams without a home country in nocs.csv
+UNLOCATED = ['AIN', 'EOR', 'IOA', 'IOP', 'ROT']
+
+
+@pytest.fixture
+def noc_geo(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(data_store, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(data_store, '_frames', {})
+    with caplog.at_level(logging.INFO, logger='geo'):
+        return load_noc_geo()
+
+
+def test_every_noc_is_matched_and_the_unlocated_are_reported(noc_geo, caplog):
+    assert len(noc_geo) == len(pd.read_csv(data_store.SOURCES['nocs']))
+    assert sorted(noc_geo.loc[noc_geo['latitude'].isna(), 'code']) == UNLOCATED
+    messages = [r.getMessage() for r in caplog.get_records('setup') if r.name == 'geo']
+    assert messages == [f"5 NOCs have no location: {', '.join(UNLOCATED)}"]
+    # Historical NOCs point at their successor state
+    assert noc_geo.set_index('code').loc[['ROC', 'AHO'], 'iso3'].tolist() == ['RUS', 'CUW']
+
+
+def test_enrich_leaves_unlocated_nocs_empty(noc_geo):
+    athletes = pd.DataFrame({'code': ['FRA', 'EOR', 'USA', 'XXX'], 'Athletes Sent': [573, 37, 592, 1]})
+    enriched = enrich(athletes, noc_geo, value='Athletes Sent')
+    assert enriched['latitude'].isna().tolist() == [False, True, False, True]
+    assert enriched['Ranking'].tolist() == [2, 3, 1, 4]
+    assert list(athletes.columns) == ['code', 'Athletes Sent']
@@ -0,0 +1,100 @@
+import json
+
+import numpy as np
+import pytest
+
+import geometry
+from geometry import build_assets, read_country_shapes, shapes_for, simplify_ring
+
+
+def _square(x, y, size, points_per_side=10):
+    # Closed square ring with extra points along every side
+    steps = np.linspace(0, size, points_per_side, endpoint=False)
+    ring = (
+        [(x + s, y) for s in steps] + [(x + size, y + s) for s in steps]
+        + [(x + size - s, y + size) for s in steps] + [(x, y + size - s) for s in steps]
+    )
+    return [list(p) for p in ring + [ring[0]]]
+
+
+def _feature(properties, *polygons):
+    coordinates = [[ring] for ring in polygons]
+    geometry = {'type': 'MultiPolygon', 'coordinates': coordinates} if len(coordinates) > 1 else {
+        'type': 'Polygon', 'coordinates': coordinates[0]}
+    return {'type': 'Feature', 'properties': properties, 'geometry': geometry}
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(geometry, 'GEOMETRY_DIR', tmp_path / 'shapes')
+    geometry.load_geometry.cache_clear()
+    yield tmp_path / 'countries.geojson'
+    geometry.load_geometry.cache_clear()
+
+
+def _write(path, *features):
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': list(features)}))
+    return path
+
+
+def test_simplify_ring_keeps_corners_and_closes():
+    ring = simplify_ring(_square(0, 0, 10), tolerance=0.1)
+    assert ring.tolist() == [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    assert simplify_ring([[0, 0], [1, 0], [0.5, 0.01], [0, 0]], tolerance=0.1) is None
+
+
+def test_build_assets_keys_shapes_by_noc(source):
+    _write(
+        source,
+        # ISO_A3 is -99 for France in Natural Earth: ISO_A3_EH is used
+        _feature({'ADMIN': 'France', 'ISO_A3': '-99', 'ISO_A3_EH': 'FRA', 'ADM0_A3': 'FRA'},
+                 _square(0, 40, 8), _square(8, 41, 0.1)),
+        _feature({'ADMIN': 'Russia', 'ISO_A3': 'RUS', 'ISO_A3_EH': 'RUS', 'ADM0_A3': 'RUS'}, _square(40, 50, 20)),
+        _feature({'ADMIN': 'Atlantis', 'ISO_A3': 'ATL', 'ISO_A3_EH': 'ATL', 'ADM0_A3': 'ATL'}, _square(-30, 0, 2)),
+    )
+    sizes = build_assets(source)
+    assert set(sizes) == {'low', 'medium', 'high'}
+
+    low = geometry.load_geometry('low')
+    ids = [f['id'] for f in low['features']]
+    assert 'FRA' in ids and 'RUS' in ids and 'ATL' not in ids
+    assert 'ROC' in ids and 'URS' in ids  # historical NOCs reuse their successor's shape
+    france = next(f for f in low['features'] if f['id'] == 'FRA')
+    # The 0.1 degree island is below the low tolerance and dropped; the mainland is 4 corners
+    assert france['geometry'] == {'type': 'Polygon', 'coordinates': [[[0, 40], [8, 40], [8, 48], [0, 48], [0, 40]]]}
+    high = geometry.load_geometry('high')
+    assert next(f for f in high['features'] if f['id'] == 'FRA')['geometry']['type'] == 'MultiPolygon'
+    assert sizes['low'] < sizes['high']
+
+
+def test_shapes_for_returns_only_the_plotted_nocs(source):
+    assert shapes_for(['FRA'], 'low') is None  # no assets built yet
+    _write(source,
+           _feature({'ADMIN': 'France', 'ISO_A3_EH': 'FRA'}, _square(0, 40, 8)),
+           _feature({'ADMIN': 'Norway', 'ISO_A3_EH': 'NOR'}, _square(5, 58, 10)))
+    build_assets(source, levels=['low'])
+    shapes = shapes_for(['NOR', 'XXX'], 'low')
+    assert shapes['type'] == 'FeatureCollection'
+    assert [f['id'] for f in shapes['features']] == ['NOR']
+
+
+def test_missing_codes_fail_loudly(source):
+    _write(source,
+           _feature({'NAME': 'Kosovo', 'ISO_A3': '-99'}, _square(20, 42, 1)),
+           _feature({'NAME': 'Norway', 'ISO_A3': '-99'}, _square(5, 58, 10)))
+    with pytest.raises(ValueError, match='ISO_A3 is -99 for Kosovo, Norway'):
+        read_country_shapes(source)
+    shapes = read_country_shapes(source, codes={'Kosovo': 'XKX', 'Norway': 'NOR'})
+    assert sorted(shapes) == ['NOR', 'XKX']
+
+
+def test_prefers_iso_a3_eh_over_adm0_a3(source):
+    _write(source, _feature({'ADMIN': 'South Sudan', 'ADM0_A3': 'SDS', 'ISO_A3_EH': 'SSD'}, _square(30, 5, 3)))
+    assert list(read_country_shapes(source)) == ['SSD']
+
+
+def test_bundled_assets_cover_the_host():
+    geometry.load_geometry.cache_clear()
+    for level in geometry.DETAIL_LEVELS:
+        assert geometry.asset_path(level).exists()
+    assert [f['id'] for f in shapes_for(['FRA'], 'low')['features']] == ['FRA']
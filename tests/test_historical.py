@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from historical import ROLLING_GAMES, ROLLUP_DIMS, HistoryRollups, read_medal_rows
+
+HEADER = 'player_id,Name,Sex,Team,NOC,Year,Season,City,Sport,Event,Medal\n'
+
+
+def test_malformed_years_drop_their_rows(tmp_path):
+    path = tmp_path / 'history.csv'
+    path.write_text(HEADER + ''.join([
+        '1,A,M,France,FRA,1900,Summer,Paris,Judo,Men,Gold\n',
+        '2,B,F,France,FRA,19O0,Summer,Paris,Judo,Women,Silver\n',
+        '3,C,F,USA,USA,,Summer,Paris,Judo,Women,Bronze\n',
+        '4,D,M,USA,USA,2024,Summer,Paris,Judo,Men,Bronze\n',
+        '5,E,M,USA,USA,2024,Summer,Paris,Judo,Men,No medal\n',
+    ]))
+    table = read_medal_rows(path)
+    assert table.schema.field('Year').type == pa.int16()
+    assert table.column('Year').to_pylist() == [1900, 2024]
+    assert table.column('Medal').to_pylist() == ['Gold', 'Bronze']
+
+
+@pytest.fixture(scope='module')
+def history():
+    rng = np.random.default_rng(3)
+    n = 400
+    # Games every 4 years with a gap (no 1916 / 1940 / 1944), so editions differ from calendar years
+    years = np.array([1896, 1900, 1904, 1908, 1912, 1920, 1924, 1928, 1932, 1936, 1948])
+    df = pd.DataFrame({
+        'Year': rng.choice(years, n),
+        'Medal': rng.choice(['Gold', 'Silver', 'Bronze'], n),
+        'Sex': rng.choice(['M', 'F'], n, p=[0.8, 0.2]),
+        'Sport_Category': rng.choice(['Aquatics', 'Athletics', 'Combat Sports', None], n),
+        'NOC': rng.choice(['FRA', 'USA', 'GBR', 'SWE', 'HUN'], n),
+    })
+    # A NOC that wins only in the first Games: its rolling total must drop back to zero
+    df.loc[0, ['Year', 'NOC']] = [1896, 'BOH']
+    return df
+
+
+def _expected(history, column):
+    counts = history.groupby(['Year', column]).size().unstack(fill_value=0).sort_index()
+    return counts, counts.cumsum(), counts.rolling(ROLLING_GAMES, min_periods=1).sum().astype(int)
+
+
+@pytest.mark.parametrize('dimension', list(ROLLUP_DIMS))
+def test_rollups_match_pandas(history, dimension):
+    rollups = HistoryRollups.build(history)
+    expected = _expected(history, ROLLUP_DIMS[dimension])
+    for value, frame in zip(['count', 'cumulative', 'rolling'], expected):
+        got = rollups.get(dimension, value).pivot(index='Year', columns='label', values=value)
+        want = frame.where(frame > 0).dropna(how='all').dropna(axis=1, how='all')
+        pd.testing.assert_frame_equal(
+            got.sort_index(axis=1), want.sort_index(axis=1), check_dtype=False, check_names=False
+        )
+
+
+def test_rolling_window_counts_games_not_years(history):
+    rollups = HistoryRollups.build(history)
+    bohemia = rollups.get('noc', 'rolling')
+    bohemia = bohemia[bohemia['label'] == 'BOH']
+    # Counted in 1896 and the next two editions (ROLLING_GAMES = 3), then out of the window
+    assert ROLLING_GAMES == 3
+    assert bohemia['Year'].tolist() == [1896, 1900, 1904]
+    assert rollups.get('noc', 'cumulative').query("label == 'BOH'")['Year'].max() == 1948
+
+
+def test_totals(history):
+    rollups = HistoryRollups.build(history)
+    assert rollups.totals().to_dict() == history.groupby('Year').size().to_dict()
+    assert rollups.totals('cumulative').iloc[-1] == len(history)
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+import data_store
+import incremental
+from incremental import AGGREGATES, refresh
+
+HEADER = 'medal_date,medal_type,name,gender,country,discipline,event,event_type\n'
+ROWS = [
+    '2024-07-27,Gold Medal,A,Male,France,Judo,Men -60 kg,ATH\n',
+    '2024-07-27,Silver Medal,B,Female,Japan,Judo,Women -48 kg,ATH\n',
+    '2024-07-28,Bronze Medal,C,Male,France,Swimming,Men 100m,ATH\n',
+    '2024-07-28,Gold Medal,A,Male,France,Judo,Mixed Team,TEAM\n',
+]
+NEW_ROWS = [
+    '2024-07-29,Gold Medal,D,Female,Japan,Swimming,Women 100m,ATH\n',
+    '2024-07-29,Bronze Medal,A,Male,France,Judo,Men -60 kg,ATH\n',
+    '2024-07-30,Silver Medal,E,Female,Brazil,Judo,Women -48 kg,ATH\n',
+]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Point the medallists source, the state and the table cache at a temp folder"""
+    source = tmp_path / 'medallists.csv'
+    export_dir = tmp_path / 'exports'
+    export_dir.mkdir()
+    monkeypatch.setattr(data_store, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(incremental, 'STATE_DIR', tmp_path / 'state')
+    monkeypatch.setattr(incremental, 'STATE_FILE', tmp_path / 'state' / 'state.json')
+    monkeypatch.setitem(data_store.SOURCES, 'medallists', source)
+    for name in AGGREGATES:
+        monkeypatch.setitem(data_store.SOURCES, name, export_dir / f'{name}.csv')
+    return source, export_dir
+
+
+def _exports(export_dir):
+    return {name: pd.read_csv(export_dir / f'{name}.csv') for name in AGGREGATES}
+
+
+def test_append_then_refresh_equals_full_rebuild(workspace):
+    source, export_dir = workspace
+    source.write_text(HEADER + ''.join(ROWS))
+    assert refresh(export_dir, full=True)[0] == len(ROWS)
+
+    with open(source, 'a') as handle:
+        handle.write(''.join(NEW_ROWS))
+    applied, state = refresh(export_dir)
+    assert applied == len(NEW_ROWS)
+    assert state['rows'] == len(ROWS) + len(NEW_ROWS)
+    assert state['high_water'] == '2024-07-30'
+    incremental_exports = _exports(export_dir)
+
+    refresh(export_dir, full=True)
+    for name, expected in _exports(export_dir).items():
+        pd.testing.assert_frame_equal(incremental_exports[name], expected, obj=name)
+
+    totals = incremental_exports['Total Medals by Country'].set_index('country')
+    assert totals.loc['France'].tolist() == [2, 0, 2]
+    assert totals.loc['Japan'].tolist() == [1, 1, 0]
+
+
+def test_partial_last_line_waits_for_the_next_refresh(workspace):
+    source, export_dir = workspace
+    source.write_text(HEADER + ''.join(ROWS))
+    refresh(export_dir, full=True)
+
+    with open(source, 'a') as handle:
+        handle.write(NEW_ROWS[0] + NEW_ROWS[1].rstrip('\n'))
+    assert refresh(export_dir)[0] == 1
+    with open(source, 'a') as handle:
+        handle.write('\n')
+    assert refresh(export_dir)[0] == 1
+    assert refresh(export_dir)[0] == 0
+
+
+def test_rewritten_file_triggers_full_rebuild(workspace):
+    source, export_dir = workspace
+    source.write_text(HEADER + ''.join(ROWS))
+    refresh(export_dir, full=True)
+
+    source.write_text(HEADER + ROWS[0])
+    applied, state = refresh(export_dir)
+    assert applied == 1
+    assert state['rows'] == 1
+    assert pd.read_csv(export_dir / 'Medals by Discipline.csv')['total_medals'].sum() == 1
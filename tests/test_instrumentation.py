@@ -0,0 +1,99 @@
+import json
+import time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import instrumentation
+from instrumentation import RerunProfile, chrome_trace, instrumented, span
+
+SCRIPT = """
+import streamlit as st
+import instrumentation
+
+with instrumentation.profile_rerun() as profile:
+    st.write('sampled' if profile else 'skipped')
+"""
+
+
+@pytest.fixture
+def profile(monkeypatch):
+    profile = RerunProfile('rerun 1')
+    monkeypatch.setattr(instrumentation._local, 'profile', profile, raising=False)
+    return profile
+
+
+def test_spans_nest(profile):
+    @instrumented('build')
+    def build():
+        with span('filter rows', 'filter'):
+            time.sleep(0.002)
+        time.sleep(0.002)
+
+    with span('tab', 'render'):
+        build()
+    profile.finish()
+
+    spans = {s['name']: s for s in profile.spans}
+    assert [s['name'] for s in profile.spans] == ['filter rows', 'build', 'tab']  # closed innermost first
+    assert [spans[name]['depth'] for name in ['tab', 'build', 'filter rows']] == [0, 1, 2]
+    outer, inner = spans['build'], spans['filter rows']
+    assert outer['start_ms'] <= inner['start_ms']
+    assert inner['start_ms'] + inner['duration_ms'] <= outer['start_ms'] + outer['duration_ms']
+    assert outer['self_ms'] == pytest.approx(outer['duration_ms'] - inner['duration_ms'])
+    # Self times partition the rerun: no span is counted twice
+    totals = profile.totals()
+    assert sum(totals.values()) == pytest.approx(profile.duration_ns / 1e6)
+    assert totals['filter'] == pytest.approx(inner['duration_ms'])
+
+
+def test_spans_are_free_when_not_sampled(monkeypatch):
+    monkeypatch.setattr(instrumentation._local, 'profile', None, raising=False)
+    assert span('load', 'load') is instrumentation._NO_SPAN
+    assert instrumented('build')(lambda x: x + 1)(1) == 2
+
+
+def test_chrome_trace_is_well_formed(profile):
+    with span('load medals', 'load', rows=3):
+        with span('build chart', 'build'):
+            pass
+    profile.finish()
+
+    trace = json.loads(json.dumps(chrome_trace([profile.to_dict(), profile.to_dict()])))
+    events = trace['traceEvents']
+    assert trace['displayTimeUnit'] == 'ms'
+    assert {e['ph'] for e in events} == {'M', 'X'}
+    assert {e['tid'] for e in events} == {1, 2}
+    for event in events:
+        assert {'name', 'ph', 'pid', 'tid'} <= event.keys()
+        if event['ph'] == 'X':
+            assert event['ts'] > 0 and event['dur'] >= 0
+    complete = {e['name']: e for e in events if e['ph'] == 'X' and e['tid'] == 1}
+    assert complete['load medals']['args']['rows'] == 3
+    for name in ['load medals', 'build chart']:
+        # Every span lies inside its rerun
+        assert complete[name]['ts'] >= complete['rerun']['ts']
+        assert complete[name]['ts'] + complete[name]['dur'] <= complete['rerun']['ts'] + complete['rerun']['dur']
+
+
+def _run(monkeypatch, rate, draw=0.5, debug=False):
+    monkeypatch.setattr(instrumentation, 'PROFILE_RATE', rate)
+    monkeypatch.setattr(instrumentation.random, 'random', lambda: draw)
+    app = AppTest.from_string(SCRIPT)
+    if debug:
+        app.query_params['debug'] = '1'
+    return app.run()
+
+
+@pytest.mark.parametrize('rate, draw, sampled', [(0, 0.0, False), (1, 0.99, True), (0.1, 0.05, True), (0.1, 0.5, False)])
+def test_reruns_are_sampled_at_the_profile_rate(monkeypatch, rate, draw, sampled):
+    app = _run(monkeypatch, rate, draw)
+    assert app.markdown[0].value == ('sampled' if sampled else 'skipped')
+    assert len(app.sidebar.expander) == 0
+
+
+def test_debug_param_profiles_and_shows_the_panel(monkeypatch):
+    app = _run(monkeypatch, 0, debug=True)
+    assert app.markdown[0].value == 'sampled'
+    assert app.sidebar.expander[0].label == '⏱️ Render profile'
+    assert app.session_state['_profile_reruns'] == 1
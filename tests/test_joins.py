@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from joins import KeyIndex, indexed_join
+
+
+@pytest.fixture
+def medals():
+    return pd.DataFrame({'code': [1, 2, 3, 9, 2], 'medal': ['G', 'S', 'B', 'G', 'B']})
+
+
+@pytest.fixture
+def athletes():
+    # 2 appears twice: the first row ('B1') must win
+    return pd.DataFrame({'code': [1, 2, 2, 3, None], 'name': ['A', 'B1', 'B2', 'C', 'D']})
+
+
+def test_key_index_keeps_first_duplicate():
+    index = KeyIndex(pd.Series(['x', 'y', 'x', None, 'z']))
+    assert index.lookup(['x', 'y', 'z', 'w']).tolist() == [0, 1, 4, -1]
+    assert index.duplicate_keys.tolist() == ['x']
+
+
+def test_inner_join_drops_unmatched_and_never_fans_out(medals, athletes):
+    joined, report = indexed_join(medals, athletes, left_on='code', right_on='code', how='inner')
+    assert joined['code'].tolist() == [1, 2, 3, 2]
+    assert joined['name'].tolist() == ['A', 'B1', 'C', 'B1']
+    assert report == {
+        'left_rows': 5,
+        'right_rows': 5,
+        'matched': 4,
+        'unmatched': 1,
+        'unmatched_keys': [9],
+        'duplicate_keys': 1,
+        'result_rows': 4,
+    }
+
+
+def test_left_join_keeps_every_left_row(medals, athletes):
+    joined, report = indexed_join(medals, athletes, left_on='code', right_on='code', how='left')
+    assert len(joined) == len(medals)
+    assert joined['medal'].tolist() == medals['medal'].tolist()
+    assert joined['name'].tolist()[:3] == ['A', 'B1', 'C']
+    assert pd.isna(joined.loc[3, 'name'])
+    assert (report['matched'], report['unmatched'], report['result_rows']) == (4, 1, 5)
+
+
+def test_mixed_key_types_and_suffixes():
+    left = pd.DataFrame({'code_athlete': [1903136, 1903137], 'name': ['a', 'b']})
+    right = pd.DataFrame({'code': ['1903136', '1903137'], 'name': ['A', 'B'], 'height': [180, 170]})
+    joined, report = indexed_join(left, right, left_on='code_athlete', right_on='code', suffixes=('_l', '_r'))
+    assert report['matched'] == 2
+    assert joined[['name_l', 'name_r']].values.tolist() == [['a', 'A'], ['b', 'B']]
+    assert joined['code'].tolist() == ['1903136', '1903137']
+
+
+def test_prebuilt_index_is_reused(medals, athletes):
+    index = KeyIndex(athletes['code'])
+    joined, _ = indexed_join(medals, athletes, left_on='code', right_on='code', index=index)
+    expected, _ = indexed_join(medals, athletes, left_on='code', right_on='code')
+    pd.testing.assert_frame_equal(joined, expected)
+
+
+def test_unsupported_join_type(medals, athletes):
+    with pytest.raises(ValueError):
+        indexed_join(medals, athletes, left_on='code', right_on='code', how='outer')
@@ -0,0 +1,28 @@
+import importlib
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def import_app(monkeypatch):
+    def load(clientside):
+        monkeypatch.setenv('MEDAL_APP_CLIENTSIDE', '1' if clientside else '0')
+        monkeypatch.delitem(sys.modules, 'medal_analysis_app', raising=False)
+        return importlib.import_module('medal_analysis_app').server.test_client()
+
+    yield load
+    sys.modules.pop('medal_analysis_app', None)
+
+
+@pytest.mark.parametrize('clientside', [False, True])
+def test_script_is_served_only_in_clientside_mode(import_app, clientside):
+    client = import_app(clientside)
+    served = client.get('/assets/medal_breakdown.js').status_code == 200
+    injected = 'medal_breakdown.js' in client.get('/').get_data(as_text=True)
+    assert served == injected == clientside
+
+
+def test_data_files_are_not_served(import_app):
+    client = import_app(True)
+    assert client.get('/assets/noc_centroids.csv').status_code == 404
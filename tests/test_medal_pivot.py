@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from medal_pivot import MEDAL_COLUMNS, MedalPivot, medal_codes, medal_pivot
+
+
+def _medals():
+    return pd.DataFrame({
+        'country': ['France', 'France', 'Japan', 'France', None, 'Japan'],
+        'event': ['Judo', 'Judo', 'Judo', 'Swimming', 'Judo', None],
+        'medal_type': ['Gold Medal', 'Bronze Medal', 'Silver Medal', 'Gold Medal', 'Gold Medal', 'No medal'],
+    })
+
+
+def test_medal_codes_accepts_every_spelling():
+    assert medal_codes(['Gold Medal', 'Silver', 'Bronze Medal', 'No medal', None]).tolist() == [0, 1, 2, -1, -1]
+    assert medal_codes(pd.Series([1.0, 3.0, np.nan, 4.0])).tolist() == [0, 2, -1, -1]
+    assert medal_codes(pd.Categorical(['Bronze', 'Gold'])).tolist() == [2, 0]
+
+
+def test_pivot_matches_groupby():
+    df = _medals()
+    pivot = medal_pivot(df, ['country', 'event'])
+    expected = (
+        df[df['medal_type'] != 'No medal']
+        .groupby(['country', 'event'])['medal_type'].value_counts()
+        .unstack(fill_value=0)[['Gold Medal', 'Silver Medal', 'Bronze Medal']]
+    )
+    assert pivot.index.tolist() == expected.index.tolist()
+    np.testing.assert_array_equal(pivot.counts, expected.to_numpy())
+
+
+def test_dropna_false_keeps_missing_keys_as_a_group():
+    pivot = medal_pivot(_medals(), 'country', dropna=False)
+    wide = pivot.wide(total='total')
+    assert wide.loc['France'].tolist() == [3, 2, 0, 1]
+    assert wide.loc[np.nan].tolist() == [1, 1, 0, 0]
+    assert pivot.totals().sum() == 5
+
+
+def test_long_has_the_rows_of_melt():
+    pivot = medal_pivot(_medals(), ['country', 'event'])
+    long = pivot.long()
+    melted = pivot.wide().reset_index().melt(
+        id_vars=['country', 'event'], value_vars=MEDAL_COLUMNS, var_name='Medal Type', value_name='Count'
+    )
+    key = ['country', 'event', 'Medal Type']
+    pd.testing.assert_frame_equal(
+        long.sort_values(key).reset_index(drop=True), melted.sort_values(key).reset_index(drop=True)
+    )
+    # Group-major, and the counts are the matrix itself
+    assert long['Medal Type'].tolist()[:3] == MEDAL_COLUMNS
+    assert np.shares_memory(long['Count'].to_numpy(), pivot.counts)
+
+
+def test_from_wide_round_trip():
+    wide = pd.DataFrame({
+        'country': ['France', 'Japan'],
+        'Gold_Medals': [2, 0],
+        'Silver_Medals': [0, 1],
+        'Bronze_Medals': [1, 0],
+    })
+    pivot = MedalPivot.from_wide(wide, ['country'])
+    assert pivot.totals().tolist() == [3, 1]
+    assert pivot.long(var_name='medal', value_name='n').values.tolist() == [
+        ['France', 'Gold_Medals', 2], ['France', 'Silver_Medals', 0], ['France', 'Bronze_Medals', 1],
+        ['Japan', 'Gold_Medals', 0], ['Japan', 'Silver_Medals', 1], ['Japan', 'Bronze_Medals', 0],
+    ]
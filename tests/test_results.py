@@ -0,0 +1,123 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import results
+from results import build_results, decode_results, parse_clock, query_results
+
+
+def test_parse_clock_formats():
+    values = pd.Series([
+        '1:02:03.5', '3:41.25', '9.81', '+0:51', ' 12 ', 'FLT (2, 8)', None, '1:xx', '-1:02.5', '-0.12', '--1',
+    ])
+    parsed = parse_clock(values)
+    expected = [3723.5, 221.25, 9.81, 51.0, 12.0, np.nan, np.nan, np.nan, -62.5, -0.12, np.nan]
+    np.testing.assert_allclose(parsed.to_numpy(), expected, equal_nan=True)
+    assert parsed.index.equals(values.index)
+
+
+def test_decode_results_units_and_irm():
+    df = pd.DataFrame({
+        'result': ['3:41.25', '8.34', '215', '14', None, '3:50.00'],
+        'result_type': ['TIME', 'DISTANCE', 'WEIGHT', 'POINTS', 'IRM_TIME', 'TIME'],
+        'result_diff': ['+0:51', '-0.12', None, None, None, '+8.75'],
+        'result_IRM': [None, None, None, None, 'DNF', 'XYZ'],
+    })
+    decoded = decode_results(df)
+
+    np.testing.assert_allclose(decoded['result_seconds'], [221.25, np.nan, np.nan, np.nan, np.nan, 230.0])
+    np.testing.assert_allclose(decoded['result_metres'], [np.nan, 8.34, np.nan, np.nan, np.nan, np.nan])
+    np.testing.assert_allclose(decoded['result_kg'], [np.nan, np.nan, 215, np.nan, np.nan, np.nan])
+    np.testing.assert_allclose(decoded['result_points'], [np.nan, np.nan, np.nan, 14, np.nan, np.nan])
+    np.testing.assert_allclose(decoded['result_diff_value'], [51.0, -0.12, np.nan, np.nan, np.nan, 8.75])
+    assert decoded['irm_status'].tolist() == ['OK', 'OK', 'OK', 'OK', 'DNF', 'OTHER']
+    # The input frame is left untouched
+    assert 'result_seconds' not in df.columns
+
+
+HEADER = 'date,event_code,stage,discipline_name,participant_name,rank,result,result_type\n'
+
+
+@pytest.fixture
+def results_dirs(tmp_path, monkeypatch):
+    source_dir, cache_dir = tmp_path / 'results', tmp_path / 'cache'
+    source_dir.mkdir()
+    monkeypatch.setattr(results, 'RESULTS_DIR', source_dir)
+    monkeypatch.setattr(results, 'RESULTS_CACHE_DIR', cache_dir)
+    (source_dir / 'Judo.csv').write_text(HEADER + (
+        '2024-07-27T10:00:00Z,JUDM60,Final,Judo,A,1,,POINTS\n'
+        '2024-07-27T09:00:00Z,JUDM60,Semifinal,Judo,B,2,,POINTS\n'
+        '2024-07-28T10:00:00Z,JUDW48,Final,Judo,C,1,,POINTS\n'
+    ))
+    (source_dir / 'Swimming.csv').write_text(HEADER + (
+        '2024-07-27T20:00:00Z,SWM100,Final,Swimming,D,1,47.5,TIME\n'
+        '2024-07-27T12:00:00Z,SWM100,Heats,Swimming,E,8,48.9,TIME\n'
+    ))
+    return source_dir, cache_dir
+
+
+def test_build_writes_one_partition_per_discipline(results_dirs):
+    _, cache_dir = results_dirs
+    assert build_results(workers=1) == {'Judo': 3, 'Swimming': 2}
+    assert sorted(p.name for p in cache_dir.iterdir()) == ['_manifest.json', 'discipline=Judo', 'discipline=Swimming']
+    df = query_results()
+    assert len(df) == 5
+    assert str(df['rank'].dtype) == 'Int16'
+    assert set(json.loads((cache_dir / '_manifest.json').read_text())) == {'Judo', 'Swimming'}
+
+
+def test_manifest_drives_incremental_rebuilds(results_dirs):
+    source_dir, cache_dir = results_dirs
+    build_results(workers=1)
+    manifest = cache_dir / '_manifest.json'
+    written = manifest.stat().st_mtime_ns
+
+    # Nothing changed: nothing rebuilt and the manifest is not rewritten
+    assert build_results(workers=1) == {}
+    query_results()
+    assert manifest.stat().st_mtime_ns == written
+
+    with open(source_dir / 'Swimming.csv', 'a') as handle:
+        handle.write('2024-07-28T20:00:00Z,SWM200,Final,Swimming,F,1,1:44.2,TIME\n')
+    assert build_results(workers=1) == {'Swimming': 3}
+    assert build_results(workers=1, force=True) == {'Judo': 3, 'Swimming': 3}
+
+
+def test_deleted_source_drops_its_partition(results_dirs):
+    source_dir, cache_dir = results_dirs
+    build_results(workers=1)
+    (source_dir / 'Judo.csv').unlink()
+
+    assert build_results(workers=1) == {}
+    assert not (cache_dir / 'discipline=Judo' / 'part-0.parquet').exists()
+    assert set(json.loads((cache_dir / '_manifest.json').read_text())) == {'Swimming'}
+    assert query_results()['participant_name'].tolist() == ['D', 'E']
+
+
+def test_filters_are_pushed_down(results_dirs):
+    judo = query_results(discipline='Judo', columns=['participant_name'])
+    assert sorted(judo['participant_name']) == ['A', 'B', 'C']
+    assert list(judo.columns) == ['participant_name']
+
+    finals = query_results(stage='Final', event_code=['JUDM60', 'SWM100'], columns=['participant_name'])
+    assert sorted(finals['participant_name']) == ['A', 'D']
+    assert query_results(discipline=['Judo', 'Swimming'], stage='Heats')['participant_name'].tolist() == ['E']
+
+    decoded = query_results(discipline='Swimming', stage='Final', decode=True)
+    assert decoded['result_seconds'].tolist() == [47.5]
+    assert query_results(discipline='Fencing').empty
+
+
+def test_concurrent_queries_after_a_change(results_dirs):
+    source_dir, _ = results_dirs
+    build_results(workers=1)
+    with open(source_dir / 'Judo.csv', 'a') as handle:
+        handle.write('2024-07-29T10:00:00Z,JUDW48,Semifinal,Judo,G,3,,POINTS\n')
+
+    # Streamlit sessions are threads of one process: they may all see the stale partition at once
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        counts = list(pool.map(lambda _: len(query_results(discipline='Judo')), range(16)))
+    assert counts == [4] * 16
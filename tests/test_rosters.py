@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+import data_store
+import rosters
+from rosters import explode_list_column, load_team_members
+
+
+def _exploded(values):
+    rows, positions, elements = explode_list_column(values)
+    return list(zip(rows.tolist(), positions.tolist(), elements.tolist()))
+
+
+def test_explode_list_column():
+    values = [
+        "['LEE Ann', 'KIM Bo']",
+        '[]',
+        None,
+        '["D\'ALMEIDA Marcus", \'SMITH Jo\', "O\'NEIL Pat"]',
+        "  ['A','B' ]  ",
+        "['  padded  ']",
+    ]
+    assert _exploded(values) == [
+        (0, 0, 'LEE Ann'), (0, 1, 'KIM Bo'),
+        (3, 0, "D'ALMEIDA Marcus"), (3, 1, 'SMITH Jo'), (3, 2, "O'NEIL Pat"),
+        (4, 0, 'A'), (4, 1, 'B'),
+        (5, 0, '  padded  '),
+    ]
+
+
+def test_explode_list_column_of_empty_lists():
+    assert _exploded(['[]', '[ ]']) == []
+
+
+@pytest.fixture
+def teams_csv(tmp_path, monkeypatch):
+    source = tmp_path / 'teams.csv'
+    pd.DataFrame({
+        'code': ['JUDMTEAM-FRA'],
+        'athletes': ["['RINER Teddy', \"D'ALMEIDA Marcus\"]"],
+        'athletes_codes': ["['1', '2']"],
+        'coaches': ['[]'],
+        'coaches_codes': ['[]'],
+    }).to_csv(source, index=False)
+    monkeypatch.setattr(data_store, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(rosters, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(rosters, 'TEAM_MEMBERS_PATH', tmp_path / 'cache' / 'team_members.arrow')
+    monkeypatch.setitem(data_store.SOURCES, 'teams', source)
+    monkeypatch.setattr(data_store, '_frames', {})
+    return source
+
+
+def test_cache_is_rebuilt_when_the_builder_changes(teams_csv, monkeypatch):
+    members = load_team_members()
+    assert members['name'].tolist() == ['RINER Teddy', "D'ALMEIDA Marcus"]
+    assert not rosters.is_stale()
+
+    monkeypatch.setattr(rosters, 'builder_hash', lambda: 'edited')
+    assert rosters.is_stale()
+    load_team_members()
+    assert not rosters.is_stale()
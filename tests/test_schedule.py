@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from schedule import ScheduleIndex
+
+
+def _sessions(rows):
+    return pd.DataFrame(rows, columns=['url', 'venue_code', 'discipline', 'start_date', 'end_date'])
+
+
+def _brute_force_pairs(index):
+    pairs = set()
+    for i in range(len(index)):
+        for j in range(i + 1, len(index)):
+            same_venue = index.venue_codes[i] == index.venue_codes[j]
+            if same_venue and index.start[i] < index.end[j] and index.start[j] < index.end[i]:
+                pairs.add(frozenset([index.sessions['url'][i], index.sessions['url'][j]]))
+    return pairs
+
+
+def test_overlaps_are_strict():
+    index = ScheduleIndex(_sessions([
+        ('a', 'V1', 'Judo', '2024-07-27T10:00Z', '2024-07-27T12:00Z'),
+        ('b', 'V1', 'Judo', '2024-07-27T11:00Z', '2024-07-27T13:00Z'),   # overlaps a by 60 min
+        ('c', 'V1', 'Judo', '2024-07-27T13:00Z', '2024-07-27T14:00Z'),   # back to back with b
+        ('d', 'V1', 'Judo', '2024-07-27T13:00Z', '2024-07-27T13:00Z'),   # zero length, same start as c
+        ('e', 'V1', 'Judo', '2024-07-27T13:00Z', None),                  # no end: instantaneous
+        ('f', 'V1', 'Judo', '2024-07-27T13:30Z', '2024-07-27T13:30Z'),   # zero length inside c
+        ('g', 'V2', 'Swimming', '2024-07-27T10:30Z', '2024-07-27T11:30Z'),  # other venue
+    ]))
+    overlaps = index.overlaps()
+
+    found = {frozenset(pair) for pair in zip(overlaps['first'], overlaps['second'])}
+    assert found == {frozenset('ab'), frozenset('cf')}
+    assert found == _brute_force_pairs(index)
+    assert overlaps.set_index('first').loc['a', 'overlap_minutes'] == 60
+
+
+def test_overlaps_match_brute_force_on_random_sessions():
+    rng = np.random.default_rng(7)
+    starts = pd.Timestamp('2024-07-27', tz='UTC') + pd.to_timedelta(rng.integers(0, 48, 200) * 15, unit='min')
+    lengths = pd.to_timedelta(rng.choice([0, 15, 30, 60, 120], 200), unit='min')
+    index = ScheduleIndex(pd.DataFrame({
+        'url': [f's{i}' for i in range(200)],
+        'venue_code': rng.choice(['V1', 'V2', 'V3'], 200),
+        'discipline': 'Judo',
+        'start_date': starts,
+        'end_date': starts + lengths,
+    }))
+    overlaps = index.overlaps()
+    assert len(overlaps) == len(_brute_force_pairs(index))
+
+
+def test_live_at_includes_point_sessions_at_their_start():
+    index = ScheduleIndex(_sessions([
+        ('a', 'V1', 'Judo', '2024-07-27T10:00Z', '2024-07-27T12:00Z'),
+        ('b', 'V1', 'Judo', '2024-07-27T12:00Z', '2024-07-27T12:00Z'),
+        ('c', 'V2', 'Swimming', '2024-07-27T11:00Z', '2024-07-27T12:30Z'),
+    ]))
+    assert index.live_at('2024-07-27T12:00Z')['url'].tolist() == ['c', 'b']
+    assert index.live_at('2024-07-27T11:00Z', venue='V1')['url'].tolist() == ['a']
+    assert index.live_at('2024-08-27T11:00Z').empty
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from schedule_diff import COARSE_KEY, diff, normalize_schedule
+
+
+def _snapshot(rows):
+    return normalize_schedule(pd.DataFrame(rows, columns=[
+        'discipline_code', 'event', 'phase', 'url', 'start_date', 'end_date', 'venue_code', 'status',
+    ]))
+
+
+OLD = [
+    ('JUD', 'Men -60 kg', 'Final', '/jud/1', '2024-07-27T10:00Z', '2024-07-27T11:00Z', 'CDM', 'FINISHED'),
+    ('JUD', 'Men -60 kg', 'Final', '/jud/1', '2024-07-27T12:00Z', '2024-07-27T13:00Z', 'CDM', 'FINISHED'),
+    ('SWM', 'Men 100m', 'Heats', '/swm/1', '2024-07-28T09:00Z', '2024-07-28T10:00Z', 'LDF', 'FINISHED'),
+    ('SWM', 'Men 100m', 'Final', '/swm/2', '2024-07-29T18:00Z', '2024-07-29T19:00Z', 'LDF', 'FINISHED'),
+    ('ATH', 'Marathon', 'Final', '/ath/1', '2024-08-10T06:00Z', '2024-08-10T09:00Z', 'INV', 'FINISHED'),
+]
+
+
+def _changes(old, new, **kwargs):
+    changes = diff(_snapshot(old), _snapshot(new), **kwargs)
+    return sorted(zip(changes['url'], changes['change'].astype(str)))
+
+
+def test_identical_snapshots_have_no_changes():
+    assert diff(_snapshot(OLD), _snapshot(OLD)).empty
+
+
+def test_change_types():
+    new = [
+        OLD[0],
+        # Second occurrence of a repeated key moved by an hour
+        OLD[1][:4] + ('2024-07-27T13:00Z', '2024-07-27T14:00Z') + OLD[1][6:],
+        # Re-venued only
+        OLD[2][:6] + ('PLS', 'FINISHED'),
+        # Flagged cancelled
+        OLD[3][:7] + ('CANCELLED',),
+        # OLD[4] dropped, one session added
+        ('BMX', 'Park', 'Final', '/bmx/1', '2024-07-31T12:00Z', '2024-07-31T13:00Z', 'LCO', 'FINISHED'),
+    ]
+    assert _changes(OLD, new) == [
+        ('/ath/1', 'cancelled'),
+        ('/bmx/1', 'added'),
+        ('/jud/1', 'moved'),
+        ('/swm/1', 're-venued'),
+        ('/swm/2', 'cancelled'),
+    ]
+
+
+def test_moved_and_revenued_session_gets_both_rows():
+    new = list(OLD)
+    new[4] = OLD[4][:4] + ('2024-08-11T06:00Z', '2024-08-11T09:00Z', 'TRO', 'FINISHED')
+    changes = diff(_snapshot(OLD), _snapshot(new))
+    assert changes['change'].astype(str).tolist() == ['moved', 're-venued']
+    assert changes[['old_venue', 'new_venue']].values.tolist() == [['INV', 'TRO']] * 2
+    assert (changes['new_start'] - changes['old_start']).tolist() == [86400, 86400]
+
+
+def test_coarse_key_aligns_sessions_by_start_order():
+    # With the discipline as the only key, the k-th session of a discipline matches the k-th
+    new = [row[:1] + ('x', 'y', 'z') + row[4:] for row in OLD]
+    assert diff(_snapshot(OLD), _snapshot(new), keys=COARSE_KEY).empty
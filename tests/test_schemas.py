@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+import schemas
+from schemas import apply_schema, share_dictionaries
+
+
+@pytest.fixture(autouse=True)
+def dictionaries(monkeypatch):
+    """Empty shared dictionaries, not seeded from the reference CSVs"""
+    monkeypatch.setattr(schemas, 'SHARED_DICTIONARIES', {name: [] for name in schemas.SHARED_DICTIONARIES})
+    monkeypatch.setattr(schemas, '_shared_dtypes', {})
+    monkeypatch.setattr(schemas, '_seeded', True)
+
+
+def _medals(countries):
+    return pd.DataFrame({
+        'medal_type': ['Gold Medal', 'Silver Medal', 'Gold Medal'][:len(countries)],
+        'medal_code': [1.0, 2.0, None][:len(countries)],
+        'medal_date': ['2024-07-27', 'not a date', '2024-08-11'][:len(countries)],
+        'country': countries,
+        'unlisted': [1, 2, 3][:len(countries)],
+    })
+
+
+def test_apply_schema_converts_registered_columns():
+    raw = _medals(['France', 'Japan', 'France'])
+    typed = apply_schema('medals', raw)
+
+    assert isinstance(typed['medal_type'].dtype, pd.CategoricalDtype)
+    assert str(typed['medal_code'].dtype) == 'Int8'
+    assert typed['medal_code'].isna().tolist() == [False, False, True]
+    assert typed['medal_date'].tolist()[0] == pd.Timestamp('2024-07-27')
+    assert pd.isna(typed['medal_date'][1])  # unparseable dates become NaT
+    assert typed['country'].tolist() == ['France', 'Japan', 'France']
+    assert typed['unlisted'].dtype == raw['unlisted'].dtype
+    assert raw['medal_type'].dtype == object  # the input frame is left as read
+    assert apply_schema('no such table', raw) is raw
+
+
+def test_timestamps_are_normalized_to_utc():
+    typed = apply_schema('schedules', pd.DataFrame({'start_date': ['2024-07-27T19:00:00+02:00']}))
+    assert typed['start_date'][0] == pd.Timestamp('2024-07-27T17:00:00Z')
+
+
+def test_tables_share_one_dictionary_per_kind():
+    medals = apply_schema('medals', _medals(['France', 'Japan']))
+    athletes = apply_schema('athletes', pd.DataFrame({'country': ['Kenya', 'France'], 'nationality': ['Japan', None]}))
+
+    # Values seen later are appended: earlier codes never change
+    assert schemas.SHARED_DICTIONARIES['country'] == ['France', 'Japan', 'Kenya']
+    assert athletes['country'].cat.categories is athletes['nationality'].cat.categories
+    assert athletes['country'].cat.codes.tolist() == [2, 0]
+    assert medals['country'].cat.codes.tolist() == [0, 1]
+    assert athletes['nationality'].cat.codes.tolist() == [1, -1]
+
+
+def test_share_dictionaries_repoints_cached_frames():
+    medals = apply_schema('medals', _medals(['France', 'Japan']))
+    # A cached frame read back from disk has its own copy of the categories
+    cached = medals.assign(country=medals['country'].astype(pd.CategoricalDtype(['France', 'Japan'])))
+    apply_schema('athletes', pd.DataFrame({'country': ['Kenya']}))
+
+    shared = share_dictionaries('medals', cached)
+    assert shared['country'].cat.categories is schemas._shared_dtypes['country'].categories
+    assert shared['country'].tolist() == ['France', 'Japan']
+    assert share_dictionaries('schedules_preliminary', cached) is cached
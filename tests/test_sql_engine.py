@@ -0,0 +1,24 @@
+import pandas as pd
+
+import attribution
+from sql_engine import run_queries
+
+
+def test_team_exports_come_from_attribution(monkeypatch):
+    aggregates = {
+        'Team Performance': pd.DataFrame({'total_medals': [1]}),
+        'Medal Conversion Efficiency': pd.DataFrame({'Medals_Won': [2]}),
+    }
+    monkeypatch.setattr(attribution, 'build_team_aggregates', lambda: aggregates)
+    queries = {
+        'Team Performance': 'SELECT 99 AS total_medals',
+        'Other': 'SELECT 1 AS x',
+        'Medal Conversion Efficiency': 'SELECT 99 AS Medals_Won',
+    }
+    results = run_queries(queries=queries)
+
+    assert list(results) == list(queries)
+    assert results['Team Performance'] is aggregates['Team Performance']
+    assert results['Medal Conversion Efficiency'] is aggregates['Medal Conversion Efficiency']
+    assert results['Other']['x'].tolist() == [1]
+    assert list(run_queries(['Other'], queries)) == ['Other']